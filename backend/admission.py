@@ -0,0 +1,413 @@
+"""
+Memory-Budget Admission Control
+
+Every computation endpoint estimates its peak memory from the request
+parameters before computing anything and reserves that many bytes from a
+per-process budget. Requests that do not fit wait in a bounded
+first-come, first-served queue; when the queue is full the request is
+rejected with 429, and when it waits too long with 503, both carrying
+Retry-After. Reservations are held until the response has been fully
+sent, since the serialized body is usually the largest object a request
+creates. Background jobs reserve from the same budget for as long as they
+run (`reserve_from_thread`), waiting in the same queue.
+
+Configuration (environment variables, read at import):
+    FD_MEMORY_BUDGET_MB         per-process budget (default 1024)
+    FD_ADMISSION_MAX_QUEUE      max requests waiting for budget (default 32)
+    FD_ADMISSION_QUEUE_TIMEOUT  seconds a request may wait (default 10)
+    FD_ADMISSION_RETRY_AFTER    Retry-After seconds on rejection (default 1)
+"""
+
+import asyncio
+import os
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Optional
+
+import numpy as np
+from fastapi import HTTPException, Request
+
+from physics import (
+    BROADENING_BLOCK_CELLS,
+    BROADENING_MAX_PAD_FACTOR,
+    QUADRATURE_BLOCK_CELLS,
+    broadening_fft_layout,
+    broadening_pad,
+)
+
+
+# ============== Cost Model ==============
+
+# One float64 value held in a NumPy array
+NUMPY_VALUE_BYTES = 8
+
+# One value on its way to the client: the float object and list slot from
+# tolist() (32), the list slot in the validated response model (8) and
+# roughly 20 bytes of JSON text
+SERIALIZED_VALUE_BYTES = 60
+
+# One CSV line as a str (~45 chars + object header), held once in the
+# line list and again in the joined and JSON-encoded payloads
+CSV_LINE_BYTES = 200
+
+# Fixed per-request cost: request parsing, models, framework objects
+REQUEST_OVERHEAD_BYTES = 256 * 1024
+
+
+def _estimate(array_values: int = 0, serialized_values: int = 0, extra_bytes: int = 0) -> int:
+    return (
+        REQUEST_OVERHEAD_BYTES
+        + NUMPY_VALUE_BYTES * array_values
+        + SERIALIZED_VALUE_BYTES * serialized_values
+        + extra_bytes
+    )
+
+
+def estimate_curve(points: int) -> int:
+    """Single curve on a generated grid (/fermi-dirac, /derivative, /zero-temperature)."""
+    # energy, x, output and the exp temporary, plus three boolean masks
+    return _estimate(array_values=5 * points, serialized_values=2 * points)
+
+
+def estimate_multi_temperature(points: int, n_temperatures: int, maxwell_boltzmann: bool) -> int:
+    """Overlay curves; every curve stays alive as a list until serialization."""
+    curves = n_temperatures * (2 if maxwell_boltzmann else 1)
+    return _estimate(array_values=5 * points, serialized_values=points * (1 + curves))
+
+
+# Row blocks a surface is computed in (build_surface's default `blocks`)
+SURFACE_BLOCKS = 20
+
+
+def _surface_array_values(energy_points: int, temp_points: int) -> int:
+    # The result plus x, exp(-|x|) and 1 + exp(-|x|) for one block of rows;
+    # rows are filled in place, so no full-size temporaries. Measured peaks
+    # (tracemalloc) are 1.05-1.15 values per cell from 100x100 to 1000x500.
+    cells = energy_points * temp_points
+    return cells + 3 * -(-cells // SURFACE_BLOCKS) + 5 * energy_points
+
+
+def estimate_surface(energy_points: int, temp_points: int) -> int:
+    """2D surface: the result and one row block of temporaries, serialized as nested lists."""
+    cells = energy_points * temp_points
+    return _estimate(
+        array_values=_surface_array_values(energy_points, temp_points),
+        serialized_values=cells + energy_points + temp_points,
+    )
+
+
+def estimate_view(
+    points: int,
+    n_temperatures: int,
+    n_curve_components: int,
+    output_points: int,
+    heatmap_energy_points: int = 0,
+    heatmap_temp_points: int = 0,
+) -> int:
+    """Combined view: shared overlay tensors plus an optional heatmap."""
+    cells = n_temperatures * points
+    heatmap_cells = heatmap_energy_points * heatmap_temp_points
+    return _estimate(
+        # x, e, 1 + e and temporaries, plus one tensor per overlay component
+        array_values=(
+            (4 + n_curve_components) * cells
+            + (_surface_array_values(heatmap_energy_points, heatmap_temp_points) if heatmap_cells else 0)
+        ),
+        serialized_values=(
+            output_points * (1 + n_curve_components * n_temperatures)
+            + heatmap_cells + heatmap_energy_points + heatmap_temp_points
+        ),
+    )
+
+
+def estimate_export_csv(points: int) -> int:
+    """CSV export: one formatted line per point."""
+    return _estimate(array_values=5 * points, extra_bytes=CSV_LINE_BYTES * points)
+
+
+def estimate_thermodynamics(points: int, n_temperatures: int, table_points: int = 0) -> int:
+    """Blocked quadrature: at most one occupation/kernel block is alive."""
+    block_cells = min(n_temperatures * points, max(QUADRATURE_BLOCK_CELLS, points))
+    return _estimate(
+        # x, exp(-|x|), occupation and kernel for the block; grid, DOS and moments
+        array_values=4 * block_cells + 6 * points + 2 * table_points,
+        serialized_values=4 * n_temperatures + 2 * table_points,
+    )
+
+
+def estimate_transport(points: int, n_temperatures: int, table_points: int = 0) -> int:
+    """Windowed transport passes: at most one kernel block is alive."""
+    # Table nodes inside the window are added to each pass's grid
+    grid = points + table_points
+    block_cells = min(n_temperatures * grid, max(QUADRATURE_BLOCK_CELLS, grid))
+    return _estimate(
+        # x, exp(-|x|) and kernel for the block; window grid, σ and moment vectors
+        array_values=3 * block_cells + 8 * grid + 2 * table_points + 6 * n_temperatures,
+        serialized_values=9 * n_temperatures + 2 * table_points,
+    )
+
+
+def estimate_broadening(
+    n: int,
+    n_temperatures: int,
+    energy_step: float,
+    t_max: float,
+    edge: str = "edge",
+    binary: bool = False,
+) -> int:
+    """FFT broadening: padded spectrum, its transform and one block of products."""
+    _, length = broadening_fft_layout(n, energy_step, t_max, edge)
+    n_freq = length // 2 + 1
+    block = min(n_temperatures, max(1, BROADENING_BLOCK_CELLS // n_freq))
+    # complex transfer/product (2 values each) and real inverse per block row
+    fft_values = 2 * length + 2 * n_freq + block * (4 * n_freq + length)
+    if edge != "reflect" and broadening_pad(energy_step, t_max) > BROADENING_MAX_PAD_FACTOR * n:
+        # Kernels wider than the padding cap: direct path, run after the FFT one
+        direct_length = 1 << int(np.ceil(np.log2(max(2 * n - 1, 2))))
+        direct_freq = direct_length // 2 + 1
+        direct_block = min(n_temperatures, max(1, BROADENING_BLOCK_CELLS // direct_length))
+        # per row: cell edges and CDF, weights, kernel, its transform and product, inverse
+        direct_values = 3 * direct_length + direct_block * (4 * n + 2 * direct_length + 4 * direct_freq)
+        fft_values = max(fft_values, direct_values)
+    result = n_temperatures * n
+    if binary:
+        # result array plus its .npy copy
+        return _estimate(array_values=fft_values + 2 * result + n)
+    return _estimate(array_values=fft_values + result + n, serialized_values=result + 2 * n)
+
+
+def estimate_volume(temp_points: int, mu_points: int, energy_points: int, itemsize: int) -> int:
+    """Volume block in compact storage plus one float64 (T, E) slab of temporaries."""
+    slab = temp_points * energy_points
+    return _estimate(
+        array_values=5 * slab,
+        serialized_values=temp_points + mu_points + energy_points,
+        extra_bytes=itemsize * temp_points * mu_points * energy_points,
+    )
+
+
+def estimate_volume_box(cells: int, binary: bool = False) -> int:
+    """Slice or box cut from a cached volume, dequantized to float32."""
+    if binary:
+        # float32 block plus its .npy copy
+        return _estimate(extra_bytes=8 * cells)
+    return _estimate(serialized_values=cells, extra_bytes=4 * cells)
+
+
+def estimate_evaluate(body_bytes: int, chunk_points: int) -> int:
+    """Streaming evaluation: the request body plus one chunk of temporaries."""
+    return _estimate(array_values=6 * chunk_points, extra_bytes=body_bytes)
+
+
+# ============== Budget ==============
+
+# How often a background reservation checks whether its job was cancelled
+CANCEL_POLL_SECONDS = 0.2
+
+
+class ReservationCancelled(Exception):
+    """Raised when a background reservation is abandoned while waiting."""
+
+
+class MemoryBudget:
+    """
+    Per-process byte budget shared by all in-flight requests.
+
+    Reservations that fit are granted immediately while nobody is waiting;
+    the rest wait (up to `queue_timeout` seconds, at most `max_queue` at a
+    time) until enough bytes are released. Waiters are granted strictly in
+    arrival order, so a large reservation cannot be starved by a stream of
+    small ones.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        max_queue: int = 32,
+        queue_timeout: float = 10.0,
+        retry_after: int = 1,
+    ):
+        self.budget_bytes = budget_bytes
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.used_bytes = 0
+        self.peak_bytes = 0
+        self.in_flight = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self._waiters: Deque[object] = deque()
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @property
+    def queued(self) -> int:
+        """Requests and background jobs waiting for budget."""
+        return len(self._waiters)
+
+    def _reject(self, status_code: int, detail: str) -> HTTPException:
+        self.rejected_total += 1
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    def _grant(self, nbytes: int) -> None:
+        self.used_bytes += nbytes
+        self.peak_bytes = max(self.peak_bytes, self.used_bytes)
+        self.in_flight += 1
+        self.admitted_total += 1
+
+    async def acquire(
+        self,
+        nbytes: int,
+        background: bool = False,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Reserve `nbytes`, waiting if necessary; raises HTTPException on rejection.
+
+        Background work (jobs) takes its turn in the same queue and counts
+        towards its length, but is neither turned away when the queue is
+        full nor timed out. It waits until granted, or until `cancelled()`
+        returns true (checked every CANCEL_POLL_SECONDS), which raises
+        ReservationCancelled. Only a reservation larger than the whole
+        budget is rejected.
+        """
+        if nbytes > self.budget_bytes:
+            self.rejected_total += 1
+            raise HTTPException(
+                status_code=413,
+                detail=(
+                    f"Request needs ~{nbytes / 2**20:.0f} MB, more than the "
+                    f"{self.budget_bytes / 2**20:.0f} MB memory budget; reduce its size"
+                ),
+            )
+
+        async with self.condition:
+            if not self._waiters and self.used_bytes + nbytes <= self.budget_bytes:
+                self._grant(nbytes)
+                return
+
+            if not background and len(self._waiters) >= self.max_queue:
+                raise self._reject(429, "Server is at its memory budget; too many queued requests")
+
+            ticket = object()
+            self._waiters.append(ticket)
+
+            def ready() -> bool:
+                return self._waiters[0] is ticket and self.used_bytes + nbytes <= self.budget_bytes
+
+            try:
+                if background:
+                    poll = CANCEL_POLL_SECONDS if cancelled is not None else None
+                    while True:
+                        try:
+                            await asyncio.wait_for(self.condition.wait_for(ready), timeout=poll)
+                            break
+                        except asyncio.TimeoutError:
+                            if cancelled():
+                                raise ReservationCancelled()
+                else:
+                    try:
+                        await asyncio.wait_for(self.condition.wait_for(ready), timeout=self.queue_timeout)
+                    except asyncio.TimeoutError:
+                        raise self._reject(503, "Timed out waiting for memory budget")
+            finally:
+                self._waiters.remove(ticket)
+                # The next waiter in line may fit now
+                self.condition.notify_all()
+            self._grant(nbytes)
+
+    async def release(self, nbytes: int) -> None:
+        async with self.condition:
+            self.used_bytes -= nbytes
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def status(self) -> dict:
+        return {
+            "budget_bytes": self.budget_bytes,
+            "used_bytes": self.used_bytes,
+            "peak_bytes": self.peak_bytes,
+            "utilization": self.used_bytes / self.budget_bytes if self.budget_bytes else 0.0,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+        }
+
+
+memory_budget = MemoryBudget(
+    budget_bytes=int(float(os.environ.get("FD_MEMORY_BUDGET_MB", "1024")) * 2**20),
+    max_queue=int(os.environ.get("FD_ADMISSION_MAX_QUEUE", "32")),
+    queue_timeout=float(os.environ.get("FD_ADMISSION_QUEUE_TIMEOUT", "10")),
+    retry_after=int(os.environ.get("FD_ADMISSION_RETRY_AFTER", "1")),
+)
+
+
+# ============== Request Integration ==============
+
+_SCOPE_KEY = "fermi_dirac.reservations"
+
+
+async def admit(request: Request, nbytes: int, budget: MemoryBudget = memory_budget) -> None:
+    """
+    Reserve memory for the current request.
+
+    The reservation is released by AdmissionMiddleware once the response
+    has been sent (or the request failed).
+    """
+    await budget.acquire(nbytes)
+    request.scope.setdefault(_SCOPE_KEY, []).append((budget, nbytes))
+
+
+@contextmanager
+def reserve_from_thread(
+    loop: asyncio.AbstractEventLoop,
+    nbytes: int,
+    budget: MemoryBudget = memory_budget,
+    cancelled: Optional[Callable[[], bool]] = None,
+):
+    """
+    Hold a reservation around work running on a thread other than `loop`'s.
+
+    The budget's condition belongs to the server's event loop, so the
+    reservation is acquired and released there; the calling thread blocks
+    until it is granted, or raises ReservationCancelled once `cancelled()`
+    (called on the loop) returns true while it waits.
+    """
+    asyncio.run_coroutine_threadsafe(
+        budget.acquire(nbytes, background=True, cancelled=cancelled), loop
+    ).result()
+    try:
+        yield
+    finally:
+        asyncio.run_coroutine_threadsafe(budget.release(nbytes), loop).result()
+
+
+class AdmissionMiddleware:
+    """ASGI middleware releasing a request's reservations after its response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reservations = scope.setdefault(_SCOPE_KEY, [])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for budget, nbytes in reservations:
+                await budget.release(nbytes)
+            reservations.clear()
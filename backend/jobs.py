@@ -0,0 +1,361 @@
+"""
+Asynchronous Job Subsystem
+
+Long computations are submitted as jobs, run on a local pool of worker
+threads and polled or fetched later, so no request has to outlive a proxy
+timeout. No external broker is involved.
+
+Job state lives in a directory shared by all uvicorn workers on the host:
+`<id>.json` holds the status (replaced atomically), `<id>.result` the
+finished payload and `<id>.cancel` marks a cancellation request. Any
+worker can therefore answer status, result and cancel calls; the job
+itself runs in the worker that accepted it.
+
+- Priorities: higher `priority` runs first, FIFO within a priority.
+- Concurrency cap: at most `workers` jobs run at once per process.
+- Cancellation: queued jobs never start; running jobs stop at their next
+  progress report.
+- TTL: finished jobs and their results are deleted `ttl` seconds after
+  they finish.
+- Recovery: each job records the PID of the worker running it. Queued or
+  running jobs whose worker process is gone (crash, restart) are marked
+  failed by the periodic sweep, so they expire like any finished job.
+- Memory: when the server sets `reserve`, each job holds a memory-budget
+  reservation sized by its kind's `estimate` while it runs; the job stays
+  queued, and can still be cancelled, until the reservation is granted.
+  Its final status is written once the reservation has been released.
+
+Configuration (environment variables, read at import):
+    FD_JOBS_DIR         state directory (default <tmp>/fermi-dirac-jobs)
+    FD_JOB_WORKERS      concurrent jobs per process (default 2)
+    FD_JOB_MAX_QUEUED   queued jobs per process before 429 (default 100)
+    FD_JOB_TTL          seconds finished jobs are kept (default 3600)
+"""
+
+import itertools
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from typing import Callable, ContextManager, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from storage import checked_id, write_atomic
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Minimum seconds between status-file writes for progress updates
+_PROGRESS_INTERVAL = 0.25
+
+# How often expired jobs are swept (seconds)
+_CLEANUP_INTERVAL = 30.0
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when cancellation was requested."""
+
+
+class QueueFull(Exception):
+    """Raised on submit when this process already has too many queued jobs."""
+
+
+# A runner turns validated parameters into the result payload, reporting
+# progress in [0, 1] through the callback (which may raise JobCancelled)
+JobRunner = Callable[[BaseModel, Callable[[float], None]], bytes]
+
+# Peak memory estimate (bytes) of a job from its validated parameters
+JobEstimate = Callable[[BaseModel], int]
+
+
+@dataclass
+class JobKind:
+    """A registered kind of job."""
+    model: Type[BaseModel]
+    runner: JobRunner
+    media_type: str = "application/json"
+    filename: Optional[str] = None
+    estimate: Optional[JobEstimate] = None
+
+
+@dataclass
+class JobStatus:
+    """Persisted state of one job."""
+    job_id: str
+    kind: str
+    status: str
+    priority: int
+    progress: float
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    error: Optional[str] = None
+    result_bytes: Optional[int] = None
+    media_type: str = "application/json"
+    filename: Optional[str] = None
+    cancel_requested: bool = False
+    worker_pid: Optional[int] = None
+
+
+class JobManager:
+    """Priority worker pool with file-backed job state."""
+
+    def __init__(self, directory: str, workers: int = 2, max_queued: int = 100, ttl: float = 3600.0):
+        self.directory = directory
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.kinds: Dict[str, JobKind] = {}
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._params: Dict[str, BaseModel] = {}
+        self._threads = []
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+        # Set by the server: reserve(nbytes, cancelled) returns a context
+        # manager holding that many bytes of the memory budget; it may raise
+        # while waiting once cancelled() returns true
+        self.reserve: Optional[Callable[[int, Callable[[], bool]], ContextManager]] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def register(self, name: str, model: Type[BaseModel], runner: JobRunner,
+                 media_type: str = "application/json", filename: Optional[str] = None,
+                 estimate: Optional[JobEstimate] = None) -> None:
+        self.kinds[name] = JobKind(model, runner, media_type, filename, estimate)
+
+    # ---------- storage ----------
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{checked_id(job_id)}.{suffix}")
+
+    def _save(self, status: JobStatus) -> None:
+        write_atomic(self._path(status.job_id, "json"), json.dumps(asdict(status)).encode("utf-8"))
+
+    def _load(self, job_id: str) -> Optional[JobStatus]:
+        try:
+            with open(self._path(job_id, "json"), "rb") as f:
+                return JobStatus(**json.loads(f.read()))
+        except (FileNotFoundError, KeyError):
+            return None
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        return os.path.exists(self._path(job_id, "cancel"))
+
+    def _remove(self, job_id: str) -> None:
+        for suffix in ("json", "result", "cancel"):
+            try:
+                os.remove(self._path(job_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    # ---------- public API ----------
+
+    def submit(self, kind: str, params: dict, priority: int = 0) -> JobStatus:
+        """Validate parameters and queue a job; raises KeyError, ValidationError or QueueFull."""
+        job_kind = self.kinds[kind]
+        validated = job_kind.model.model_validate(params)
+        self.cleanup()
+
+        with self._lock:
+            if self._queue.qsize() >= self.max_queued:
+                raise QueueFull(f"{self._queue.qsize()} jobs already queued")
+            self._start_workers()
+            status = JobStatus(
+                job_id=uuid.uuid4().hex,
+                kind=kind,
+                status=QUEUED,
+                priority=priority,
+                progress=0.0,
+                created_at=time.time(),
+                media_type=job_kind.media_type,
+                filename=job_kind.filename,
+                worker_pid=os.getpid(),
+            )
+            self._save(status)
+            self._params[status.job_id] = validated
+            self._queue.put((-priority, next(self._sequence), status.job_id))
+        return status
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        self.cleanup()
+        status = self._load(job_id)
+        if status is not None and status.status not in FINISHED_STATES:
+            status.cancel_requested = self._cancel_requested(job_id)
+        return status
+
+    def result_path(self, job_id: str) -> str:
+        return self._path(job_id, "result")
+
+    def cancel(self, job_id: str) -> Optional[JobStatus]:
+        """
+        Cancel a queued or running job, or delete a finished one.
+
+        Returns the status after the call, or None if the job is unknown.
+        """
+        status = self._load(job_id)
+        if status is None:
+            return None
+        if status.status in FINISHED_STATES:
+            self._remove(job_id)
+            return status
+        with self._lock:
+            # Queued in this process: cancel now; the worker will skip it
+            if status.status == QUEUED and self._params.pop(job_id, None) is not None:
+                self._finish(status, CANCELLED)
+                return status
+        write_atomic(self._path(job_id, "cancel"), b"")
+        status.cancel_requested = True
+        return status
+
+    def cleanup(self) -> None:
+        """
+        Fail orphaned jobs and delete finished ones past their TTL.
+        
+        Runs at most every _CLEANUP_INTERVAL, and on the first call after
+        startup.
+        """
+        now = time.time()
+        if now - self._last_cleanup < _CLEANUP_INTERVAL:
+            return
+        self._last_cleanup = now
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                try:
+                    if now - os.path.getmtime(path) > _CLEANUP_INTERVAL:
+                        os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".json"):
+                continue
+            status = self._load(name[:-len(".json")])
+            if status is None:
+                continue
+            if status.status not in FINISHED_STATES and not _process_alive(status.worker_pid):
+                self._finish(status, FAILED, error="Worker process exited before the job finished")
+            elif status.expires_at is not None and status.expires_at < now:
+                self._remove(status.job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    # ---------- workers ----------
+
+    def _start_workers(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name="fd-job-worker", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _finish(self, status: JobStatus, state: str, error: Optional[str] = None) -> None:
+        status.status = state
+        status.error = error
+        status.finished_at = time.time()
+        status.expires_at = status.finished_at + self.ttl
+        self._save(status)
+        try:
+            os.remove(self._path(status.job_id, "cancel"))
+        except FileNotFoundError:
+            pass
+
+    def _work(self) -> None:
+        while True:
+            _, _, job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            params = self._params.pop(job_id, None)
+        status = self._load(job_id)
+        if params is None or status is None or status.status != QUEUED:
+            return
+        kind = self.kinds[status.kind]
+
+        try:
+            reservation = (
+                self.reserve(kind.estimate(params), lambda: self._cancel_requested(job_id))
+                if self.reserve is not None and kind.estimate is not None
+                else nullcontext()
+            )
+            with reservation:
+                state = self._execute(status, kind, params)
+            error = None
+        except JobCancelled:
+            state, error = CANCELLED, None
+        except Exception as e:
+            # Reservation refused, abandoned on cancellation, or result not written
+            if self._cancel_requested(job_id):
+                state, error = CANCELLED, None
+            else:
+                state, error = FAILED, f"{type(e).__name__}: {e}"
+        self._finish(status, state, error=error)
+
+    def _execute(self, status: JobStatus, kind: JobKind, params: BaseModel) -> str:
+        """Run a job and write its result; returns SUCCEEDED or raises."""
+        job_id = status.job_id
+        if self._cancel_requested(job_id):
+            raise JobCancelled()
+
+        status.status = RUNNING
+        status.started_at = time.time()
+        self._save(status)
+        last_write = [0.0]
+
+        def progress(fraction: float) -> None:
+            now = time.monotonic()
+            if now - last_write[0] < _PROGRESS_INTERVAL:
+                return
+            last_write[0] = now
+            if self._cancel_requested(job_id):
+                raise JobCancelled()
+            status.progress = min(max(float(fraction), 0.0), 1.0)
+            self._save(status)
+
+        payload = kind.runner(params, progress)
+        write_atomic(self.result_path(job_id), payload)
+        status.progress = 1.0
+        status.result_bytes = len(payload)
+        return SUCCEEDED
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    """Whether a process with this PID exists on this host (None: unknown owner)."""
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+job_manager = JobManager(
+    directory=os.environ.get(
+        "FD_JOBS_DIR",
+        os.path.join(tempfile.gettempdir(), "fermi-dirac-jobs"),
+    ),
+    workers=int(os.environ.get("FD_JOB_WORKERS", "2")),
+    max_queued=int(os.environ.get("FD_JOB_MAX_QUEUED", "100")),
+    ttl=float(os.environ.get("FD_JOB_TTL", "3600")),
+)
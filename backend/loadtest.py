@@ -0,0 +1,487 @@
+"""
+Load-Generation Harness for the Fermi-Dirac API
+
+Starts `main:app` under uvicorn with N workers, replays a weighted mix of
+frontend-shaped traffic and reports per-endpoint throughput, latency
+percentiles, error rate and server RSS as JSON, so runs can be diffed.
+
+Server RSS is shared by every request in flight, so the mixed run only
+reports its total peak. Per-endpoint RSS comes from short phases that
+replay one endpoint alone on a fresh server (local servers only).
+
+Every local server gets an empty shared result cache of its own, so runs
+and phases never hit results cached by an earlier one; the report gives
+the hit rate seen through the X-Cache header. `--shared-cache-mb 0`
+disables the cache to measure compute alone.
+
+Run with: python loadtest.py --workers 4 --concurrency 32 --duration 30
+          python loadtest.py --url http://localhost:8000 --output run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+
+# ============== Traffic Model ==============
+
+# Request parameters mirror what the frontend sends: the temperature
+# slider is log-scaled over 1..10^4 K, μ slides over [-2, 3] eV in 0.01
+# steps, the energy window over [-10, 10] eV in 0.1 steps, and the
+# overlay adds the fixed 0/100/1000/3000 K reference curves.
+
+def _temperature(rng: random.Random) -> float:
+    if rng.random() < 0.05:
+        return 0.0
+    return round(10 ** rng.uniform(0, 4), 1)
+
+
+def _mu(rng: random.Random) -> float:
+    return round(rng.uniform(-2, 3), 2)
+
+
+def _energy_window(rng: random.Random) -> Tuple[float, float]:
+    if rng.random() < 0.7:
+        return -1.0, 2.0  # DEFAULT_SETTINGS
+    low = round(rng.uniform(-10, 9.8), 1)
+    high = round(rng.uniform(low + 0.1, 10), 1)
+    return low, high
+
+
+def _points(rng: random.Random) -> int:
+    return rng.choice([500, 500, 500, 1000, 2000, 5000])
+
+
+def _fermi_dirac(rng: random.Random) -> Tuple[str, str, dict]:
+    e_min, e_max = _energy_window(rng)
+    return "POST", "/fermi-dirac", {"json": {
+        "temperature": _temperature(rng),
+        "mu": _mu(rng),
+        "energy_min": e_min,
+        "energy_max": e_max,
+        "points": _points(rng),
+    }}
+
+
+def _multi_temperature(rng: random.Random) -> Tuple[str, str, dict]:
+    e_min, e_max = _energy_window(rng)
+    temperatures = sorted({_temperature(rng), 0, 100, 1000, 3000})
+    return "POST", "/multi-temperature", {"json": {
+        "temperatures": temperatures,
+        "mu": _mu(rng),
+        "energy_min": e_min,
+        "energy_max": e_max,
+        "points": min(_points(rng), 5000),
+        "include_maxwell_boltzmann": rng.random() < 0.3,
+    }}
+
+
+def _surface(rng: random.Random) -> Tuple[str, str, dict]:
+    e_min, e_max = _energy_window(rng)
+    return "POST", "/surface", {"json": {
+        "mu": _mu(rng),
+        "energy_min": e_min,
+        "energy_max": e_max,
+        "energy_points": 200,
+        "temp_min": 1,
+        "temp_max": 5000,
+        "temp_points": 100,
+        "temp_scale": "log",
+    }}
+
+
+def _view(rng: random.Random) -> Tuple[str, str, dict]:
+    # The frontend's single round trip; the heatmap is only requested when
+    # μ or the energy window changed, on a grid spaced 0.02 eV apart
+    e_min, e_max = _energy_window(rng)
+    temperatures = sorted({_temperature(rng), 0, 100, 1000, 3000})
+    components = ["curves"]
+    if rng.random() < 0.3:
+        components.append("maxwell_boltzmann")
+    if rng.random() < 0.5:
+        components.append("heatmap")
+    return "POST", "/view", {"json": {
+        "components": components,
+        "temperatures": temperatures,
+        "mu": _mu(rng),
+        "energy_min": e_min,
+        "energy_max": e_max,
+        "points": min(_points(rng), 5000),
+        "heatmap": {
+            "energy_points": min(max(round((e_max - e_min) / 0.02) + 1, 10), 1000),
+            "temp_min": 1,
+            "temp_max": 5000,
+            "temp_points": 100,
+            "temp_scale": "log",
+        },
+    }}
+
+
+def _derivative(rng: random.Random) -> Tuple[str, str, dict]:
+    e_min, e_max = _energy_window(rng)
+    return "GET", "/derivative", {"params": {
+        "temperature": max(_temperature(rng), 1.0),
+        "mu": _mu(rng),
+        "energy_min": e_min,
+        "energy_max": e_max,
+        "points": _points(rng),
+    }}
+
+
+def _export_csv(rng: random.Random) -> Tuple[str, str, dict]:
+    e_min, e_max = _energy_window(rng)
+    return "GET", "/export/csv", {"params": {
+        "temperature": _temperature(rng),
+        "mu": _mu(rng),
+        "energy_min": e_min,
+        "energy_max": e_max,
+        "points": _points(rng),
+    }}
+
+
+ENDPOINTS: Dict[str, Callable[[random.Random], Tuple[str, str, dict]]] = {
+    "fermi-dirac": _fermi_dirac,
+    "multi-temperature": _multi_temperature,
+    "surface": _surface,
+    "view": _view,
+    "derivative": _derivative,
+    "export-csv": _export_csv,
+}
+
+DEFAULT_MIX = "fermi-dirac=4,multi-temperature=4,surface=1,view=4,derivative=1,export-csv=1"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse 'name=weight,...' into a weight table."""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight or 1)
+    if not any(w > 0 for w in weights.values()):
+        raise ValueError("Traffic mix needs at least one positive weight")
+    return weights
+
+
+# ============== Server Control ==============
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """PIDs of root_pid and all descendants (Linux /proc)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def server_rss_bytes(root_pid: int) -> Optional[int]:
+    """Total resident set size of the server and its workers, if measurable."""
+    if not os.path.isdir("/proc"):
+        return None
+    total = 0
+    for pid in _process_tree(root_pid):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def start_server(workers: int, port: int, shared_cache_mb: Optional[float] = None) -> subprocess.Popen:
+    """
+    Launch uvicorn serving main:app from this directory.
+
+    The server gets a fresh, empty shared cache directory (removed again by
+    `stop_server`); `shared_cache_mb` overrides its size, 0 disabling it.
+    """
+    cache_dir = tempfile.mkdtemp(prefix="fd-loadtest-cache-")
+    env = dict(os.environ, FD_SHARED_CACHE_DIR=cache_dir)
+    if shared_cache_mb is not None:
+        env["FD_SHARED_CACHE_MB"] = str(shared_cache_mb)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+    )
+    server.cache_dir = cache_dir
+    return server
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    """Terminate a server from `start_server` and remove its cache directory."""
+    server.terminate()
+    server.wait(timeout=30)
+    shutil.rmtree(server.cache_dir, ignore_errors=True)
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready in {timeout}s")
+
+
+# ============== Load Generation ==============
+
+@dataclass
+class EndpointStats:
+    """Raw measurements for one endpoint."""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    bytes_received: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    peak_rss: Optional[int] = None
+
+    def report(self, elapsed: float) -> dict:
+        count = len(self.latencies)
+        latency_ms = np.asarray(self.latencies) * 1000.0
+        summary = {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "throughput_rps": count / elapsed if elapsed > 0 else 0.0,
+            "mean_response_bytes": self.bytes_received / count if count else 0.0,
+        }
+        cached = self.cache_hits + self.cache_misses
+        if cached:
+            # Only responses that went through the shared cache carry X-Cache
+            summary["cache_hit_rate"] = self.cache_hits / cached
+        if self.peak_rss is not None:
+            summary["peak_server_rss_mb"] = self.peak_rss / 2 ** 20
+        if count:
+            p50, p95, p99 = np.percentile(latency_ms, [50, 95, 99])
+            summary["latency_ms"] = {
+                "p50": p50, "p95": p95, "p99": p99,
+                "mean": float(latency_ms.mean()), "max": float(latency_ms.max()),
+            }
+        return summary
+
+
+async def run_load(
+    base_url: str,
+    weights: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    seed: int,
+    server_pid: Optional[int] = None,
+    rss_interval: float = 0.1,
+) -> dict:
+    """
+    Replay the traffic mix for `duration` seconds and summarize it.
+
+    Each client task draws from its own generator derived from `seed`, so
+    the request sequence of every connection is reproducible regardless of
+    how the tasks interleave.
+    """
+    names = list(weights)
+    stats = {name: EndpointStats() for name in names}
+    deadline = time.monotonic() + duration
+    peak_rss = {"value": None}
+
+    async def sample_rss():
+        # Whole-server RSS: it cannot be split between concurrent endpoints
+        while time.monotonic() < deadline:
+            rss = server_rss_bytes(server_pid)
+            if rss is not None:
+                peak_rss["value"] = max(peak_rss["value"] or 0, rss)
+            await asyncio.sleep(rss_interval)
+
+    async def worker(client: httpx.AsyncClient, rng: random.Random):
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            method, path, kwargs = ENDPOINTS[name](rng)
+            s = stats[name]
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                s.bytes_received += len(response.content)
+                cache = response.headers.get("x-cache")
+                if cache == "hit":
+                    s.cache_hits += 1
+                elif cache == "miss":
+                    s.cache_misses += 1
+                if response.status_code >= 400:
+                    s.errors += 1
+            except httpx.HTTPError:
+                s.errors += 1
+            finally:
+                s.latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    started = time.monotonic()
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        tasks = [worker(client, random.Random(f"{seed}:{i}")) for i in range(concurrency)]
+        if server_pid is not None:
+            tasks.append(sample_rss())
+        await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    all_latencies = [t for s in stats.values() for t in s.latencies]
+    total = EndpointStats(
+        latencies=all_latencies,
+        errors=sum(s.errors for s in stats.values()),
+        bytes_received=sum(s.bytes_received for s in stats.values()),
+        cache_hits=sum(s.cache_hits for s in stats.values()),
+        cache_misses=sum(s.cache_misses for s in stats.values()),
+        peak_rss=peak_rss["value"],
+    )
+    return {
+        "elapsed_s": elapsed,
+        "endpoints": {name: s.report(elapsed) for name, s in stats.items()},
+        "total": total.report(elapsed),
+    }
+
+
+def isolated_rss(
+    weights: Dict[str, float],
+    workers: int,
+    concurrency: int,
+    duration: float,
+    seed: int,
+    shared_cache_mb: Optional[float] = None,
+) -> Dict[str, dict]:
+    """
+    Peak server RSS per endpoint, each replayed alone on a fresh server.
+
+    A new server per phase keeps one endpoint's allocator high-water mark
+    from showing up in the next one's numbers.
+    """
+    results = {}
+    for i, name in enumerate(n for n, w in weights.items() if w > 0):
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(workers, port, shared_cache_mb)
+        try:
+            asyncio.run(wait_until_ready(base_url))
+            baseline = server_rss_bytes(server.pid)
+            phase = asyncio.run(run_load(
+                base_url, {name: 1.0}, concurrency, duration, seed + i, server.pid
+            ))
+        finally:
+            stop_server(server)
+        peak = phase["total"].get("peak_server_rss_mb")
+        baseline_mb = baseline / 2 ** 20 if baseline is not None else None
+        results[name] = {
+            "requests": phase["total"]["requests"],
+            "baseline_rss_mb": baseline_mb,
+            "peak_server_rss_mb": peak,
+            "rss_growth_mb": peak - baseline_mb if peak is not None and baseline_mb is not None else None,
+        }
+    return results
+
+
+# ============== Entry Point ==============
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Fermi-Dirac API")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--url", default=None, help="Target a running server instead of starting one")
+    parser.add_argument("--port", type=int, default=0, help="Port for the local server (default: free port)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of unmeasured load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Traffic weights, e.g. 'surface=1,fermi-dirac=3'")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the traffic generator")
+    parser.add_argument("--rss-phase", type=float, default=5.0,
+                        help="Seconds each endpoint runs alone on a fresh server to measure "
+                             "its RSS (0 disables; ignored with --url)")
+    parser.add_argument("--shared-cache-mb", type=float, default=None,
+                        help="Shared result cache size for local servers; 0 measures compute "
+                             "alone (default: the server's own default)")
+    parser.add_argument("--output", default=None, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    weights = parse_mix(args.mix)
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        port = args.port or _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(args.workers, port, args.shared_cache_mb)
+
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        server_pid = server.pid if server else None
+        if args.warmup > 0:
+            asyncio.run(run_load(base_url, weights, args.concurrency, args.warmup, args.seed + 1))
+        report = asyncio.run(run_load(
+            base_url, weights, args.concurrency, args.duration, args.seed, server_pid
+        ))
+    finally:
+        if server:
+            stop_server(server)
+
+    if server and args.rss_phase > 0:
+        phases = isolated_rss(weights, args.workers, args.concurrency, args.rss_phase,
+                              args.seed + 100, args.shared_cache_mb)
+        for name, rss in phases.items():
+            report["endpoints"][name]["isolated_rss"] = rss
+
+    report["config"] = {
+        "url": base_url,
+        "workers": args.workers if server else None,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "mix": weights,
+        "seed": args.seed,
+        "rss_phase_s": args.rss_phase if server else None,
+        "shared_cache_mb": args.shared_cache_mb if server else None,
+    }
+
+    output = json.dumps(report, indent=2, default=float)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0 if report["total"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,22 +7,62 @@ with proper numerical stability across all temperature regimes.
 Run with: uvicorn main:app --reload --port 8000
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from dataclasses import asdict
+import asyncio
+import base64
+import io
+import json
+import os
 import numpy as np
-from typing import List
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
 
 from physics import (
     fermi_dirac,
     fermi_dirac_derivative,
+    fermi_dirac_components,
     maxwell_boltzmann,
     thermal_smearing_width,
     generate_energy_grid,
+    generate_temperature_schedule,
+    fermi_dirac_volume,
+    dequantize_volume,
     compute_2d_surface,
+    compute_thermodynamics,
+    compute_transport,
+    transport_function,
+    density_of_states,
+    thermal_broadening,
     K_BOLTZMANN_EV,
     PhysicalConstants
 )
+from admission import (
+    AdmissionMiddleware,
+    admit,
+    memory_budget,
+    reserve_from_thread,
+    estimate_curve,
+    estimate_multi_temperature,
+    estimate_surface,
+    estimate_view,
+    estimate_export_csv,
+    estimate_thermodynamics,
+    estimate_transport,
+    estimate_broadening,
+    estimate_evaluate,
+    estimate_volume,
+    estimate_volume_box,
+)
+from decimation import lttb_indices
+from jobs import QueueFull, SUCCEEDED, job_manager
+from profiling import ProfilingMiddleware, profile_store, profile_top, profiling_enabled
+from shared_cache import shared_cache
+from surface_cache import extend_surface, surface_cache
+from volumes import Volume, VOLUME_AXES, volume_cache, volume_id
 from models import (
     FermiDiracRequest,
     FermiDiracResponse,
@@ -31,12 +71,43 @@ from models import (
     MultiTemperatureCurve,
     SurfaceRequest,
     SurfaceResponse,
+    ViewComponent,
+    ViewCurve,
+    ViewRequest,
+    ViewResponse,
+    ThermodynamicsRequest,
+    ThermodynamicsResponse,
+    TransportModel,
+    TransportRequest,
+    TransportResponse,
+    BroadeningRequest,
+    BroadeningResponse,
+    BroadeningEdge,
+    DistributionKernel,
+    FrameEncoding,
+    SweepStreamRequest,
+    VolumeRequest,
+    VolumeResponse,
+    VolumeSliceResponse,
+    VolumeBoxResponse,
+    VolumeAxis,
+    JobSubmitRequest,
+    JobStatusResponse,
     ZeroTemperatureResponse,
     PhysicsInfoResponse
 )
 
 # ============== App Configuration ==============
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Job worker threads reserve memory on this worker's event loop
+    loop = asyncio.get_running_loop()
+    job_manager.reserve = lambda nbytes, cancelled: reserve_from_thread(loop, nbytes, cancelled=cancelled)
+    yield
+    job_manager.reserve = None
+
+
 app = FastAPI(
     title="Fermi-Dirac Distribution API",
     description="""
@@ -61,7 +132,8 @@ app = FastAPI(
     contact={
         "name": "Computational Physics Lab",
         "email": "physics@lab.edu"
-    }
+    },
+    lifespan=lifespan
 )
 
 # CORS configuration for frontend
@@ -73,6 +145,421 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Releases each request's memory reservation once its response is sent
+app.add_middleware(AdmissionMiddleware)
+
+# Per-request profiling is only installed when the server allows it, so
+# ordinary requests never pass through it
+if profiling_enabled:
+    app.add_middleware(ProfilingMiddleware, store=profile_store, top=profile_top)
+
+
+# ============== Binary Helpers ==============
+
+NPY_MAGIC = b"\x93NUMPY"
+BINARY_DTYPES = {"float64": np.float64, "float32": np.float32}
+
+
+def decode_array_body(body: bytes, dtype: str = "float64") -> np.ndarray:
+    """
+    Wrap a binary request body as a 1D array without copying.
+    
+    Accepts either a `.npy` file (detected by its magic prefix; only the
+    header is parsed and the array keeps its stored shape) or raw
+    little-endian samples of `dtype`.
+    """
+    if body.startswith(NPY_MAGIC):
+        stream = io.BytesIO(body)
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, file_dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, file_dtype = np.lib.format.read_array_header_2_0(stream)
+        if file_dtype.hasobject or file_dtype.kind != "f":
+            raise ValueError(f"Unsupported .npy dtype: {file_dtype}")
+        count = int(np.prod(shape))
+        flat = np.frombuffer(body, dtype=file_dtype, count=count, offset=stream.tell())
+        return flat.reshape(shape, order="F" if fortran_order else "C")
+    
+    if dtype not in BINARY_DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    item = np.dtype(BINARY_DTYPES[dtype]).newbyteorder("<")
+    if len(body) % item.itemsize:
+        raise ValueError(f"Body length {len(body)} is not a multiple of {item.itemsize} bytes")
+    return np.frombuffer(body, dtype=item)
+
+
+# Allowance for a `.npy` header in front of the samples of a binary upload
+# (version 1.0 headers are at most 64 KiB)
+NPY_HEADER_MAX_BYTES = 65536 + 10
+
+
+def declared_body_length(request: Request, max_bytes: int) -> int:
+    """
+    Content-Length of a binary upload, checked before anything is read.
+    
+    Memory is reserved from the declared length, so uploads without one
+    (chunked transfer encoding) are refused with 411 and ones longer than
+    `max_bytes` with 413.
+    """
+    length = request.headers.get("content-length")
+    if length is None:
+        raise HTTPException(status_code=411, detail="Binary uploads need a Content-Length header")
+    try:
+        nbytes = int(length)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid Content-Length: {length}")
+    if nbytes > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Body of {nbytes} bytes exceeds the limit of {max_bytes} bytes"
+        )
+    return nbytes
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """Read the request body, refusing with 413 once it exceeds `max_bytes`."""
+    chunks, received = [], 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise HTTPException(status_code=413, detail="Body is longer than its Content-Length")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def npy_header(shape: tuple, dtype: np.dtype) -> bytes:
+    """Build a `.npy` header so array data can be streamed after it."""
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buffer, {
+        "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        "fortran_order": False,
+        "shape": tuple(shape),
+    })
+    return buffer.getvalue()
+
+
+def encode_npy(array: np.ndarray) -> bytes:
+    """Serialize an array as `.npy` bytes."""
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+# ============== Shared Cache Helpers ==============
+
+def shared_cache_lookup(namespace: str, request: BaseModel) -> Tuple[str, Optional[Response]]:
+    """
+    Look a request up in the cross-worker cache.
+    
+    Returns the cache key and, on a hit, the stored JSON response.
+    """
+    key = shared_cache.make_key(namespace, request.model_dump_json())
+    body = shared_cache.get(key)
+    if body is None:
+        return key, None
+    return key, Response(content=body, media_type="application/json", headers={"X-Cache": "hit"})
+
+
+def shared_cache_store(key: str, response: BaseModel) -> Response:
+    """Serialize a response model once, store it for other workers and return it."""
+    body = response.model_dump_json().encode("utf-8")
+    shared_cache.set(key, body)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "miss"})
+
+
+# ============== Response Builders ==============
+# Shared by the synchronous endpoints and the job runners. `progress`
+# receives the completed fraction and may raise to abort (job cancel).
+
+def _no_progress(fraction: float) -> None:
+    pass
+
+
+def build_multi_temperature(
+    request: MultiTemperatureRequest,
+    progress: Callable[[float], None] = _no_progress
+) -> MultiTemperatureResponse:
+    energy = generate_energy_grid(
+        request.energy_min,
+        request.energy_max,
+        request.points
+    )
+    
+    occupations = np.stack([fermi_dirac(energy, T, request.mu) for T in request.temperatures])
+    
+    # One shared decimation for all curves; selected on f only, since the
+    # MB curves are unbounded and would dominate the triangle areas
+    keep = slice(None)
+    if request.max_output_points:
+        keep = lttb_indices(energy, occupations, request.max_output_points)
+    
+    curves = []
+    for i, T in enumerate(request.temperatures):
+        curve = MultiTemperatureCurve(
+            temperature=T,
+            occupation=occupations[i][keep].tolist()
+        )
+        
+        # Add Maxwell-Boltzmann if requested
+        if request.include_maxwell_boltzmann and T > 0:
+            mb = maxwell_boltzmann(energy[keep], T, request.mu)
+            curve.maxwell_boltzmann = mb.tolist()
+        
+        curves.append(curve)
+        progress((i + 1) / len(request.temperatures))
+    
+    return MultiTemperatureResponse(
+        energy=energy[keep].tolist(),
+        curves=curves,
+        mu=request.mu
+    )
+
+
+def surface_temperatures(request: SurfaceRequest) -> np.ndarray:
+    """Temperature axis of a surface request."""
+    if request.temp_scale == "log":
+        return np.logspace(
+            np.log10(max(request.temp_min, 0.1)),
+            np.log10(request.temp_max),
+            request.temp_points
+        )
+    return np.linspace(
+        request.temp_min,
+        request.temp_max,
+        request.temp_points
+    )
+
+
+def build_surface(
+    request: SurfaceRequest,
+    progress: Callable[[float], None] = _no_progress,
+    blocks: int = 20,
+    energy: Optional[np.ndarray] = None
+) -> SurfaceResponse:
+    if energy is None:
+        energy = generate_energy_grid(
+            request.energy_min,
+            request.energy_max,
+            request.energy_points
+        )
+    temperatures = surface_temperatures(request)
+    
+    # Reuse cells of an aligned, recently computed surface; the missing
+    # rows and columns are computed in temperature blocks to report progress
+    occupation, reused_fraction = extend_surface(
+        surface_cache,
+        energy,
+        temperatures,
+        request.mu,
+        request.temp_scale,
+        lambda E, T: compute_2d_surface(E, T, request.mu),
+        progress=progress,
+        blocks=blocks,
+    )
+    
+    return SurfaceResponse(
+        energy=energy.tolist(),
+        temperatures=temperatures.tolist(),
+        occupation=occupation.tolist(),
+        mu=request.mu,
+        reused_fraction=reused_fraction
+    )
+
+
+OVERLAY_COMPONENTS = (
+    ViewComponent.CURVES,
+    ViewComponent.MAXWELL_BOLTZMANN,
+    ViewComponent.DERIVATIVE,
+)
+
+
+def build_view(
+    request: ViewRequest,
+    progress: Callable[[float], None] = _no_progress
+) -> ViewResponse:
+    wanted = set(request.components)
+    energy = generate_energy_grid(
+        request.energy_min,
+        request.energy_max,
+        request.points
+    )
+    response = ViewResponse(components=request.components, mu=request.mu)
+    
+    if wanted.intersection(OVERLAY_COMPONENTS):
+        # One exponential per (T, E) cell feeds every overlay component
+        occupation, mb, derivative = fermi_dirac_components(
+            energy,
+            np.asarray(request.temperatures, dtype=np.float64),
+            request.mu,
+            include_maxwell_boltzmann=ViewComponent.MAXWELL_BOLTZMANN in wanted,
+            include_derivative=ViewComponent.DERIVATIVE in wanted,
+        )
+        
+        # Shared decimation, selected on f and (peak-normalized) df/dE;
+        # the unbounded MB curves would dominate the triangle areas
+        keep = slice(None)
+        if request.max_output_points:
+            shape = occupation
+            if derivative is not None:
+                peaks = np.max(np.abs(derivative), axis=1, keepdims=True)
+                shape = np.vstack([occupation, derivative / np.where(peaks > 0, peaks, 1.0)])
+            keep = lttb_indices(energy, shape, request.max_output_points)
+        
+        curves = []
+        for i, T in enumerate(request.temperatures):
+            curve = ViewCurve(temperature=T)
+            if ViewComponent.CURVES in wanted:
+                curve.occupation = occupation[i][keep].tolist()
+            if mb is not None and T > 0:
+                curve.maxwell_boltzmann = mb[i][keep].tolist()
+            if derivative is not None:
+                curve.derivative = derivative[i][keep].tolist()
+            curves.append(curve)
+        
+        response.energy = energy[keep].tolist()
+        response.curves = curves
+    progress(0.5)
+    
+    if ViewComponent.HEATMAP in wanted:
+        surface_request = SurfaceRequest(
+            mu=request.mu,
+            energy_min=request.energy_min,
+            energy_max=request.energy_max,
+            **request.heatmap.model_dump()
+        )
+        # Reuse the overlay grid when the resolutions agree
+        shared_energy = energy if request.heatmap.energy_points == request.points else None
+        response.heatmap = build_surface(surface_request, energy=shared_energy)
+    progress(1.0)
+    
+    return response
+
+
+def build_thermodynamics(
+    request: ThermodynamicsRequest,
+    progress: Callable[[float], None] = _no_progress,
+    blocks: int = 20
+) -> ThermodynamicsResponse:
+    energy = generate_energy_grid(
+        request.energy_min,
+        request.energy_max,
+        request.points
+    )
+    
+    dos = density_of_states(
+        energy,
+        model=request.dos.model.value,
+        band_edge=request.dos.band_edge,
+        prefactor=request.dos.prefactor,
+        table_energy=request.dos.energies,
+        table_dos=request.dos.values
+    )
+    
+    temperatures = np.asarray(request.temperatures, dtype=np.float64)
+    parts = []
+    done = 0
+    for block in np.array_split(temperatures, min(blocks, len(temperatures))):
+        parts.append(compute_thermodynamics(
+            energy, dos, block, request.mu, method=request.method.value
+        ))
+        done += len(block)
+        progress(done / len(temperatures))
+    
+    return ThermodynamicsResponse(
+        temperatures=temperatures.tolist(),
+        electron_density=np.concatenate([p.electron_density for p in parts]).tolist(),
+        internal_energy=np.concatenate([p.internal_energy for p in parts]).tolist(),
+        specific_heat=np.concatenate([p.specific_heat for p in parts]).tolist(),
+        method=[m for p in parts for m in p.method],
+        mu=request.mu
+    )
+
+
+def _finite_or_none(values: np.ndarray) -> list:
+    return [float(v) if np.isfinite(v) else None for v in values]
+
+
+def build_transport(
+    request: TransportRequest,
+    progress: Callable[[float], None] = _no_progress,
+    blocks: int = 20
+) -> TransportResponse:
+    spec = request.transport_function
+    
+    def sigma(energy: np.ndarray) -> np.ndarray:
+        return transport_function(
+            energy,
+            model=spec.model.value,
+            sigma_0=spec.sigma_0,
+            band_edge=spec.band_edge,
+            exponent=spec.exponent,
+            table_energy=spec.energies,
+            table_sigma=spec.values
+        )
+    
+    # Where σ(E) vanishes or has kinks, so narrow features are not stepped over
+    support, breakpoints = (-np.inf, np.inf), None
+    if spec.model == TransportModel.POWER_LAW:
+        support = (spec.band_edge, np.inf)
+    elif spec.model == TransportModel.TABULATED and spec.energies is not None:
+        support = (spec.energies[0], spec.energies[-1])
+        breakpoints = np.asarray(spec.energies, dtype=np.float64)
+    
+    # Blocks of sorted temperatures keep each block's thermal windows alike
+    temperatures = np.asarray(request.temperatures, dtype=np.float64)
+    order = np.argsort(temperatures, kind="stable")
+    parts = []
+    done = 0
+    for idx in np.array_split(order, min(blocks, len(order))):
+        parts.append((idx, compute_transport(
+            sigma, temperatures[idx], request.mu, request.points,
+            support=support, breakpoints=breakpoints
+        )))
+        done += len(idx)
+        progress(done / len(temperatures))
+    
+    fields = ("conductivity", "seebeck", "thermal_conductivity", "lorenz_number")
+    moments = np.empty((3, len(temperatures)))
+    values = {name: np.empty(len(temperatures)) for name in fields}
+    for idx, part in parts:
+        moments[:, idx] = part.moments
+        for name in fields:
+            values[name][idx] = getattr(part, name)
+    
+    return TransportResponse(
+        temperatures=temperatures.tolist(),
+        L0=moments[0].tolist(),
+        L1=moments[1].tolist(),
+        L2=moments[2].tolist(),
+        conductivity=values["conductivity"].tolist(),
+        seebeck=_finite_or_none(values["seebeck"]),
+        thermal_conductivity=values["thermal_conductivity"].tolist(),
+        lorenz_number=_finite_or_none(values["lorenz_number"]),
+        mu=request.mu
+    )
+
+
+def build_csv(
+    temperature: float,
+    mu: float,
+    energy_min: float,
+    energy_max: float,
+    points: int,
+    progress: Callable[[float], None] = _no_progress
+) -> str:
+    energy = generate_energy_grid(energy_min, energy_max, points)
+    occupation = fermi_dirac(energy, temperature, mu)
+    
+    # Build CSV content
+    csv_lines = ["Energy (eV),Occupation f(E),Temperature (K),Mu (eV)"]
+    for i, (e, f) in enumerate(zip(energy, occupation)):
+        csv_lines.append(f"{e:.6f},{f:.6f},{temperature},{mu}")
+        if i % 10000 == 0:
+            progress(i / len(energy))
+    
+    return "\n".join(csv_lines)
+
 
 # ============== API Endpoints ==============
 
@@ -87,13 +574,22 @@ async def root():
             "/multi-temperature", 
             "/zero-temperature",
             "/surface",
-            "/physics-info"
+            "/view",
+            "/thermodynamics",
+            "/transport",
+            "/broadening",
+            "/evaluate",
+            "/sweep/stream",
+            "/volume",
+            "/jobs",
+            "/physics-info",
+            "/admission"
         ]
     }
 
 
 @app.post("/fermi-dirac", response_model=FermiDiracResponse, tags=["Computation"])
-async def compute_fermi_dirac(request: FermiDiracRequest):
+async def compute_fermi_dirac(request: FermiDiracRequest, http_request: Request):
     """
     Compute the Fermi-Dirac distribution for a single temperature.
     
@@ -104,7 +600,10 @@ async def compute_fermi_dirac(request: FermiDiracRequest):
     - **mu**: Chemical potential / Fermi level in eV
     - **energy_min/max**: Energy range in eV
     - **points**: Number of energy grid points
+    - **max_output_points**: Optional LTTB decimation of the returned curve
     """
+    await admit(http_request, estimate_curve(request.points))
+    
     try:
         # Generate energy grid
         energy = generate_energy_grid(
@@ -116,6 +615,11 @@ async def compute_fermi_dirac(request: FermiDiracRequest):
         # Compute distribution
         occupation = fermi_dirac(energy, request.temperature, request.mu)
         
+        # Decimate to the client's resolution, keeping the step sharp
+        if request.max_output_points:
+            keep = lttb_indices(energy, occupation, request.max_output_points)
+            energy, occupation = energy[keep], occupation[keep]
+        
         # Calculate thermal width
         width = thermal_smearing_width(request.temperature)
         
@@ -132,42 +636,25 @@ async def compute_fermi_dirac(request: FermiDiracRequest):
 
 
 @app.post("/multi-temperature", response_model=MultiTemperatureResponse, tags=["Computation"])
-async def compute_multi_temperature(request: MultiTemperatureRequest):
+async def compute_multi_temperature(request: MultiTemperatureRequest, http_request: Request):
     """
     Compute Fermi-Dirac distribution for multiple temperatures.
     
     Returns multiple curves suitable for overlay plotting.
     Optionally includes Maxwell-Boltzmann comparison curves.
     """
+    cache_key, cached = shared_cache_lookup("/multi-temperature", request)
+    if cached is not None:
+        return cached
+    
+    await admit(http_request, estimate_multi_temperature(
+        request.points,
+        len(request.temperatures),
+        request.include_maxwell_boltzmann
+    ))
+    
     try:
-        # Generate energy grid
-        energy = generate_energy_grid(
-            request.energy_min,
-            request.energy_max,
-            request.points
-        )
-        
-        curves = []
-        for T in request.temperatures:
-            occupation = fermi_dirac(energy, T, request.mu)
-            
-            curve = MultiTemperatureCurve(
-                temperature=T,
-                occupation=occupation.tolist()
-            )
-            
-            # Add Maxwell-Boltzmann if requested
-            if request.include_maxwell_boltzmann and T > 0:
-                mb = maxwell_boltzmann(energy, T, request.mu)
-                curve.maxwell_boltzmann = mb.tolist()
-            
-            curves.append(curve)
-        
-        return MultiTemperatureResponse(
-            energy=energy.tolist(),
-            curves=curves,
-            mu=request.mu
-        )
+        return shared_cache_store(cache_key, build_multi_temperature(request))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
@@ -175,6 +662,7 @@ async def compute_multi_temperature(request: MultiTemperatureRequest):
 
 @app.get("/zero-temperature", response_model=ZeroTemperatureResponse, tags=["Computation"])
 async def compute_zero_temperature(
+    http_request: Request,
     mu: float = 0.5,
     energy_min: float = -1.0,
     energy_max: float = 2.0,
@@ -187,6 +675,8 @@ async def compute_zero_temperature(
     step function due to the Pauli exclusion principle: all states
     below the Fermi level are occupied, none above.
     """
+    await admit(http_request, estimate_curve(points))
+    
     try:
         energy = generate_energy_grid(energy_min, energy_max, points)
         occupation = fermi_dirac(energy, temperature=0, mu=mu)
@@ -202,67 +692,591 @@ async def compute_zero_temperature(
 
 
 @app.post("/surface", response_model=SurfaceResponse, tags=["Computation"])
-async def compute_surface(request: SurfaceRequest):
+async def compute_surface(request: SurfaceRequest, http_request: Request):
     """
     Compute 2D surface f(E, T) for heatmap visualization.
     
     Returns a 2D array suitable for rendering as a heatmap or 3D surface.
     Temperature axis can be linear or logarithmic.
+    Results are shared across workers through the shared cache. When the
+    grids extend or shift a recent surface at the same μ by whole steps,
+    only the new rows and columns are computed; `reused_fraction` reports
+    the share of cells taken from it.
     """
+    cache_key, cached = shared_cache_lookup("/surface", request)
+    if cached is not None:
+        return cached
+    
+    await admit(http_request, estimate_surface(request.energy_points, request.temp_points))
+    
+    try:
+        return shared_cache_store(cache_key, build_surface(request))
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+
+
+@app.post("/view", response_model=ViewResponse, tags=["Computation"])
+async def compute_view(request: ViewRequest, http_request: Request):
+    """
+    Compute every data set a screen needs in one round trip.
+    
+    - **components**: any of `curves`, `maxwell_boltzmann`, `derivative`, `heatmap`
+    - **temperatures**, **points**, **max_output_points**: overlay components
+    - **heatmap**: heatmap resolution; μ and the energy range are shared
+    
+    The overlay components are derived from one shared energy grid and
+    one exponential per (T, E) cell, so asking for all of them costs little
+    more than the curves alone. Clients can switch between views using data
+    they already hold. Results are shared across workers through the
+    shared cache.
+    """
+    cache_key, cached = shared_cache_lookup("/view", request)
+    if cached is not None:
+        return cached
+    
+    wanted = set(request.components)
+    n_curve_components = len(wanted.intersection(OVERLAY_COMPONENTS))
+    heatmap = ViewComponent.HEATMAP in wanted
+    await admit(http_request, estimate_view(
+        request.points,
+        len(request.temperatures),
+        n_curve_components,
+        min(request.points, request.max_output_points or request.points),
+        request.heatmap.energy_points if heatmap else 0,
+        request.heatmap.temp_points if heatmap else 0,
+    ))
+    
+    try:
+        return shared_cache_store(cache_key, build_view(request))
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+
+
+@app.post("/thermodynamics", response_model=ThermodynamicsResponse, tags=["Computation"])
+async def compute_thermodynamic_observables(request: ThermodynamicsRequest, http_request: Request):
+    """
+    Compute electron density n(T), internal energy U(T) and electronic
+    specific heat C_V(T) for a whole temperature sweep.
+    
+    The density of states is a free-electron 2D/3D model or a tabulated
+    g(E). All temperatures are integrated together as a matrix-vector
+    quadrature over the occupation tensor f(T, E); with method "auto",
+    temperatures with k_B*T << μ use the Sommerfeld expansion instead.
+    """
+    cache_key, cached = shared_cache_lookup("/thermodynamics", request)
+    if cached is not None:
+        return cached
+    
+    await admit(http_request, estimate_thermodynamics(
+        request.points,
+        len(request.temperatures),
+        len(request.dos.energies or [])
+    ))
+    
+    try:
+        return shared_cache_store(cache_key, build_thermodynamics(request))
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+
+
+@app.post("/transport", response_model=TransportResponse, tags=["Computation"])
+async def compute_transport_coefficients(request: TransportRequest, http_request: Request):
+    """
+    Compute Onsager moments L_0, L_1, L_2 and the electrical conductivity,
+    Seebeck coefficient and electronic thermal conductivity for a whole
+    temperature sweep.
+    
+    σ(E) is a constant, power-law or tabulated transport function. Each
+    group of similar temperatures is integrated in one batched pass over
+    its own grid spanning μ ± 40 k_B T, the window where -df/dE is
+    non-negligible; T = 0 uses the delta-function limit.
+    """
+    cache_key, cached = shared_cache_lookup("/transport", request)
+    if cached is not None:
+        return cached
+    
+    await admit(http_request, estimate_transport(
+        request.points,
+        len(request.temperatures),
+        len(request.transport_function.energies or [])
+    ))
+    
+    try:
+        return shared_cache_store(cache_key, build_transport(request))
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+
+
+@app.post("/broadening", response_model=BroadeningResponse, tags=["Computation"])
+async def compute_broadening(request: BroadeningRequest, http_request: Request):
+    """
+    Thermally broaden a spectrum with -df/dE at several temperatures.
+    
+    The spectrum (DOS, transmission function, ...) must be sampled on a
+    uniform grid starting at energy_min with spacing energy_step. All
+    temperatures are convolved in one batched FFT pass with the analytic
+    sech² kernel. The spectrum is extended beyond its ends according to
+    `edge` before convolving; points within ~40 k_B*T of either end
+    depend on that choice.
+    """
+    await admit(http_request, estimate_broadening(
+        len(request.spectrum),
+        len(request.temperatures),
+        request.energy_step,
+        max(request.temperatures),
+        request.edge.value
+    ))
+    
+    try:
+        spectrum = np.asarray(request.spectrum, dtype=np.float64)
+        broadened = thermal_broadening(
+            spectrum,
+            request.energy_step,
+            request.temperatures,
+            edge=request.edge.value
+        )
+        energy = request.energy_min + request.energy_step * np.arange(len(spectrum))
+        
+        return BroadeningResponse(
+            energy=energy.tolist(),
+            temperatures=request.temperatures,
+            spectra=broadened.tolist(),
+            edge=request.edge.value
+        )
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+
+
+MAX_BROADENING_SAMPLES = 10_000_000
+
+
+@app.post("/broadening/binary", tags=["Computation"])
+async def compute_broadening_binary(
+    request: Request,
+    energy_step: float = Query(..., gt=0, le=10),
+    temperatures: List[float] = Query(..., min_length=1, max_length=200),
+    edge: BroadeningEdge = BroadeningEdge.EDGE,
+    dtype: str = Query("float64", pattern="^(float64|float32)$")
+):
+    """
+    Binary variant of /broadening for large spectra.
+    
+    The request body is the spectrum as a `.npy` file or as raw
+    little-endian `dtype` samples. The response is a `.npy` float64
+    array of shape (len(temperatures), len(spectrum)).
+    """
+    if any(t < 0 for t in temperatures):
+        raise HTTPException(status_code=400, detail="All temperatures must be non-negative")
+    
+    itemsize = np.dtype(BINARY_DTYPES[dtype]).itemsize
+    body_bytes = declared_body_length(
+        request, MAX_BROADENING_SAMPLES * itemsize + NPY_HEADER_MAX_BYTES
+    )
+    n = body_bytes // itemsize
+    await admit(request, body_bytes + estimate_broadening(
+        n, len(temperatures), energy_step, max(temperatures), edge.value, binary=True
+    ))
+    
+    try:
+        spectrum = decode_array_body(await read_body(request, body_bytes), dtype)
+        if spectrum.ndim != 1 or len(spectrum) < 2:
+            raise ValueError("Spectrum must be a 1D array with at least 2 samples")
+        if len(spectrum) > MAX_BROADENING_SAMPLES:
+            raise ValueError(f"At most {MAX_BROADENING_SAMPLES} spectrum samples per request")
+        
+        broadened = thermal_broadening(spectrum, energy_step, temperatures, edge=edge.value)
+        
+        return Response(
+            content=encode_npy(broadened),
+            media_type="application/octet-stream"
+        )
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+
+
+EVALUATE_KERNELS = {
+    DistributionKernel.FERMI_DIRAC: fermi_dirac,
+    DistributionKernel.DERIVATIVE: fermi_dirac_derivative,
+    DistributionKernel.MAXWELL_BOLTZMANN: maxwell_boltzmann,
+}
+
+MAX_EVALUATE_POINTS = 50_000_000
+EVALUATE_CHUNK_POINTS = 1_000_000
+
+
+@app.post("/evaluate", tags=["Computation"])
+async def evaluate_at_points(
+    request: Request,
+    kernels: List[DistributionKernel] = Query([DistributionKernel.FERMI_DIRAC], min_length=1),
+    temperatures: List[float] = Query([300.0], min_length=1, max_length=100),
+    mu: float = Query(
+        0.5, ge=-100, le=100,
+        description="Chemical potential in eV, on the same absolute scale as the energies"
+    ),
+    dtype: str = Query("float64", pattern="^(float64|float32)$"),
+    out_dtype: str = Query("float64", pattern="^(float64|float32)$"),
+    format: str = Query("raw", pattern="^(raw|npy)$")
+):
+    """
+    Evaluate distribution kernels at arbitrary energies.
+    
+    The request body holds the energies (eV), e.g. band-structure
+    eigenvalues, as raw little-endian `dtype` samples or a `.npy` file
+    of any shape; it is wrapped with `np.frombuffer`, never copied.
+    
+    The result has shape (len(kernels), len(temperatures), *energies.shape)
+    in `out_dtype`, given in the X-Shape header. It is streamed chunk by
+    chunk as raw bytes, or as a `.npy` file with `format=npy`.
+    
+    Like /thermodynamics and /transport, which also take band-structure
+    input, μ may lie within ±100 eV: eigenvalues from electronic-structure
+    codes use absolute energy references well outside the ±10 eV of the
+    plotting endpoints.
+    """
+    if any(t < 0 for t in temperatures):
+        raise HTTPException(status_code=400, detail="All temperatures must be non-negative")
+    if DistributionKernel.DERIVATIVE in kernels and any(t <= 0 for t in temperatures):
+        raise HTTPException(
+            status_code=400,
+            detail="df/dE at T=0 is a Dirac delta and cannot be sampled at arbitrary points"
+        )
+    
+    # Sized for float64 samples, the widest `dtype` offered
+    body_bytes = declared_body_length(
+        request, MAX_EVALUATE_POINTS * np.dtype(np.float64).itemsize + NPY_HEADER_MAX_BYTES
+    )
+    await admit(request, estimate_evaluate(body_bytes, EVALUATE_CHUNK_POINTS))
+    
+    try:
+        energies = decode_array_body(await read_body(request, body_bytes), dtype)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if energies.size > MAX_EVALUATE_POINTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_EVALUATE_POINTS} energies per request"
+        )
+    
+    # A view for C-ordered input; the output is always C-ordered
+    flat = energies.ravel()
+    output_dtype = np.dtype(BINARY_DTYPES[out_dtype]).newbyteorder("<")
+    shape = (len(kernels), len(temperatures)) + energies.shape
+    
+    def generate():
+        if format == "npy":
+            yield npy_header(shape, output_dtype)
+        for kernel in kernels:
+            function = EVALUATE_KERNELS[kernel]
+            for T in temperatures:
+                for start in range(0, len(flat), EVALUATE_CHUNK_POINTS):
+                    chunk = np.asarray(flat[start:start + EVALUATE_CHUNK_POINTS], dtype=np.float64)
+                    values = function(chunk, T, mu)
+                    yield values.astype(output_dtype, copy=False).tobytes()
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/octet-stream",
+        headers={
+            "X-Shape": ",".join(str(s) for s in shape),
+            "X-Dtype": out_dtype,
+            "X-Kernels": ",".join(k.value for k in kernels),
+        }
+    )
+
+
+def sse_event(event: str, data: dict, event_id: int = None) -> str:
+    """Format one server-sent event."""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+@app.post("/sweep/stream", tags=["Computation"])
+async def stream_temperature_sweep(request: SweepStreamRequest, http_request: Request):
+    """
+    Stream f(E) for a temperature schedule as server-sent events.
+    
+    The energy grid is built once; each frame is computed only when the
+    previous one has been handed to the client, so the first frame can be
+    rendered while later ones are still being computed and server memory
+    does not grow with the number of frames.
+    
+    Events:
+    - **meta**: energy grid, temperature schedule, mu and encoding
+    - **frame**: {index, temperature, occupation}; with base64 encoding
+      the occupation is little-endian float32
+    - **done**: number of frames sent
+    """
+    await admit(http_request, estimate_curve(request.points))
+    
+    try:
+        energy = generate_energy_grid(
+            request.energy_min,
+            request.energy_max,
+            request.points
+        )
+        temperatures = generate_temperature_schedule(
+            request.temp_start,
+            request.temp_end,
+            request.frames,
+            request.temp_scale
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+    
+    def encode(occupation: np.ndarray):
+        if request.encoding == FrameEncoding.BASE64:
+            return base64.b64encode(occupation.astype("<f4").tobytes()).decode("ascii")
+        return np.round(occupation, 6).tolist()
+    
+    async def generate():
+        yield sse_event("meta", {
+            "energy": energy.tolist(),
+            "temperatures": temperatures.tolist(),
+            "mu": request.mu,
+            "encoding": request.encoding.value,
+        })
+        for index, T in enumerate(temperatures):
+            if await http_request.is_disconnected():
+                return
+            occupation = fermi_dirac(energy, T, request.mu)
+            yield sse_event("frame", {
+                "index": index,
+                "temperature": float(T),
+                "occupation": encode(occupation),
+            }, event_id=index)
+            # Let other requests run between frames
+            await asyncio.sleep(0)
+        yield sse_event("done", {"frames": len(temperatures)})
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def volume_response(volume: Volume, cached: bool) -> VolumeResponse:
+    return VolumeResponse(
+        volume_id=volume.volume_id,
+        shape=list(volume.data.shape),
+        axes=list(VOLUME_AXES),
+        energy=volume.energy.tolist(),
+        temperatures=volume.temperatures.tolist(),
+        mus=volume.mus.tolist(),
+        storage=volume.storage,
+        nbytes=volume.nbytes,
+        cached=cached
+    )
+
+
+def get_cached_volume(volume_id: str) -> Volume:
+    volume = volume_cache.get(volume_id)
+    if volume is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Volume {volume_id} not found or evicted; POST /volume again"
+        )
+    return volume
+
+
+@app.post("/volume", response_model=VolumeResponse, tags=["Volume"])
+async def create_volume(request: VolumeRequest, http_request: Request):
+    """
+    Compute a 3D f(E, T, μ) block and cache it for slicing.
+    
+    Identical parameters map to the same volume_id, so repeating a request
+    returns the cached block without recomputation. The block is stored as
+    float32 or uint16 (f quantized to 1/65535) with axes
+    (temperature, mu, energy).
+    """
+    key = volume_id(request.model_dump(mode="json"))
+    volume = volume_cache.get(key)
+    if volume is not None:
+        return volume_response(volume, cached=True)
+    
+    itemsize = np.dtype(request.storage.value).itemsize
+    await admit(http_request, estimate_volume(
+        request.temp_points,
+        request.mu_points,
+        request.energy_points,
+        itemsize
+    ))
+    
     try:
-        # Generate energy grid
         energy = generate_energy_grid(
             request.energy_min,
             request.energy_max,
             request.energy_points
         )
-        
-        # Generate temperature grid
-        if request.temp_scale == "log":
-            temperatures = np.logspace(
-                np.log10(max(request.temp_min, 0.1)),
-                np.log10(request.temp_max),
-                request.temp_points
-            )
-        else:
-            temperatures = np.linspace(
-                request.temp_min,
-                request.temp_max,
-                request.temp_points
-            )
-        
-        # Compute 2D surface
-        occupation_2d = compute_2d_surface(energy, temperatures, request.mu)
-        
-        return SurfaceResponse(
-            energy=energy.tolist(),
-            temperatures=temperatures.tolist(),
-            occupation=occupation_2d.tolist(),
-            mu=request.mu
+        temperatures = generate_temperature_schedule(
+            request.temp_min,
+            request.temp_max,
+            request.temp_points,
+            request.temp_scale
         )
+        mus = np.linspace(request.mu_min, request.mu_max, request.mu_points)
+        
+        data = fermi_dirac_volume(energy, temperatures, mus, storage=request.storage.value)
+        volume = Volume(key, energy, temperatures, mus, data)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Computation error: {str(e)}")
+    
+    if not volume_cache.put(volume):
+        raise HTTPException(
+            status_code=413,
+            detail=f"Volume of {volume.nbytes} bytes exceeds the volume cache size"
+        )
+    return volume_response(volume, cached=False)
+
+
+@app.get("/volume/{volume_id}/slice", response_model=VolumeSliceResponse, tags=["Volume"])
+async def slice_volume(
+    volume_id: str,
+    http_request: Request,
+    axis: VolumeAxis,
+    index: int = Query(None, ge=0),
+    value: float = None
+):
+    """
+    Cut an axis-aligned 2D slice (fixed T, fixed μ or fixed E) from a
+    cached volume. Give either an `index` along the axis or a `value`,
+    which selects the nearest grid point.
+    """
+    volume = get_cached_volume(volume_id)
+    coordinates = volume.axis_values(axis.value)
+    
+    if index is None:
+        if value is None:
+            raise HTTPException(status_code=400, detail="Give either index or value")
+        index = int(np.argmin(np.abs(coordinates - value)))
+    if index >= len(coordinates):
+        raise HTTPException(
+            status_code=400,
+            detail=f"index must be below {len(coordinates)} for axis {axis.value}"
+        )
+    
+    position = VOLUME_AXES.index(axis.value)
+    remaining = [name for name in VOLUME_AXES if name != axis.value]
+    plane = np.take(volume.data, index, axis=position)
+    await admit(http_request, estimate_volume_box(plane.size))
+    
+    return VolumeSliceResponse(
+        volume_id=volume_id,
+        axis=axis.value,
+        index=index,
+        value=float(coordinates[index]),
+        axes=remaining,
+        rows=volume.axis_values(remaining[0]).tolist(),
+        columns=volume.axis_values(remaining[1]).tolist(),
+        occupation=dequantize_volume(plane).tolist()
+    )
+
+
+@app.get("/volume/{volume_id}/box", tags=["Volume"])
+async def box_volume(
+    volume_id: str,
+    http_request: Request,
+    t_start: int = Query(0, ge=0),
+    t_stop: int = Query(None, ge=1),
+    mu_start: int = Query(0, ge=0),
+    mu_stop: int = Query(None, ge=1),
+    e_start: int = Query(0, ge=0),
+    e_stop: int = Query(None, ge=1),
+    format: str = Query("json", pattern="^(json|npy)$")
+):
+    """
+    Cut a sub-box [start, stop) along each axis from a cached volume.
+    
+    Omitted stops run to the end of the axis. With `format=npy` the box
+    is returned as a float32 `.npy` array of shape
+    (temperature, mu, energy).
+    """
+    volume = get_cached_volume(volume_id)
+    t_slice = slice(t_start, t_stop)
+    mu_slice = slice(mu_start, mu_stop)
+    e_slice = slice(e_start, e_stop)
+    
+    box = volume.data[t_slice, mu_slice, e_slice]
+    if box.size == 0:
+        raise HTTPException(status_code=400, detail="Box is empty; check start/stop indices")
+    await admit(http_request, estimate_volume_box(box.size, binary=format == "npy"))
+    
+    occupation = dequantize_volume(box)
+    if format == "npy":
+        return Response(content=encode_npy(occupation), media_type="application/octet-stream")
+    
+    return VolumeBoxResponse(
+        volume_id=volume_id,
+        temperatures=volume.temperatures[t_slice].tolist(),
+        mus=volume.mus[mu_slice].tolist(),
+        energy=volume.energy[e_slice].tolist(),
+        occupation=occupation.tolist()
+    )
+
+
+@app.get("/shared-cache", tags=["Info"])
+async def get_shared_cache_status():
+    """Usage of the cross-worker result cache (hit counters are per worker)."""
+    return shared_cache.status()
+
+
+@app.get("/surface-cache", tags=["Info"])
+async def get_surface_cache_status():
+    """Usage and cell reuse of this worker's incremental surface cache."""
+    return surface_cache.status()
+
+
+@app.get("/volume-cache", tags=["Info"])
+async def get_volume_cache_status():
+    """Usage of the shared volume directory and this worker's map cache."""
+    return volume_cache.status()
 
 
 @app.get("/derivative", tags=["Computation"])
 async def compute_derivative(
+    http_request: Request,
     temperature: float = 300.0,
     mu: float = 0.5,
     energy_min: float = -1.0,
     energy_max: float = 2.0,
-    points: int = 500
+    points: int = 500,
+    max_output_points: Optional[int] = Query(None, ge=3, le=10000)
 ):
     """
     Compute the derivative df/dE of the Fermi-Dirac distribution.
     
     The derivative is peaked at E = μ and is useful for understanding
     thermal broadening and calculating transport properties.
+    With `max_output_points` the curve is decimated (LTTB) for display.
     """
+    await admit(http_request, estimate_curve(points))
+    
     try:
         energy = generate_energy_grid(energy_min, energy_max, points)
         derivative = fermi_dirac_derivative(energy, temperature, mu)
         
+        if max_output_points:
+            keep = lttb_indices(energy, derivative, max_output_points)
+            energy, derivative = energy[keep], derivative[keep]
+        
         return {
             "energy": energy.tolist(),
             "derivative": derivative.tolist(),
@@ -306,8 +1320,61 @@ async def get_physics_info():
     )
 
 
+@app.get("/admission", tags=["Info"])
+async def get_admission_status():
+    """
+    Current memory-budget usage of this worker process.
+    
+    Every computation request reserves its estimated peak memory until
+    its response is sent; requests that do not fit are queued, then
+    rejected with 429/503 and Retry-After.
+    """
+    return memory_budget.status()
+
+
+def get_profile_store():
+    if profile_store is None:
+        raise HTTPException(status_code=404, detail="Profiling is disabled on this server")
+    return profile_store
+
+
+@app.get("/profiles", tags=["Profiling"])
+async def list_profiles():
+    """
+    Stored request profiles of this host, newest first.
+    
+    Requests are profiled when the server runs with FD_PROFILING_ENABLED=1
+    and the request carries `X-Profile: 1` (or `cpu`, `memory`) or
+    `?profile=1`; the report ID comes back in `X-Profile-Id`.
+    """
+    return get_profile_store().list()
+
+
+@app.get("/profiles/{profile_id}", tags=["Profiling"])
+async def get_profile(profile_id: str):
+    """Report of one profiled request: top-N hot functions and memory peaks."""
+    report = get_profile_store().load(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile '{profile_id}'")
+    return report
+
+
+@app.get("/profiles/{profile_id}/pstats", tags=["Profiling"])
+async def get_profile_stats(profile_id: str):
+    """Raw cProfile stats of one profiled request, for pstats or snakeviz."""
+    store = get_profile_store()
+    try:
+        path = store.path(profile_id, "prof")
+    except KeyError:
+        path = None
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"No CPU profile for '{profile_id}'")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+
 @app.get("/export/csv", tags=["Export"])
 async def export_csv(
+    http_request: Request,
     temperature: float = 300.0,
     mu: float = 0.5,
     energy_min: float = -1.0,
@@ -317,15 +1384,9 @@ async def export_csv(
     """
     Export Fermi-Dirac data as CSV format.
     """
-    energy = generate_energy_grid(energy_min, energy_max, points)
-    occupation = fermi_dirac(energy, temperature, mu)
-    
-    # Build CSV content
-    csv_lines = ["Energy (eV),Occupation f(E),Temperature (K),Mu (eV)"]
-    for e, f in zip(energy, occupation):
-        csv_lines.append(f"{e:.6f},{f:.6f},{temperature},{mu}")
+    await admit(http_request, estimate_export_csv(points))
     
-    csv_content = "\n".join(csv_lines)
+    csv_content = build_csv(temperature, mu, energy_min, energy_max, points)
     
     return JSONResponse(
         content={"csv": csv_content, "filename": f"fermi_dirac_T{temperature}K.csv"},
@@ -333,6 +1394,141 @@ async def export_csv(
     )
 
 
+# ============== Asynchronous Jobs ==============
+
+def _json_job(build):
+    return lambda params, progress: build(params, progress).model_dump_json().encode("utf-8")
+
+
+def _broadening_job(request: BroadeningRequest, progress: Callable[[float], None]) -> bytes:
+    spectra = []
+    temperatures = np.asarray(request.temperatures, dtype=np.float64)
+    for block in np.array_split(temperatures, min(20, len(temperatures))):
+        spectra.extend(thermal_broadening(
+            request.spectrum, request.energy_step, block, edge=request.edge.value
+        ).tolist())
+        progress(len(spectra) / len(temperatures))
+    energy = request.energy_min + request.energy_step * np.arange(len(request.spectrum))
+    return BroadeningResponse(
+        energy=energy.tolist(),
+        temperatures=request.temperatures,
+        spectra=spectra,
+        edge=request.edge.value
+    ).model_dump_json().encode("utf-8")
+
+
+def _export_csv_job(request: FermiDiracRequest, progress: Callable[[float], None]) -> bytes:
+    return build_csv(
+        request.temperature,
+        request.mu,
+        request.energy_min,
+        request.energy_max,
+        request.points,
+        progress
+    ).encode("utf-8")
+
+
+# Jobs reserve the same estimates as the matching endpoints while they run
+job_manager.register(
+    "surface", SurfaceRequest, _json_job(build_surface),
+    estimate=lambda r: estimate_surface(r.energy_points, r.temp_points)
+)
+job_manager.register(
+    "multi-temperature", MultiTemperatureRequest, _json_job(build_multi_temperature),
+    estimate=lambda r: estimate_multi_temperature(
+        r.points, len(r.temperatures), r.include_maxwell_boltzmann
+    )
+)
+job_manager.register(
+    "thermodynamics", ThermodynamicsRequest, _json_job(build_thermodynamics),
+    estimate=lambda r: estimate_thermodynamics(
+        r.points, len(r.temperatures), len(r.dos.energies or [])
+    )
+)
+job_manager.register(
+    "transport", TransportRequest, _json_job(build_transport),
+    estimate=lambda r: estimate_transport(
+        r.points, len(r.temperatures), len(r.transport_function.energies or [])
+    )
+)
+job_manager.register(
+    "broadening", BroadeningRequest, _broadening_job,
+    estimate=lambda r: estimate_broadening(
+        len(r.spectrum), len(r.temperatures), r.energy_step, max(r.temperatures), r.edge.value
+    )
+)
+job_manager.register(
+    "export-csv", FermiDiracRequest, _export_csv_job,
+    media_type="text/csv", filename="fermi_dirac.csv",
+    estimate=lambda r: estimate_export_csv(r.points)
+)
+
+
+def job_response(status) -> JobStatusResponse:
+    return JobStatusResponse(**asdict(status))
+
+
+@app.post("/jobs", response_model=JobStatusResponse, status_code=202, tags=["Jobs"])
+async def submit_job(request: JobSubmitRequest):
+    """
+    Submit a long-running computation as a job.
+    
+    Returns immediately with a job ID. Poll GET /jobs/{id} for status and
+    progress, then fetch GET /jobs/{id}/result. Jobs run on a local
+    worker pool (higher priority first) and finished results are kept
+    for a limited time (see expires_at).
+    """
+    try:
+        status = job_manager.submit(request.kind.value, request.params, request.priority)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return job_response(status)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse, tags=["Jobs"])
+async def get_job(job_id: str):
+    """Status and progress of a job."""
+    status = job_manager.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found or expired")
+    return job_response(status)
+
+
+@app.get("/jobs/{job_id}/result", tags=["Jobs"])
+async def get_job_result(job_id: str):
+    """
+    Stream the result of a finished job from disk.
+    
+    Returns 409 while the job is still queued or running, or when it
+    failed or was cancelled.
+    """
+    status = job_manager.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found or expired")
+    if status.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {status.status}")
+    return FileResponse(
+        job_manager.result_path(job_id),
+        media_type=status.media_type,
+        filename=status.filename
+    )
+
+
+@app.delete("/jobs/{job_id}", response_model=JobStatusResponse, tags=["Jobs"])
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job, or delete a finished job's result.
+    
+    Running jobs stop at their next progress report.
+    """
+    status = job_manager.cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found or expired")
+    return job_response(status)
+
+
 # ============== Run Server ==============
 
 if __name__ == "__main__":
@@ -16,6 +16,78 @@ class EnergySpacing(str, Enum):
     LOGARITHMIC = "log"
 
 
+class DensityOfStatesModel(str, Enum):
+    """Density of states models for thermodynamic integrals."""
+    FREE_ELECTRON_3D = "free_electron_3d"
+    FREE_ELECTRON_2D = "free_electron_2d"
+    TABULATED = "tabulated"
+
+
+class TransportModel(str, Enum):
+    """Transport function models for Onsager moments."""
+    CONSTANT = "constant"
+    POWER_LAW = "power_law"
+    TABULATED = "tabulated"
+
+
+class BroadeningEdge(str, Enum):
+    """Spectrum extension used to pad before FFT convolution."""
+    EDGE = "edge"
+    ZERO = "zero"
+    REFLECT = "reflect"
+
+
+class DistributionKernel(str, Enum):
+    """Distribution functions that can be evaluated at arbitrary energies."""
+    FERMI_DIRAC = "fermi_dirac"
+    DERIVATIVE = "derivative"
+    MAXWELL_BOLTZMANN = "maxwell_boltzmann"
+
+
+class FrameEncoding(str, Enum):
+    """Encoding of occupation curves in streamed frames."""
+    JSON = "json"
+    BASE64 = "base64"
+
+
+class VolumeStorage(str, Enum):
+    """Compact storage formats for f(E, T, μ) volumes."""
+    FLOAT32 = "float32"
+    UINT16 = "uint16"
+
+
+class VolumeAxis(str, Enum):
+    """Axes of an f(E, T, μ) volume."""
+    TEMPERATURE = "temperature"
+    MU = "mu"
+    ENERGY = "energy"
+
+
+class JobKindName(str, Enum):
+    """Computations that can be submitted as asynchronous jobs."""
+    SURFACE = "surface"
+    MULTI_TEMPERATURE = "multi-temperature"
+    THERMODYNAMICS = "thermodynamics"
+    TRANSPORT = "transport"
+    BROADENING = "broadening"
+    EXPORT_CSV = "export-csv"
+
+
+class ViewComponent(str, Enum):
+    """Data sets a combined view request can ask for."""
+    CURVES = "curves"
+    MAXWELL_BOLTZMANN = "maxwell_boltzmann"
+    DERIVATIVE = "derivative"
+    HEATMAP = "heatmap"
+
+
+class ThermodynamicsMethod(str, Enum):
+    """Evaluation strategy for thermodynamic observables."""
+    AUTO = "auto"
+    QUADRATURE = "quadrature"
+    SOMMERFELD = "sommerfeld"
+
+
 # ============== Request Models ==============
 
 class FermiDiracRequest(BaseModel):
@@ -59,6 +131,12 @@ class FermiDiracRequest(BaseModel):
         le=10000,
         description="Number of energy grid points"
     )
+    max_output_points: Optional[int] = Field(
+        default=None,
+        ge=3,
+        le=10000,
+        description="Decimate the curve to at most this many points (LTTB), e.g. the chart width in pixels"
+    )
     
     @field_validator('energy_max')
     @classmethod
@@ -115,6 +193,12 @@ class MultiTemperatureRequest(BaseModel):
         default=False,
         description="Include Maxwell-Boltzmann comparison curves"
     )
+    max_output_points: Optional[int] = Field(
+        default=None,
+        ge=3,
+        le=5000,
+        description="Decimate all curves to at most this many shared points (LTTB)"
+    )
     
     @field_validator('temperatures')
     @classmethod
@@ -195,6 +279,632 @@ class SurfaceRequest(BaseModel):
         }
 
 
+class DensityOfStatesSpec(BaseModel):
+    """
+    Density of states g(E) specification.
+    
+    Free-electron models use `band_edge` and `prefactor`; the tabulated
+    model is linearly interpolated from `energies`/`values` and is zero
+    outside the tabulated range.
+    """
+    model: DensityOfStatesModel = Field(
+        default=DensityOfStatesModel.FREE_ELECTRON_3D,
+        description="Density of states model"
+    )
+    band_edge: float = Field(
+        default=0.0,
+        ge=-100,
+        le=100,
+        description="Band bottom E_0 in eV (free-electron models)"
+    )
+    prefactor: float = Field(
+        default=1.0,
+        gt=0,
+        description="DOS amplitude in states/eV (free-electron models)"
+    )
+    energies: Optional[List[float]] = Field(
+        default=None,
+        max_length=100000,
+        description="Tabulated energies in eV, strictly increasing"
+    )
+    values: Optional[List[float]] = Field(
+        default=None,
+        max_length=100000,
+        description="Tabulated g(E) values in states/eV"
+    )
+    
+    @field_validator('values')
+    @classmethod
+    def validate_table(cls, v, info):
+        energies = info.data.get('energies')
+        if v is None and energies is None:
+            return v
+        if v is None or energies is None or len(v) != len(energies):
+            raise ValueError('energies and values must be given together with equal length')
+        if len(v) < 2:
+            raise ValueError('Tabulated DOS needs at least 2 points')
+        if any(b <= a for a, b in zip(energies, energies[1:])):
+            raise ValueError('Tabulated energies must be strictly increasing')
+        if any(g < 0 for g in v):
+            raise ValueError('Density of states must be non-negative')
+        return v
+
+
+class ThermodynamicsRequest(BaseModel):
+    """
+    Request model for n(T), U(T) and C_V(T) over a temperature sweep.
+    """
+    dos: DensityOfStatesSpec = Field(
+        default_factory=DensityOfStatesSpec,
+        description="Density of states g(E)"
+    )
+    temperatures: List[float] = Field(
+        default=[0, 100, 300, 1000, 3000],
+        min_length=1,
+        max_length=2000,
+        description="List of temperatures in Kelvin"
+    )
+    mu: float = Field(
+        default=5.0,
+        ge=-100,
+        le=100,
+        description="Chemical potential in eV"
+    )
+    energy_min: float = Field(
+        default=0.0,
+        ge=-100,
+        le=100,
+        description="Lower integration limit in eV"
+    )
+    energy_max: float = Field(
+        default=10.0,
+        ge=-100,
+        le=100,
+        description="Upper integration limit in eV"
+    )
+    points: int = Field(
+        default=5000,
+        ge=10,
+        le=50000,
+        description="Number of energy quadrature points"
+    )
+    method: ThermodynamicsMethod = Field(
+        default=ThermodynamicsMethod.AUTO,
+        description="'quadrature', 'sommerfeld', or 'auto' (Sommerfeld when k_B*T << μ)"
+    )
+    
+    @field_validator('energy_max')
+    @classmethod
+    def energy_max_greater_than_min(cls, v, info):
+        if 'energy_min' in info.data and v <= info.data['energy_min']:
+            raise ValueError('energy_max must be greater than energy_min')
+        return v
+    
+    @field_validator('temperatures')
+    @classmethod
+    def validate_temperatures(cls, v):
+        if any(t < 0 for t in v):
+            raise ValueError('All temperatures must be non-negative')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "dos": {"model": "free_electron_3d", "band_edge": 0.0, "prefactor": 1.0},
+                "temperatures": [0, 100, 300, 1000, 3000],
+                "mu": 5.0,
+                "energy_min": 0.0,
+                "energy_max": 10.0,
+                "points": 5000,
+                "method": "auto"
+            }
+        }
+
+
+class TransportFunctionSpec(BaseModel):
+    """
+    Transport function σ(E) specification.
+    
+    `constant` is σ_0 everywhere; `power_law` is σ_0 ((E - E_0)/1 eV)^r
+    above the band edge; the tabulated model is linearly interpolated from
+    `energies`/`values` and is zero outside the tabulated range.
+    """
+    model: TransportModel = Field(
+        default=TransportModel.POWER_LAW,
+        description="Transport function model"
+    )
+    sigma_0: float = Field(
+        default=1.0,
+        gt=0,
+        description="Amplitude σ_0, e.g. in S/m (constant and power-law models)"
+    )
+    band_edge: float = Field(
+        default=0.0,
+        ge=-100,
+        le=100,
+        description="Band edge E_0 in eV (power-law model)"
+    )
+    exponent: float = Field(
+        default=1.5,
+        ge=0,
+        le=10,
+        description="Exponent r (power-law model)"
+    )
+    energies: Optional[List[float]] = Field(
+        default=None,
+        max_length=100000,
+        description="Tabulated energies in eV, strictly increasing"
+    )
+    values: Optional[List[float]] = Field(
+        default=None,
+        max_length=100000,
+        description="Tabulated σ(E) values"
+    )
+    
+    @field_validator('values')
+    @classmethod
+    def validate_table(cls, v, info):
+        energies = info.data.get('energies')
+        if v is None and energies is None:
+            return v
+        if v is None or energies is None or len(v) != len(energies):
+            raise ValueError('energies and values must be given together with equal length')
+        if len(v) < 2:
+            raise ValueError('Tabulated transport function needs at least 2 points')
+        if any(b <= a for a, b in zip(energies, energies[1:])):
+            raise ValueError('Tabulated energies must be strictly increasing')
+        if any(s < 0 for s in v):
+            raise ValueError('Transport function must be non-negative')
+        return v
+
+
+class TransportRequest(BaseModel):
+    """
+    Request model for Onsager moments and transport coefficients vs T.
+    """
+    transport_function: TransportFunctionSpec = Field(
+        default_factory=TransportFunctionSpec,
+        description="Transport function σ(E)"
+    )
+    temperatures: List[float] = Field(
+        default=[0, 100, 300, 1000, 3000],
+        min_length=1,
+        max_length=5000,
+        description="List of temperatures in Kelvin"
+    )
+    mu: float = Field(
+        default=5.0,
+        ge=-100,
+        le=100,
+        description="Chemical potential in eV"
+    )
+    points: int = Field(
+        default=2001,
+        ge=101,
+        le=20001,
+        description="Quadrature points across each thermal window μ ± 40 k_B T"
+    )
+    
+    @field_validator('temperatures')
+    @classmethod
+    def validate_temperatures(cls, v):
+        if any(t < 0 for t in v):
+            raise ValueError('All temperatures must be non-negative')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "transport_function": {"model": "power_law", "sigma_0": 1e6, "band_edge": 0.0, "exponent": 1.5},
+                "temperatures": [0, 100, 300, 1000, 3000],
+                "mu": 5.0,
+                "points": 2001
+            }
+        }
+
+
+class BroadeningRequest(BaseModel):
+    """
+    Request model for thermal broadening of a uniformly gridded spectrum.
+    
+    The spectrum is sampled at energy_min + i * energy_step and convolved
+    with -df/dE at each temperature.
+    """
+    spectrum: List[float] = Field(
+        min_length=2,
+        max_length=200000,
+        description="Spectrum values on a uniform energy grid"
+    )
+    energy_min: float = Field(
+        default=0.0,
+        ge=-100,
+        le=100,
+        description="Energy of the first spectrum sample in eV"
+    )
+    energy_step: float = Field(
+        gt=0,
+        le=10,
+        description="Uniform energy grid spacing in eV"
+    )
+    temperatures: List[float] = Field(
+        default=[0, 100, 300, 1000],
+        min_length=1,
+        max_length=200,
+        description="List of temperatures in Kelvin"
+    )
+    edge: BroadeningEdge = Field(
+        default=BroadeningEdge.EDGE,
+        description="Spectrum extension beyond its ends: 'edge', 'zero' or 'reflect'"
+    )
+    
+    @field_validator('temperatures')
+    @classmethod
+    def validate_temperatures(cls, v):
+        if any(t < 0 for t in v):
+            raise ValueError('All temperatures must be non-negative')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "spectrum": [0.0, 0.0, 1.0, 1.0, 1.0],
+                "energy_min": -0.02,
+                "energy_step": 0.01,
+                "temperatures": [0, 100, 300],
+                "edge": "edge"
+            }
+        }
+
+
+class SweepStreamRequest(BaseModel):
+    """
+    Request model for a streamed temperature sweep on a fixed energy grid.
+    """
+    temp_start: float = Field(
+        default=0.0,
+        ge=0,
+        le=1e6,
+        description="First temperature in K"
+    )
+    temp_end: float = Field(
+        default=10000.0,
+        ge=0,
+        le=1e6,
+        description="Last temperature in K"
+    )
+    frames: int = Field(
+        default=200,
+        ge=1,
+        le=5000,
+        description="Number of frames (temperatures)"
+    )
+    temp_scale: str = Field(
+        default="log",
+        pattern="^(linear|log)$",
+        description="Schedule spacing: 'linear' or 'log'"
+    )
+    mu: float = Field(
+        default=0.5,
+        ge=-10,
+        le=10,
+        description="Chemical potential in eV"
+    )
+    energy_min: float = Field(
+        default=-1.0,
+        ge=-100,
+        le=100,
+        description="Minimum energy in eV"
+    )
+    energy_max: float = Field(
+        default=2.0,
+        ge=-100,
+        le=100,
+        description="Maximum energy in eV"
+    )
+    points: int = Field(
+        default=500,
+        ge=10,
+        le=10000,
+        description="Number of energy grid points"
+    )
+    encoding: FrameEncoding = Field(
+        default=FrameEncoding.JSON,
+        description="'json' (6-decimal lists) or 'base64' (little-endian float32)"
+    )
+    
+    @field_validator('energy_max')
+    @classmethod
+    def energy_max_greater_than_min(cls, v, info):
+        if 'energy_min' in info.data and v <= info.data['energy_min']:
+            raise ValueError('energy_max must be greater than energy_min')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "temp_start": 0,
+                "temp_end": 10000,
+                "frames": 200,
+                "temp_scale": "log",
+                "mu": 0.5,
+                "energy_min": -1,
+                "energy_max": 2,
+                "points": 500,
+                "encoding": "base64"
+            }
+        }
+
+
+class HeatmapSpec(BaseModel):
+    """
+    Resolution of the f(E, T) heatmap inside a view request.
+    
+    μ and the energy range are taken from the enclosing request.
+    """
+    energy_points: int = Field(
+        default=200,
+        ge=10,
+        le=1000,
+        description="Number of energy grid points"
+    )
+    temp_min: float = Field(
+        default=1.0,
+        ge=0.1,
+        description="Minimum temperature in K"
+    )
+    temp_max: float = Field(
+        default=5000.0,
+        le=1e6,
+        description="Maximum temperature in K"
+    )
+    temp_points: int = Field(
+        default=100,
+        ge=10,
+        le=500,
+        description="Number of temperature grid points"
+    )
+    temp_scale: str = Field(
+        default="log",
+        pattern="^(linear|log)$",
+        description="Temperature axis scale: 'linear' or 'log'"
+    )
+    
+    @field_validator('temp_max')
+    @classmethod
+    def temp_max_greater_than_min(cls, v, info):
+        if 'temp_min' in info.data and v <= info.data['temp_min']:
+            raise ValueError('temp_max must be greater than temp_min')
+        return v
+
+
+class ViewRequest(BaseModel):
+    """
+    Request model for everything one screen needs in a single round trip.
+    
+    The overlay components (curves, Maxwell-Boltzmann limits, derivative)
+    share one energy grid and one set of exponentials; the heatmap is
+    filled on its own (T, E) grid over the same energy range.
+    """
+    components: List[ViewComponent] = Field(
+        default=[ViewComponent.CURVES, ViewComponent.HEATMAP],
+        min_length=1,
+        description="Components to compute: curves, maxwell_boltzmann, derivative, heatmap"
+    )
+    temperatures: List[float] = Field(
+        default=[0, 100, 300, 1000, 3000],
+        min_length=1,
+        max_length=20,
+        description="Overlay temperatures in Kelvin"
+    )
+    mu: float = Field(
+        default=0.5,
+        ge=-10,
+        le=10,
+        description="Chemical potential in eV"
+    )
+    energy_min: float = Field(
+        default=-1.0,
+        description="Minimum energy in eV"
+    )
+    energy_max: float = Field(
+        default=2.0,
+        description="Maximum energy in eV"
+    )
+    points: int = Field(
+        default=500,
+        ge=10,
+        le=5000,
+        description="Number of energy grid points of the overlay components"
+    )
+    max_output_points: Optional[int] = Field(
+        default=None,
+        ge=3,
+        le=5000,
+        description="Decimate the overlay components to at most this many shared points (LTTB)"
+    )
+    heatmap: HeatmapSpec = Field(
+        default_factory=HeatmapSpec,
+        description="Heatmap resolution (used when 'heatmap' is requested)"
+    )
+    
+    @field_validator('components')
+    @classmethod
+    def deduplicate_components(cls, v):
+        return list(dict.fromkeys(v))
+    
+    @field_validator('temperatures')
+    @classmethod
+    def validate_temperatures(cls, v):
+        if any(t < 0 for t in v):
+            raise ValueError('All temperatures must be non-negative')
+        return sorted(set(v))  # Remove duplicates and sort
+    
+    @field_validator('energy_max')
+    @classmethod
+    def energy_max_greater_than_min(cls, v, info):
+        if 'energy_min' in info.data and v <= info.data['energy_min']:
+            raise ValueError('energy_max must be greater than energy_min')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "components": ["curves", "maxwell_boltzmann", "heatmap"],
+                "temperatures": [0, 100, 300, 1000, 3000],
+                "mu": 0.5,
+                "energy_min": -1,
+                "energy_max": 2,
+                "points": 500,
+                "heatmap": {"energy_points": 200, "temp_points": 100}
+            }
+        }
+
+
+# Largest f(E, T, μ) block a single request may create (cells)
+MAX_VOLUME_CELLS = 25_000_000
+
+
+class VolumeRequest(BaseModel):
+    """
+    Request model for a 3D f(E, T, μ) volume.
+    
+    The block is stored in compact form (float32, or uint16 quantized to
+    1/65535) with axes (temperature, mu, energy) and cached for slicing.
+    """
+    mu_min: float = Field(
+        default=0.0,
+        ge=-10,
+        le=10,
+        description="Minimum chemical potential in eV"
+    )
+    mu_max: float = Field(
+        default=1.0,
+        ge=-10,
+        le=10,
+        description="Maximum chemical potential in eV"
+    )
+    mu_points: int = Field(
+        default=21,
+        ge=1,
+        le=500,
+        description="Number of chemical potential grid points"
+    )
+    energy_min: float = Field(
+        default=-1.0,
+        ge=-100,
+        le=100,
+        description="Minimum energy in eV"
+    )
+    energy_max: float = Field(
+        default=2.0,
+        ge=-100,
+        le=100,
+        description="Maximum energy in eV"
+    )
+    energy_points: int = Field(
+        default=200,
+        ge=10,
+        le=5000,
+        description="Number of energy grid points"
+    )
+    temp_min: float = Field(
+        default=1.0,
+        ge=0,
+        le=1e6,
+        description="Minimum temperature in K"
+    )
+    temp_max: float = Field(
+        default=5000.0,
+        ge=0,
+        le=1e6,
+        description="Maximum temperature in K"
+    )
+    temp_points: int = Field(
+        default=100,
+        ge=1,
+        le=1000,
+        description="Number of temperature grid points"
+    )
+    temp_scale: str = Field(
+        default="log",
+        pattern="^(linear|log)$",
+        description="Temperature axis scale: 'linear' or 'log'"
+    )
+    storage: VolumeStorage = Field(
+        default=VolumeStorage.FLOAT32,
+        description="Block storage: 'float32' or quantized 'uint16'"
+    )
+    
+    @field_validator('mu_max')
+    @classmethod
+    def mu_max_not_less_than_min(cls, v, info):
+        if 'mu_min' in info.data and v < info.data['mu_min']:
+            raise ValueError('mu_max must not be less than mu_min')
+        return v
+    
+    @field_validator('energy_max')
+    @classmethod
+    def energy_max_greater_than_min(cls, v, info):
+        if 'energy_min' in info.data and v <= info.data['energy_min']:
+            raise ValueError('energy_max must be greater than energy_min')
+        return v
+    
+    @field_validator('temp_points')
+    @classmethod
+    def validate_cells(cls, v, info):
+        cells = v * info.data.get('energy_points', 1) * info.data.get('mu_points', 1)
+        if cells > MAX_VOLUME_CELLS:
+            raise ValueError(f'Volume has {cells} cells; the limit is {MAX_VOLUME_CELLS}')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "mu_min": 0.0,
+                "mu_max": 1.0,
+                "mu_points": 21,
+                "energy_min": -1.0,
+                "energy_max": 2.0,
+                "energy_points": 200,
+                "temp_min": 1.0,
+                "temp_max": 5000.0,
+                "temp_points": 100,
+                "temp_scale": "log",
+                "storage": "float32"
+            }
+        }
+
+
+class JobSubmitRequest(BaseModel):
+    """
+    Request model for submitting an asynchronous job.
+    
+    `params` is the body the matching synchronous endpoint takes
+    (e.g. a SurfaceRequest for "surface"; a FermiDiracRequest for
+    "export-csv").
+    """
+    kind: JobKindName = Field(description="Computation to run")
+    params: dict = Field(
+        default_factory=dict,
+        description="Parameters of the computation"
+    )
+    priority: int = Field(
+        default=0,
+        ge=-10,
+        le=10,
+        description="Higher priorities run first"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "kind": "surface",
+                "params": {"energy_points": 1000, "temp_points": 500},
+                "priority": 0
+            }
+        }
+
+
 # ============== Response Models ==============
 
 class FermiDiracResponse(BaseModel):
@@ -259,6 +969,10 @@ class SurfaceResponse(BaseModel):
         description="2D occupation array [temp_idx][energy_idx]"
     )
     mu: float = Field(description="Chemical potential (eV)")
+    reused_fraction: Optional[float] = Field(
+        default=None,
+        description="Fraction of cells reused from a previously computed aligned surface"
+    )
     
     class Config:
         json_schema_extra = {
@@ -275,6 +989,143 @@ class SurfaceResponse(BaseModel):
         }
 
 
+class ViewCurve(BaseModel):
+    """Overlay data of one temperature; fields not requested are null."""
+    temperature: float
+    occupation: Optional[List[float]] = None
+    maxwell_boltzmann: Optional[List[float]] = None
+    derivative: Optional[List[float]] = None
+
+
+class ViewResponse(BaseModel):
+    """
+    Response model for a combined view: overlay curves and heatmap.
+    """
+    components: List[ViewComponent] = Field(description="Components included")
+    energy: Optional[List[float]] = Field(
+        default=None,
+        description="Energy values of the overlay components (eV)"
+    )
+    curves: Optional[List[ViewCurve]] = Field(
+        default=None,
+        description="Overlay data for each temperature"
+    )
+    heatmap: Optional[SurfaceResponse] = Field(
+        default=None,
+        description="f(E, T) heatmap"
+    )
+    mu: float = Field(description="Chemical potential (eV)")
+
+
+class ThermodynamicsResponse(BaseModel):
+    """
+    Response model for thermodynamic observables vs temperature.
+    """
+    temperatures: List[float] = Field(description="Temperature values (K)")
+    electron_density: List[float] = Field(description="n(T) = ∫ g f dE (states per unit volume)")
+    internal_energy: List[float] = Field(description="U(T) = ∫ E g f dE (eV per unit volume)")
+    specific_heat: List[float] = Field(description="Electronic C_V(T) (eV/K per unit volume)")
+    method: List[str] = Field(description="Evaluation method used for each temperature")
+    mu: float = Field(description="Chemical potential (eV)")
+
+
+class TransportResponse(BaseModel):
+    """
+    Response model for transport coefficients vs temperature.
+    
+    Undefined values (Seebeck and Lorenz number where L_0 = 0, Lorenz
+    number at T = 0) are null.
+    """
+    temperatures: List[float] = Field(description="Temperature values (K)")
+    L0: List[float] = Field(description="L_0 = ∫ σ (-df/dE) dE (units of σ)")
+    L1: List[float] = Field(description="L_1 = ∫ (E-μ) σ (-df/dE) dE (eV × units of σ)")
+    L2: List[float] = Field(description="L_2 = ∫ (E-μ)² σ (-df/dE) dE (eV² × units of σ)")
+    conductivity: List[float] = Field(description="Electrical conductivity σ(T) = L_0")
+    seebeck: List[Optional[float]] = Field(description="Seebeck coefficient S(T) in V/K")
+    thermal_conductivity: List[float] = Field(
+        description="Electronic thermal conductivity κ_e(T), W/(m K) for σ in S/m"
+    )
+    lorenz_number: List[Optional[float]] = Field(description="κ_e / (σ T) in W Ω/K²")
+    mu: float = Field(description="Chemical potential (eV)")
+
+
+class BroadeningResponse(BaseModel):
+    """
+    Response model for thermally broadened spectra.
+    """
+    energy: List[float] = Field(description="Energy values (eV)")
+    temperatures: List[float] = Field(description="Temperature values (K)")
+    spectra: List[List[float]] = Field(
+        description="Broadened spectra [temp_idx][energy_idx]"
+    )
+    edge: str = Field(description="Edge extension used for padding")
+
+
+class VolumeResponse(BaseModel):
+    """
+    Response model describing a cached f(E, T, μ) volume.
+    """
+    volume_id: str = Field(description="ID for slice and box requests")
+    shape: List[int] = Field(description="Block shape [temperature, mu, energy]")
+    axes: List[str] = Field(description="Axis order of the block")
+    energy: List[float] = Field(description="Energy values (eV)")
+    temperatures: List[float] = Field(description="Temperature values (K)")
+    mus: List[float] = Field(description="Chemical potential values (eV)")
+    storage: str = Field(description="Block storage dtype")
+    nbytes: int = Field(description="Size of the cached block in bytes")
+    cached: bool = Field(description="Whether the block was already cached")
+
+
+class VolumeSliceResponse(BaseModel):
+    """
+    Response model for an axis-aligned 2D slice of a volume.
+    """
+    volume_id: str
+    axis: str = Field(description="Axis held fixed")
+    index: int = Field(description="Index along the fixed axis")
+    value: float = Field(description="Coordinate of the fixed axis")
+    axes: List[str] = Field(description="Names of the two remaining axes, row then column")
+    rows: List[float] = Field(description="Coordinates along the first remaining axis")
+    columns: List[float] = Field(description="Coordinates along the second remaining axis")
+    occupation: List[List[float]] = Field(description="2D occupation array [row][column]")
+
+
+class VolumeBoxResponse(BaseModel):
+    """
+    Response model for a sub-box of a volume.
+    """
+    volume_id: str
+    temperatures: List[float] = Field(description="Temperature values (K)")
+    mus: List[float] = Field(description="Chemical potential values (eV)")
+    energy: List[float] = Field(description="Energy values (eV)")
+    occupation: List[List[List[float]]] = Field(
+        description="3D occupation array [temp_idx][mu_idx][energy_idx]"
+    )
+
+
+class JobStatusResponse(BaseModel):
+    """
+    Response model for the state of an asynchronous job.
+    """
+    job_id: str
+    kind: str
+    status: str = Field(description="queued, running, succeeded, failed or cancelled")
+    priority: int
+    progress: float = Field(description="Completed fraction in [0, 1]")
+    created_at: float = Field(description="Unix time of submission")
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = Field(
+        default=None,
+        description="Unix time after which the job and its result are deleted"
+    )
+    error: Optional[str] = None
+    result_bytes: Optional[int] = None
+    media_type: str
+    filename: Optional[str] = None
+    cancel_requested: bool = False
+
+
 class ZeroTemperatureResponse(BaseModel):
     """
     Response model for T=0 Heaviside step function.
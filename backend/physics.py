@@ -14,7 +14,7 @@ License: MIT
 """
 
 import numpy as np
-from typing import Tuple, List, Optional
+from typing import Callable, Tuple, List, Optional
 from dataclasses import dataclass
 
 # Physical Constants (SI units converted to eV/K for convenience)
@@ -32,6 +32,40 @@ class PhysicalConstants:
         return 1.380649e-23
 
 
+# |x| = |E - μ|/(k_B*T) beyond which the distribution is saturated: for
+# x < -40, 1 + exp(x) rounds to 1 so f is exactly 1.0; for x > 40, f and
+# k_B*T*|df/dE| are below 4.3e-18 and are returned as 0.0
+SATURATION_THRESHOLD = 40.0
+
+
+def _is_sorted(energy: np.ndarray) -> bool:
+    """True for a 1D, non-decreasing (and NaN-free) grid."""
+    return energy.ndim == 1 and bool(np.all(energy[1:] >= energy[:-1]))
+
+
+def _transition_window(energy: np.ndarray, mu: float, k_B_T: float) -> Tuple[int, int]:
+    """Index range [lo, hi) of a sorted grid where |E - μ| <= 40 k_B*T."""
+    width = SATURATION_THRESHOLD * k_B_T
+    lo = int(np.searchsorted(energy, mu - width, side="left"))
+    hi = int(np.searchsorted(energy, mu + width, side="right"))
+    return lo, hi
+
+
+def _fermi_dirac_sorted(
+    energy: np.ndarray,
+    mu: float,
+    k_B_T: float,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """f on a sorted grid: exponentials inside the transition window only."""
+    occupation = np.empty_like(energy) if out is None else out
+    lo, hi = _transition_window(energy, mu, k_B_T)
+    occupation[:lo] = 1.0
+    occupation[hi:] = 0.0
+    occupation[lo:hi] = 1.0 / (np.exp((energy[lo:hi] - mu) / k_B_T) + 1.0)
+    return occupation
+
+
 def fermi_dirac(
     energy: np.ndarray,
     temperature: float,
@@ -67,6 +101,10 @@ def fermi_dirac(
     2. For large (E-μ)/kT: Use asymptotic expansion to avoid overflow
     3. For small (E-μ)/kT: Standard computation is stable
     
+    On sorted grids (e.g. from `generate_energy_grid`) only the transition
+    window |E - μ| <= 40 k_B*T is evaluated; it is located by bisection and
+    the saturated tails are filled with 1.0 and 0.0.
+    
     Physical regimes:
     - T << T_F (Fermi temp): Degenerate quantum regime, step-like
     - T >> T_F: Classical regime, approaches Maxwell-Boltzmann
@@ -77,8 +115,11 @@ def fermi_dirac(
     if temperature <= 0 or np.isclose(temperature, 0, atol=1e-10):
         return np.where(energy < mu, 1.0, np.where(energy > mu, 0.0, 0.5))
     
-    # Compute the exponent argument: (E - μ) / (k_B * T)
     k_B_T = k_B * temperature
+    if _is_sorted(energy):
+        return _fermi_dirac_sorted(energy, mu, k_B_T)
+    
+    # Compute the exponent argument: (E - μ) / (k_B * T)
     x = (energy - mu) / k_B_T
     
     # Initialize output array
@@ -140,7 +181,11 @@ def fermi_dirac_derivative(
     At T → 0, it becomes a Dirac delta function: δ(E - μ).
     
     df/dE = -1/(k_B*T) * exp(x) / (exp(x) + 1)^2 = -1/(4*k_B*T) * sech^2(x/2)
+    
+    On sorted grids only the window |x| <= 40 is evaluated (located by
+    bisection); outside it the derivative is returned as zero.
     """
+    energy = np.asarray(energy, dtype=np.float64)
     if temperature <= 0:
         # At T=0, derivative is a delta function (represented as zero array with spike)
         result = np.zeros_like(energy)
@@ -152,7 +197,6 @@ def fermi_dirac_derivative(
         return result
     
     k_B_T = k_B * temperature
-    x = (energy - mu) / k_B_T
     
     # Use sech^2 form for numerical stability
     # df/dE = -1/(4*k_B*T) * sech^2(x/2)
@@ -160,6 +204,14 @@ def fermi_dirac_derivative(
     
     result = np.zeros_like(energy)
     
+    if _is_sorted(energy):
+        lo, hi = _transition_window(energy, mu, k_B_T)
+        exp_half = np.exp((energy[lo:hi] - mu) / (2.0 * k_B_T))
+        result[lo:hi] = -(2.0 / (exp_half + 1.0/exp_half)) ** 2 / (4.0 * k_B_T)
+        return result
+    
+    x = (energy - mu) / k_B_T
+    
     # For moderate x values
     mask_stable = np.abs(x) < 500
     exp_half = np.exp(x[mask_stable] / 2)
@@ -303,6 +355,52 @@ def generate_energy_grid(
         raise ValueError(f"Unknown spacing type: {spacing}")
 
 
+def generate_temperature_schedule(
+    t_start: float,
+    t_end: float,
+    n_frames: int,
+    scale: str = "linear",
+    t_floor: float = 0.1
+) -> np.ndarray:
+    """
+    Generate a temperature schedule, e.g. for sweep animations.
+    
+    Parameters
+    ----------
+    t_start, t_end : float
+        First and last temperature (Kelvin)
+    n_frames : int
+        Number of temperatures
+    scale : str
+        "linear" or "log". A log schedule starting at 0 K begins with an
+        exact T = 0 frame and log-spaces the rest from `t_floor`. A
+        one-frame schedule is [t_start] on either scale.
+    t_floor : float, optional
+        Lowest non-zero temperature of a log schedule (Kelvin)
+    
+    Returns
+    -------
+    np.ndarray
+        Array of temperatures
+    """
+    if n_frames == 1:
+        # A single frame is just the requested start, T = 0 included
+        return np.array([float(t_start)])
+    if scale == "linear":
+        return np.linspace(t_start, t_end, n_frames)
+    elif scale == "log":
+        if t_start <= 0:
+            rest = np.logspace(np.log10(t_floor), np.log10(max(t_end, t_floor)), n_frames - 1)
+            return np.concatenate(([0.0], rest))
+        return np.logspace(
+            np.log10(max(t_start, t_floor)),
+            np.log10(max(t_end, t_floor)),
+            n_frames
+        )
+    else:
+        raise ValueError(f"Unknown temperature scale: {scale}")
+
+
 def compute_multi_temperature(
     energy: np.ndarray,
     temperatures: List[float],
@@ -358,13 +456,886 @@ def compute_2d_surface(
     np.ndarray
         2D array of shape (len(temperatures), len(energy))
         where result[i, j] = f(energy[j], temperatures[i])
-    """
-    E_grid, T_grid = np.meshgrid(energy, temperatures)
     
-    result = np.zeros_like(E_grid)
+    Notes
+    -----
+    On a sorted energy grid each row evaluates exponentials only inside
+    its transition window, so cold rows cost O(window) rather than O(grid).
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    result = np.empty((len(temperatures), len(energy)))
     
+    # Sortedness is checked once for all rows
+    sorted_grid = _is_sorted(energy)
     for i, T in enumerate(temperatures):
-        result[i, :] = fermi_dirac(energy, T, mu, k_B)
+        if sorted_grid and T > 1e-10:
+            _fermi_dirac_sorted(energy, mu, k_B * T, out=result[i])
+        else:
+            result[i, :] = fermi_dirac(energy, T, mu, k_B)
+    
+    return result
+
+
+def fermi_dirac_matrix(
+    energy: np.ndarray,
+    temperatures: np.ndarray,
+    mu: float,
+    k_B: float = K_BOLTZMANN_EV
+) -> np.ndarray:
+    """
+    Compute the fused occupation tensor f(T, E) by broadcasting.
+    
+    Every temperature row is evaluated in a single vectorized pass using
+    the overflow-free form f = e / (1 + e) with e = exp(-|x|), so no
+    per-row masking or Python loop is needed.
+    
+    Parameters
+    ----------
+    energy : np.ndarray
+        1D array of energy values (eV)
+    temperatures : np.ndarray
+        1D array of temperatures (Kelvin)
+    mu : float
+        Chemical potential (eV)
+    k_B : float, optional
+        Boltzmann constant in eV/K
+    
+    Returns
+    -------
+    np.ndarray
+        2D array of shape (len(temperatures), len(energy))
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    
+    cold = temperatures <= 0
+    k_B_T = k_B * np.where(cold, 1.0, temperatures)
+    x = (energy[np.newaxis, :] - mu) / k_B_T[:, np.newaxis]
+    
+    e = np.exp(-np.abs(x))
+    occupation = np.where(x > 0, e, 1.0) / (1.0 + e)
+    
+    # T = 0 rows: exact Heaviside step
+    if np.any(cold):
+        step = np.where(energy < mu, 1.0, np.where(energy > mu, 0.0, 0.5))
+        occupation[cold] = step
+    
+    return occupation
+
+
+# Quantized volumes store f in [0, 1] as uint16 with step 1/65535
+VOLUME_QUANTIZATION_LEVELS = 65535
+
+
+def fermi_dirac_volume(
+    energy: np.ndarray,
+    temperatures: np.ndarray,
+    mus: np.ndarray,
+    storage: str = "float32",
+    k_B: float = K_BOLTZMANN_EV
+) -> np.ndarray:
+    """
+    Compute the 3D block f(T, μ, E) in compact storage.
+    
+    Each μ slab is produced by the broadcast engine `fermi_dirac_matrix`
+    and written straight into the output, so float64 temporaries never
+    exceed one (T, E) slab.
+    
+    Parameters
+    ----------
+    energy : np.ndarray
+        1D array of energy values (eV)
+    temperatures : np.ndarray
+        1D array of temperatures (Kelvin)
+    mus : np.ndarray
+        1D array of chemical potentials (eV)
+    storage : str
+        "float32", or "uint16" for f quantized to 1/65535 steps
+    k_B : float, optional
+        Boltzmann constant in eV/K
+    
+    Returns
+    -------
+    np.ndarray
+        Array of shape (len(temperatures), len(mus), len(energy))
+    """
+    if storage not in ("float32", "uint16"):
+        raise ValueError(f"Unknown volume storage: {storage}")
+    
+    volume = np.empty((len(temperatures), len(mus), len(energy)), dtype=storage)
+    for j, mu in enumerate(mus):
+        slab = fermi_dirac_matrix(energy, temperatures, mu, k_B)
+        if storage == "uint16":
+            slab = np.rint(slab * VOLUME_QUANTIZATION_LEVELS)
+        volume[:, j, :] = slab
+    
+    return volume
+
+
+def dequantize_volume(block: np.ndarray) -> np.ndarray:
+    """Convert a (sub-)block from `fermi_dirac_volume` to float32 occupations."""
+    if block.dtype == np.uint16:
+        return block.astype(np.float32) / VOLUME_QUANTIZATION_LEVELS
+    return block.astype(np.float32, copy=False)
+
+
+def fermi_dirac_derivative_matrix(
+    energy: np.ndarray,
+    temperatures: np.ndarray,
+    mu: float,
+    k_B: float = K_BOLTZMANN_EV
+) -> np.ndarray:
+    """
+    Compute the thermal kernel -df/dE for every temperature at once.
+    
+    Uses -df/dE = e / (k_B*T * (1 + e)^2) with e = exp(-|x|), which is
+    the sech^2 form of `fermi_dirac_derivative` without overflow.
+    Rows with T = 0 (a Dirac delta) are returned as zeros; callers that
+    need the T = 0 limit handle it analytically.
+    
+    Returns
+    -------
+    np.ndarray
+        2D array of shape (len(temperatures), len(energy)), non-negative
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    
+    cold = temperatures <= 0
+    k_B_T = k_B * np.where(cold, 1.0, temperatures)
+    x = (energy[np.newaxis, :] - mu) / k_B_T[:, np.newaxis]
+    
+    e = np.exp(-np.abs(x))
+    kernel = e / (k_B_T[:, np.newaxis] * (1.0 + e) ** 2)
+    kernel[cold] = 0.0
+    
+    return kernel
+
+
+def fermi_dirac_components(
+    energy: np.ndarray,
+    temperatures: np.ndarray,
+    mu: float,
+    include_maxwell_boltzmann: bool = False,
+    include_derivative: bool = False,
+    k_B: float = K_BOLTZMANN_EV
+) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Compute f, f_MB and df/dE for every temperature from one exponential.
+    
+    With e = exp(-|x|), all three follow by arithmetic alone:
+    f = e / (1 + e) (x > 0) or 1 / (1 + e), f_MB = e (x > 0) or 1 / e,
+    and df/dE = -e / (k_B*T * (1 + e)^2). |x| is clipped at 700 as in
+    `maxwell_boltzmann`, so 1 / e stays finite.
+    
+    Parameters
+    ----------
+    energy : np.ndarray
+        1D array of energy values (eV)
+    temperatures : np.ndarray
+        1D array of temperatures (Kelvin)
+    mu : float
+        Chemical potential (eV)
+    include_maxwell_boltzmann, include_derivative : bool
+        Which optional components to return
+    k_B : float, optional
+        Boltzmann constant in eV/K
+    
+    Returns
+    -------
+    tuple
+        (occupation, maxwell_boltzmann or None, derivative or None), each
+        of shape (len(temperatures), len(energy)). T = 0 rows follow the
+        single-curve functions: Heaviside step, zero MB curve and a
+        one-point delta spike of -1/dE at the grid point nearest μ.
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    
+    cold = temperatures <= 0
+    k_B_T = k_B * np.where(cold, 1.0, temperatures)
+    x = (energy[np.newaxis, :] - mu) / k_B_T[:, np.newaxis]
+    
+    upper = x > 0
+    e = np.exp(-np.minimum(np.abs(x), 700.0))
+    one_plus_e = 1.0 + e
+    
+    occupation = np.where(upper, e, 1.0) / one_plus_e
+    if np.any(cold):
+        occupation[cold] = np.where(energy < mu, 1.0, np.where(energy > mu, 0.0, 0.5))
+    
+    mb = None
+    if include_maxwell_boltzmann:
+        mb = np.where(upper, e, 1.0 / e)
+        mb[cold] = 0.0
+    
+    derivative = None
+    if include_derivative:
+        derivative = -e / (k_B_T[:, np.newaxis] * one_plus_e ** 2)
+        if np.any(cold):
+            derivative[cold] = 0.0
+            if len(energy) > 1:
+                spike = np.argmin(np.abs(energy - mu))
+                derivative[cold, spike] = -1.0 / abs(energy[1] - energy[0])
+    
+    return occupation, mb, derivative
+
+
+def trapezoid_weights(energy: np.ndarray) -> np.ndarray:
+    """
+    Quadrature weights w such that sum(w * y) is the trapezoidal integral.
+    
+    Works for non-uniform grids, so integrals over the occupation tensor
+    reduce to a matrix-vector product.
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    weights = np.zeros_like(energy)
+    if len(energy) < 2:
+        return weights
+    dE = np.diff(energy)
+    weights[:-1] += dE / 2.0
+    weights[1:] += dE / 2.0
+    return weights
+
+
+def density_of_states(
+    energy: np.ndarray,
+    model: str = "free_electron_3d",
+    band_edge: float = 0.0,
+    prefactor: float = 1.0,
+    table_energy: Optional[np.ndarray] = None,
+    table_dos: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Evaluate a density of states g(E) on an energy grid.
+    
+    Parameters
+    ----------
+    energy : np.ndarray
+        Energy grid (eV)
+    model : str
+        "free_electron_3d": g(E) = A * sqrt(E - E_0) above the band edge
+        "free_electron_2d": g(E) = A (constant) above the band edge
+        "tabulated": linear interpolation of (table_energy, table_dos),
+        zero outside the tabulated range
+    band_edge : float, optional
+        Band bottom E_0 (eV) for the free-electron models
+    prefactor : float, optional
+        Amplitude A of the free-electron models (states/eV per unit volume)
+    table_energy, table_dos : np.ndarray, optional
+        Tabulated g(E), required for the "tabulated" model
+    
+    Returns
+    -------
+    np.ndarray
+        g(E) for each energy value (states/eV)
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    
+    if model == "free_electron_3d":
+        return prefactor * np.sqrt(np.clip(energy - band_edge, 0.0, None))
+    elif model == "free_electron_2d":
+        return np.where(energy >= band_edge, prefactor, 0.0)
+    elif model == "tabulated":
+        if table_energy is None or table_dos is None:
+            raise ValueError("Tabulated density of states requires energies and values")
+        return np.interp(
+            energy,
+            np.asarray(table_energy, dtype=np.float64),
+            np.asarray(table_dos, dtype=np.float64),
+            left=0.0,
+            right=0.0
+        )
+    else:
+        raise ValueError(f"Unknown density of states model: {model}")
+
+
+@dataclass
+class ThermodynamicMoments:
+    """Thermodynamic observables of an electron gas over a temperature sweep."""
+    temperatures: np.ndarray
+    electron_density: np.ndarray  # n(T) = ∫ g f dE
+    internal_energy: np.ndarray   # U(T) = ∫ E g f dE (eV)
+    specific_heat: np.ndarray     # C_V(T) (eV/K)
+    method: List[str]             # "quadrature" or "sommerfeld" per temperature
+
+
+# Sommerfeld expansion is used when k_B*T < ratio * (μ - band bottom);
+# the neglected terms are O((k_B*T / (μ - E_0))^4)
+SOMMERFELD_RATIO = 0.01
+
+# Maximum number of (T, E) cells held in memory at once during quadrature;
+# memory estimates size their blocks with the same bound
+QUADRATURE_BLOCK_CELLS = 2_000_000
+
+
+def sommerfeld_thermodynamics(
+    energy: np.ndarray,
+    dos: np.ndarray,
+    temperatures: np.ndarray,
+    mu: float,
+    k_B: float = K_BOLTZMANN_EV
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Low-temperature Sommerfeld expansion of n(T), U(T) and C_V(T).
+    
+    Valid for k_B*T << μ - E_0 with g(E) smooth around μ:
+    
+        n(T)   ≈ ∫^μ g dE   + (π²/6) (k_B T)² g'(μ)
+        U(T)   ≈ ∫^μ E g dE + (π²/6) (k_B T)² [g(μ) + μ g'(μ)]
+        C_V(T) ≈ (π²/3) k_B² T g(μ)
+    
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        (electron_density, internal_energy, specific_heat)
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    dos = np.asarray(dos, dtype=np.float64)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    
+    # Ground-state integrals up to μ from cumulative trapezoid sums
+    dE = np.diff(energy)
+    cum_n = np.concatenate(([0.0], np.cumsum(dE * (dos[1:] + dos[:-1]) / 2.0)))
+    e_dos = energy * dos
+    cum_u = np.concatenate(([0.0], np.cumsum(dE * (e_dos[1:] + e_dos[:-1]) / 2.0)))
+    n_0 = np.interp(mu, energy, cum_n)
+    u_0 = np.interp(mu, energy, cum_u)
+    
+    g_mu = np.interp(mu, energy, dos)
+    dg_mu = np.interp(mu, energy, np.gradient(dos, energy))
+    
+    k_B_T_sq = (k_B * temperatures) ** 2
+    density = n_0 + (np.pi ** 2 / 6.0) * k_B_T_sq * dg_mu
+    internal = u_0 + (np.pi ** 2 / 6.0) * k_B_T_sq * (g_mu + mu * dg_mu)
+    specific_heat = (np.pi ** 2 / 3.0) * k_B ** 2 * temperatures * g_mu
+    
+    return density, internal, specific_heat
+
+
+def compute_thermodynamics(
+    energy: np.ndarray,
+    dos: np.ndarray,
+    temperatures: np.ndarray,
+    mu: float,
+    method: str = "auto",
+    k_B: float = K_BOLTZMANN_EV
+) -> ThermodynamicMoments:
+    """
+    Compute electron density, internal energy and specific heat vs T.
+    
+    The quadrature path builds the occupation tensor f(T, E) and the
+    kernel -df/dE for a block of temperatures and contracts each with
+    the weighted density of states in a single matrix-vector product:
+    
+        n(T)   = ∫ g(E) f(E, T) dE
+        U(T)   = ∫ E g(E) f(E, T) dE
+        C_V(T) = (1/T) ∫ (E - μ)² g(E) (-df/dE) dE
+    
+    C_V is the electronic specific heat T (∂S/∂T)_μ, whose leading
+    Sommerfeld term is the familiar (π²/3) k_B² T g(μ).
+    
+    Parameters
+    ----------
+    energy : np.ndarray
+        Sorted energy grid (eV); should cover μ ± several k_B*T
+    dos : np.ndarray
+        Density of states g(E) on the same grid
+    temperatures : np.ndarray
+        Temperatures (Kelvin)
+    mu : float
+        Chemical potential (eV)
+    method : str
+        "quadrature", "sommerfeld" or "auto" (Sommerfeld for temperatures
+        with k_B*T < SOMMERFELD_RATIO * (μ - band bottom), quadrature
+        otherwise)
+    k_B : float, optional
+        Boltzmann constant in eV/K
+    
+    Returns
+    -------
+    ThermodynamicMoments
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    dos = np.asarray(dos, dtype=np.float64)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    
+    if method == "quadrature":
+        use_sommerfeld = np.zeros(len(temperatures), dtype=bool)
+    elif method == "sommerfeld":
+        use_sommerfeld = np.ones(len(temperatures), dtype=bool)
+    elif method == "auto":
+        occupied = np.nonzero(dos > 0)[0]
+        band_bottom = energy[occupied[0]] if len(occupied) else energy[0]
+        degeneracy = mu - band_bottom
+        use_sommerfeld = k_B * temperatures < SOMMERFELD_RATIO * degeneracy
+    else:
+        raise ValueError(f"Unknown thermodynamics method: {method}")
+    
+    density = np.zeros_like(temperatures)
+    internal = np.zeros_like(temperatures)
+    specific_heat = np.zeros_like(temperatures)
+    
+    if np.any(use_sommerfeld):
+        n_s, u_s, c_s = sommerfeld_thermodynamics(
+            energy, dos, temperatures[use_sommerfeld], mu, k_B
+        )
+        density[use_sommerfeld] = n_s
+        internal[use_sommerfeld] = u_s
+        specific_heat[use_sommerfeld] = c_s
+    
+    quad_idx = np.nonzero(~use_sommerfeld)[0]
+    if len(quad_idx):
+        weighted_dos = trapezoid_weights(energy) * dos
+        # Moment vectors: columns are g, E*g and (E-μ)²*g, all pre-weighted
+        moments = np.stack([
+            weighted_dos,
+            energy * weighted_dos,
+            (energy - mu) ** 2 * weighted_dos,
+        ], axis=1)
+        
+        block = max(1, QUADRATURE_BLOCK_CELLS // max(len(energy), 1))
+        for start in range(0, len(quad_idx), block):
+            idx = quad_idx[start:start + block]
+            T_block = temperatures[idx]
+            f_block = fermi_dirac_matrix(energy, T_block, mu, k_B)
+            n_u = f_block @ moments[:, :2]
+            density[idx] = n_u[:, 0]
+            internal[idx] = n_u[:, 1]
+            
+            kernel = fermi_dirac_derivative_matrix(energy, T_block, mu, k_B)
+            hot = T_block > 0
+            specific_heat[idx] = np.where(
+                hot, (kernel @ moments[:, 2]) / np.where(hot, T_block, 1.0), 0.0
+            )
+    
+    return ThermodynamicMoments(
+        temperatures=temperatures,
+        electron_density=density,
+        internal_energy=internal,
+        specific_heat=specific_heat,
+        method=["sommerfeld" if s else "quadrature" for s in use_sommerfeld]
+    )
+
+
+def transport_function(
+    energy: np.ndarray,
+    model: str = "constant",
+    sigma_0: float = 1.0,
+    band_edge: float = 0.0,
+    exponent: float = 1.5,
+    table_energy: Optional[np.ndarray] = None,
+    table_sigma: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Evaluate a transport function σ(E) on an energy grid.
+    
+    Parameters
+    ----------
+    energy : np.ndarray
+        Energy values (eV)
+    model : str
+        "constant": σ(E) = σ_0 everywhere
+        "power_law": σ(E) = σ_0 * ((E - E_0) / 1 eV)^r above the band
+        edge, zero below (r = 3/2 for a parabolic band with constant
+        relaxation time)
+        "tabulated": linear interpolation of (table_energy, table_sigma),
+        zero outside the tabulated range
+    sigma_0 : float, optional
+        Amplitude σ_0 (e.g. S/m)
+    band_edge : float, optional
+        Band edge E_0 (eV) of the power-law model
+    exponent : float, optional
+        Exponent r of the power-law model
+    table_energy, table_sigma : np.ndarray, optional
+        Tabulated σ(E), required for the "tabulated" model
+    
+    Returns
+    -------
+    np.ndarray
+        σ(E) for each energy value
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    
+    if model == "constant":
+        return np.full_like(energy, sigma_0)
+    elif model == "power_law":
+        return sigma_0 * np.clip(energy - band_edge, 0.0, None) ** exponent
+    elif model == "tabulated":
+        if table_energy is None or table_sigma is None:
+            raise ValueError("Tabulated transport function requires energies and values")
+        return np.interp(
+            energy,
+            np.asarray(table_energy, dtype=np.float64),
+            np.asarray(table_sigma, dtype=np.float64),
+            left=0.0,
+            right=0.0
+        )
+    else:
+        raise ValueError(f"Unknown transport function model: {model}")
+
+
+@dataclass
+class TransportCoefficients:
+    """Onsager moments and transport coefficients over a temperature sweep."""
+    temperatures: np.ndarray
+    moments: np.ndarray               # (3, nT): L_n = ∫ (E-μ)^n σ (-df/dE) dE
+    conductivity: np.ndarray          # σ(T) = L_0 (units of σ(E))
+    seebeck: np.ndarray               # S(T) = -L_1 / (T L_0) (V/K); NaN where undefined
+    thermal_conductivity: np.ndarray  # κ_e(T) = (L_2 - L_1²/L_0) / T (W/(m K) for σ in S/m)
+    lorenz_number: np.ndarray         # κ_e / (σ T) (W Ω/K²); NaN where undefined
+
+
+# Temperatures sharing one transport pass span at most this ratio, so the
+# coldest row of a pass still gets points / (2 * 40 * ratio) points per k_B*T
+TRANSPORT_BLOCK_RATIO = 2.0
+
+
+def compute_transport(
+    sigma: Callable[[np.ndarray], np.ndarray],
+    temperatures: np.ndarray,
+    mu: float,
+    points: int = 2001,
+    k_B: float = K_BOLTZMANN_EV,
+    support: Tuple[float, float] = (-np.inf, np.inf),
+    breakpoints: Optional[np.ndarray] = None
+) -> TransportCoefficients:
+    """
+    Compute Onsager moments and transport coefficients vs T in batched passes.
+    
+        L_n(T) = ∫ (E - μ)^n σ(E) (-df/dE) dE,   n = 0, 1, 2
+        σ(T)   = L_0
+        S(T)   = -L_1 / (e T L_0)
+        κ_e(T) = (L_2 - L_1² / L_0) / (e² T)
+    
+    With energies in eV, e = 1 in these formulas gives S in V/K and κ_e
+    in W/(m K) when σ(E) is in S/m.
+    
+    Temperatures are sorted and grouped so that each group spans at most
+    TRANSPORT_BLOCK_RATIO. Each group is one pass: σ(E) is sampled on
+    `points` points across the window |E - μ| <= 40 k_B*T_max, where
+    -df/dE is non-negligible, clipped to the `support` of σ, and the
+    kernel block is contracted with the three pre-weighted moment vectors
+    in one matrix product. The grid thus follows k_B*T (or the support,
+    if narrower), so cold and hot temperatures are resolved alike and a
+    σ(E) narrower than the window is not stepped over. `breakpoints`
+    inside the window are added to the grid, so the trapezoidal rule
+    never straddles a kink of a piecewise-linear σ(E).
+    T = 0 uses the delta-function limit L_0 = σ(μ), L_1 = L_2 = 0.
+    
+    Parameters
+    ----------
+    sigma : callable
+        Transport function σ(E), evaluated on arrays of energies (eV)
+    temperatures : np.ndarray
+        Temperatures (Kelvin)
+    mu : float
+        Chemical potential (eV)
+    points : int, optional
+        Quadrature points per window
+    k_B : float, optional
+        Boltzmann constant in eV/K
+    support : tuple, optional
+        Energy range (lo, hi) outside which σ(E) vanishes (eV)
+    breakpoints : np.ndarray, optional
+        Energies where σ(E) has kinks, e.g. the nodes of a table (eV)
+    
+    Returns
+    -------
+    TransportCoefficients
+    """
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    moments = np.zeros((3, len(temperatures)))
+    
+    cold = temperatures <= 0
+    if np.any(cold):
+        moments[0, cold] = sigma(np.array([mu], dtype=np.float64))[0]
+    
+    hot_idx = np.nonzero(~cold)[0]
+    hot_idx = hot_idx[np.argsort(temperatures[hot_idx], kind="stable")]
+    if breakpoints is not None:
+        breakpoints = np.asarray(breakpoints, dtype=np.float64)
+    grid_points = points + (len(breakpoints) if breakpoints is not None else 0)
+    max_rows = max(1, QUADRATURE_BLOCK_CELLS // grid_points)
+    
+    start = 0
+    while start < len(hot_idx):
+        # Group: T_max <= ratio * T_min, bounded by the cell budget
+        t_min = temperatures[hot_idx[start]]
+        stop = int(np.searchsorted(
+            temperatures[hot_idx], TRANSPORT_BLOCK_RATIO * t_min, side="right"
+        ))
+        stop = min(max(stop, start + 1), start + max_rows)
+        idx = hot_idx[start:stop]
+        T_block = temperatures[idx]
+        
+        width = SATURATION_THRESHOLD * k_B * T_block[-1]
+        lo = max(mu - width, support[0])
+        hi = min(mu + width, support[1])
+        start = stop
+        if hi <= lo:
+            continue  # σ vanishes across the window
+        energy = np.linspace(lo, hi, points)
+        if breakpoints is not None:
+            energy = np.union1d(energy, breakpoints[(breakpoints > lo) & (breakpoints < hi)])
+        de = energy - mu
+        weighted = trapezoid_weights(energy) * sigma(energy)
+        moment_vectors = np.stack([weighted, de * weighted, de ** 2 * weighted], axis=1)
+        
+        kernel = fermi_dirac_derivative_matrix(energy, T_block, mu, k_B)
+        moments[:, idx] = (kernel @ moment_vectors).T
+    
+    L0, L1, L2 = moments
+    with np.errstate(divide="ignore", invalid="ignore"):
+        defined = (L0 > 0) & ~cold
+        safe_L0 = np.where(defined, L0, 1.0)
+        safe_T = np.where(cold, 1.0, temperatures)
+        seebeck = np.where(defined, -L1 / (safe_T * safe_L0), np.nan)
+        seebeck[cold] = 0.0
+        thermal = np.where(defined, (L2 - L1 ** 2 / safe_L0) / safe_T, 0.0)
+        lorenz = np.where(defined, thermal / (safe_L0 * safe_T), np.nan)
+    
+    return TransportCoefficients(
+        temperatures=temperatures,
+        moments=moments,
+        conductivity=L0.copy(),
+        seebeck=seebeck,
+        thermal_conductivity=thermal,
+        lorenz_number=lorenz
+    )
+
+
+# Thermal kernel is padded out to this many k_B*T on each side; -df/dE has
+# decayed to ~exp(-40) ≈ 4e-18 of its peak there
+BROADENING_PAD_WIDTHS = 40.0
+
+# Padding is capped at this multiple of the spectrum length so very hot
+# kernels on fine grids cannot blow up the FFT size; temperatures whose
+# kernel needs more are convolved directly (see `thermal_broadening`)
+BROADENING_MAX_PAD_FACTOR = 4
+
+# Maximum number of (T, frequency) cells held in memory at once while
+# broadening; memory estimates size their blocks with the same bound
+BROADENING_BLOCK_CELLS = 4_000_000
+
+
+def thermal_kernel_transform(
+    omega: np.ndarray,
+    temperature: float,
+    k_B: float = K_BOLTZMANN_EV
+) -> np.ndarray:
+    """
+    Analytic Fourier transform of the thermal kernel -df/dE.
+    
+    For K(E) = 1/(4 k_B T) * sech^2(E / (2 k_B T)), which integrates to 1,
+    
+        K̂(ω) = a / sinh(a),   a = π k_B T ω
+    
+    evaluated as 2a e^{-a} / (1 - e^{-2a}) so it never overflows.
+    
+    Parameters
+    ----------
+    omega : np.ndarray
+        Angular frequencies (rad/eV), non-negative
+    temperature : float
+        Temperature (Kelvin); T = 0 gives the identity (Dirac delta)
+    
+    Returns
+    -------
+    np.ndarray
+        Transfer function, 1 at ω = 0
+    """
+    omega = np.asarray(omega, dtype=np.float64)
+    a = np.pi * k_B * max(temperature, 0.0) * np.abs(omega)
+    transfer = np.ones_like(a)
+    nonzero = a > 0
+    decay = np.exp(-a[nonzero])
+    transfer[nonzero] = 2.0 * a[nonzero] * decay / (1.0 - decay ** 2)
+    return transfer
+
+
+def broadening_fft_layout(
+    n: int,
+    energy_step: float,
+    t_max: float,
+    edge: str = "edge",
+    k_B: float = K_BOLTZMANN_EV
+) -> Tuple[int, int]:
+    """
+    Padding per side and total FFT length used by `thermal_broadening`.
+    
+    For "reflect" the FFT covers one period of the mirrored spectrum, so
+    no padding is needed. Otherwise the padding is capped at
+    BROADENING_MAX_PAD_FACTOR * n; temperatures needing more are
+    convolved directly instead.
+    
+    Returns
+    -------
+    Tuple[int, int]
+        (pad, length) with length a power of two >= n + 2 * pad, or the
+        mirror period 2 * (n - 1) for "reflect"
+    """
+    if edge == "reflect":
+        return 0, max(2 * (n - 1), 1)
+    pad = min(broadening_pad(energy_step, t_max, k_B), BROADENING_MAX_PAD_FACTOR * n)
+    length = 1 << int(np.ceil(np.log2(max(n + 2 * pad, 2))))
+    return pad, length
+
+
+def broadening_pad(energy_step: float, temperature, k_B: float = K_BOLTZMANN_EV):
+    """
+    Grid points per side the thermal kernel needs, before any cap.
+    
+    This is BROADENING_PAD_WIDTHS * k_B*T / dE rounded up; temperatures
+    for which it exceeds BROADENING_MAX_PAD_FACTOR * n are broadened
+    directly rather than by FFT.
+    
+    Parameters
+    ----------
+    energy_step : float
+        Grid spacing dE (eV)
+    temperature : float or np.ndarray
+        Temperature(s) in Kelvin
+    
+    Returns
+    -------
+    np.int64 or np.ndarray
+        Padding in grid points, per temperature
+    """
+    return np.ceil(
+        BROADENING_PAD_WIDTHS * k_B * np.maximum(temperature, 0.0) / energy_step
+    ).astype(np.int64)
+
+
+def _direct_broadening(
+    spectrum: np.ndarray,
+    energy_step: float,
+    temperatures: np.ndarray,
+    edge: str,
+    k_B: float = K_BOLTZMANN_EV
+) -> np.ndarray:
+    """
+    Broadening with kernels wider than the FFT padding, by linear convolution.
+    
+    The extension beyond the ends is constant (the end values for "edge",
+    zero for "zero"), so its contribution is the kernel's cumulative
+    distribution, F(x) = 1 - f(x) at μ = 0, evaluated at the ends. Only
+    the spectrum itself is convolved, with the kernel integrated over
+    each grid cell, by a zero-padded FFT of length >= 2n - 1 that cannot
+    wrap around.
+    """
+    n = len(spectrum)
+    left, right = (spectrum[0], spectrum[-1]) if edge == "edge" else (0.0, 0.0)
+    length = 1 << int(np.ceil(np.log2(max(2 * n - 1, 2))))
+    spectrum_hat = np.fft.rfft(spectrum, n=length)
+    # Cell edges (k - 1/2) dE for lags k = -(n-1) .. n
+    cell_edges = (np.arange(-(n - 1), n + 1) - 0.5) * energy_step
+    
+    result = np.empty((len(temperatures), n))
+    block = max(1, BROADENING_BLOCK_CELLS // length)
+    for start in range(0, len(temperatures), block):
+        T_block = temperatures[start:start + block]
+        cdf = 1.0 - fermi_dirac_matrix(cell_edges, T_block, 0.0, k_B)
+        weights = np.diff(cdf, axis=1)  # lags -(n-1) .. n-1
+        kernel = np.zeros((len(T_block), length))
+        kernel[:, :n] = weights[:, n - 1:]
+        kernel[:, length - (n - 1):] = weights[:, :n - 1]
+        broadened = np.fft.irfft(spectrum_hat * np.fft.rfft(kernel, axis=1), n=length, axis=1)
+        # Σ_{j<0} w_{i-j} = 1 - F((i + 1/2) dE), Σ_{j>=n} w_{i-j} = F((i - n + 1/2) dE)
+        result[start:start + block] = (
+            broadened[:, :n] + left * (1.0 - cdf[:, n:]) + right * cdf[:, :n]
+        )
+    
+    return result
+
+
+def thermal_broadening(
+    spectrum: np.ndarray,
+    energy_step: float,
+    temperatures: List[float],
+    edge: str = "edge",
+    k_B: float = K_BOLTZMANN_EV
+) -> np.ndarray:
+    """
+    Broaden a uniformly gridded spectrum with -df/dE at many temperatures.
+    
+    Computes S_T(E) = ∫ S(E') (-df/dE)(E - E') dE' for every temperature
+    by FFT convolution: the spectrum is transformed once and multiplied
+    by the analytic kernel transform of each temperature in one batched
+    inverse FFT. Cost is O(N log N) per temperature instead of O(N^2),
+    and because the kernel is applied in frequency space it stays exact
+    even when k_B*T is smaller than the grid step.
+    
+    Parameters
+    ----------
+    spectrum : np.ndarray
+        Spectrum (DOS, transmission, ...) on a uniform energy grid
+    energy_step : float
+        Grid spacing dE (eV)
+    temperatures : List[float]
+        Temperatures (Kelvin)
+    edge : str
+        How the spectrum is extended beyond its ends before convolving:
+        "edge" repeats the boundary values (default, suits spectra that
+        level off), "zero" pads with zeros (suits spectra that vanish
+        outside the window), "reflect" mirrors the spectrum
+    k_B : float, optional
+        Boltzmann constant in eV/K
+    
+    Returns
+    -------
+    np.ndarray
+        Broadened spectra of shape (len(temperatures), len(spectrum))
+    
+    Notes
+    -----
+    For "edge" and "zero", each side is padded by BROADENING_PAD_WIDTHS *
+    k_B * T_max and the total is rounded up to a power of two. Padding
+    is capped at BROADENING_MAX_PAD_FACTOR * len(spectrum) points;
+    temperatures whose kernel is wider than that are computed by direct
+    linear convolution with the extension handled analytically, so the
+    circular FFT never wraps a wide kernel around a short period. For
+    "reflect" the mirrored spectrum is periodic, so one period is
+    transformed without padding and every temperature is exact.
+    """
+    spectrum = np.asarray(spectrum, dtype=np.float64)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    n = len(spectrum)
+    
+    if energy_step <= 0:
+        raise ValueError("energy_step must be positive")
+    if edge not in ("edge", "zero", "reflect"):
+        raise ValueError(f"Unknown edge mode: {edge}")
+    
+    result = np.empty((len(temperatures), n))
+    if edge == "reflect":
+        fft_idx = np.arange(len(temperatures))
+    else:
+        wide = broadening_pad(energy_step, temperatures, k_B) > BROADENING_MAX_PAD_FACTOR * n
+        fft_idx = np.nonzero(~wide)[0]
+        if np.any(wide):
+            result[wide] = _direct_broadening(spectrum, energy_step, temperatures[wide], edge, k_B)
+    if len(fft_idx) == 0:
+        return result
+    
+    t_max = float(np.max(temperatures[fft_idx]))
+    pad, length = broadening_fft_layout(n, energy_step, t_max, edge, k_B)
+    if edge == "reflect":
+        padded = np.concatenate([spectrum, spectrum[-2:0:-1]])  # one mirror period
+    else:
+        extra = length - n - 2 * pad
+        mode = "constant" if edge == "zero" else edge
+        padded = np.pad(spectrum, (pad, pad + extra), mode=mode)
+    
+    spectrum_hat = np.fft.rfft(padded)
+    omega = 2.0 * np.pi * np.fft.rfftfreq(length, d=energy_step)
+    
+    block = max(1, BROADENING_BLOCK_CELLS // len(omega))
+    for start in range(0, len(fft_idx), block):
+        idx = fft_idx[start:start + block]
+        transfer = np.stack([thermal_kernel_transform(omega, T, k_B) for T in temperatures[idx]])
+        broadened = np.fft.irfft(spectrum_hat[np.newaxis, :] * transfer, n=length, axis=1)
+        result[idx] = broadened[:, pad:pad + n]
     
     return result
 
@@ -391,12 +1362,12 @@ if __name__ == "__main__":
     print("✓ Low T stability test passed")
     
     print("Testing Maxwell-Boltzmann limit...")
-    f_fd = fermi_dirac(E, 10000, mu=0.5)  # High T
-    f_mb = maxwell_boltzmann(E, 10000, mu=0.5)
-    # At high T and E > μ, they should be similar
+    f_fd = fermi_dirac(E, 1000, mu=0.5)
+    f_mb = maxwell_boltzmann(E, 1000, mu=0.5)
+    # Non-degenerate tail: E - μ >= 0.5 eV ≈ 6 k_B*T, where f ≈ exp(-(E-μ)/k_B*T)
     high_E_mask = E > 1.0
     ratio = f_fd[high_E_mask] / f_mb[high_E_mask]
-    assert np.allclose(ratio, ratio[0], rtol=0.1), "Should approach MB at high T"
+    assert np.allclose(ratio, 1.0, rtol=1e-2), "Should approach MB for E - μ >> k_B*T"
     print("✓ Maxwell-Boltzmann limit test passed")
     
     print("\nAll physics tests passed! ✓")
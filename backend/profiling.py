@@ -0,0 +1,272 @@
+"""
+Opt-In Per-Request Profiling
+
+A request carrying `X-Profile: 1` or `?profile=1` is run under cProfile
+and tracemalloc, and its report (top-N hot functions, peak traced memory
+and the largest live allocation sites) is stored under an ID returned in
+the `X-Profile-Id` response header. The raw cProfile stats are kept next
+to it for pstats/snakeviz.
+
+The flag is only honoured when the server enables profiling; otherwise
+the middleware is not installed at all, so ordinary requests pay nothing.
+
+- `X-Profile` / `profile` values: `1`/`all` (CPU and memory), `cpu`, or
+  `memory`. tracemalloc slows allocation-heavy code several times, so use
+  `cpu` for timings and `memory` for peaks.
+- One request per process is profiled at a time; others wait for it.
+  Compute runs on the event loop thread, so anything else that loop does
+  meanwhile is captured too; profile on a quiet worker for clean numbers.
+- Only the newest `keep` reports are retained.
+- If tracemalloc is already tracing when a request arrives (started by
+  PYTHONTRACEMALLOC or other code), its memory section only says
+  `unavailable`, with the reason.
+
+Configuration (environment variables, read at import):
+    FD_PROFILING_ENABLED    honour profile requests: 1/true (default 0)
+    FD_PROFILE_DIR          report directory (default <tmp>/fermi-dirac-profiles)
+    FD_PROFILE_TOP          functions / allocation sites per report (default 25)
+    FD_PROFILE_KEEP         reports kept on disk (default 100)
+"""
+
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+import uuid
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from storage import checked_id, write_atomic
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = "profile"
+
+# Accepted flag values and the profilers they enable
+PROFILE_MODES = {
+    "1": ("cpu", "memory"),
+    "true": ("cpu", "memory"),
+    "all": ("cpu", "memory"),
+    "cpu": ("cpu",),
+    "memory": ("memory",),
+}
+
+
+def _requested_modes(scope) -> tuple:
+    """Profilers requested by the header or query flag, or () for none."""
+    value = None
+    for name, header_value in scope.get("headers", []):
+        if name == PROFILE_HEADER:
+            value = header_value.decode("latin-1")
+            break
+    if value is None:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if PROFILE_QUERY in query:
+            value = query[PROFILE_QUERY][-1]
+    if value is None:
+        return ()
+    return PROFILE_MODES.get(value.strip().lower(), ())
+
+
+def _function_label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-in
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def cpu_report(profile: cProfile.Profile, top: int) -> dict:
+    """Top functions by self time and by cumulative time."""
+    stats = pstats.Stats(profile)
+    rows = [
+        {
+            "function": _function_label(func),
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "self_s": self_time,
+            "cumulative_s": cumulative,
+        }
+        for func, (primitive_calls, calls, self_time, cumulative, _) in stats.stats.items()
+    ]
+    return {
+        "total_calls": stats.total_calls,
+        "total_s": stats.total_tt,
+        "top_self": sorted(rows, key=lambda r: r["self_s"], reverse=True)[:top],
+        "top_cumulative": sorted(rows, key=lambda r: r["cumulative_s"], reverse=True)[:top],
+    }
+
+
+def memory_report(snapshot: tracemalloc.Snapshot, peak_bytes: int, top: int) -> dict:
+    """Peak traced memory and the largest allocation sites live at the snapshot."""
+    statistics = snapshot.statistics("lineno")
+    return {
+        "peak_bytes": peak_bytes,
+        # NumPy reports array buffers to tracemalloc under its own domain
+        "numpy_bytes_at_snapshot": sum(
+            trace.size for trace in snapshot.traces
+            if trace.domain == np.lib.tracemalloc_domain
+        ),
+        "top_allocations": [
+            {
+                "location": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in statistics[:top]
+        ],
+    }
+
+
+class ProfileStore:
+    """Directory of profile reports (<id>.json) and raw stats (<id>.prof)."""
+
+    def __init__(self, directory: str, keep: int = 100):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, profile_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{checked_id(profile_id)}.{suffix}")
+
+    def save(self, report: dict, profile: Optional[cProfile.Profile]) -> None:
+        profile_id = report["profile_id"]
+        if profile is not None:
+            profile.dump_stats(self.path(profile_id, "prof"))
+        write_atomic(self.path(profile_id, "json"), json.dumps(report).encode("utf-8"))
+        self._trim()
+
+    def load(self, profile_id: str) -> Optional[dict]:
+        try:
+            with open(self.path(profile_id, "json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, KeyError):
+            return None
+
+    def list(self) -> List[dict]:
+        """Summaries of stored reports, newest first."""
+        summaries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                report = self.load(name[:-len(".json")])
+                if report is not None:
+                    summaries.append({
+                        key: report.get(key)
+                        for key in ("profile_id", "created_at", "method", "path", "status", "wall_s", "modes")
+                    })
+        return sorted(summaries, key=lambda s: s["created_at"] or 0, reverse=True)
+
+    def _trim(self) -> None:
+        reports = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    reports.append((os.path.getmtime(path), name[:-len(".json")]))
+                except FileNotFoundError:
+                    pass
+        reports.sort(reverse=True)
+        for _, profile_id in reports[self.keep:]:
+            for suffix in ("json", "prof"):
+                try:
+                    os.remove(self.path(profile_id, suffix))
+                except FileNotFoundError:
+                    pass
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling flagged requests until their response is sent."""
+
+    def __init__(self, app, store: "ProfileStore", top: int = 25):
+        self.app = app
+        self.store = store
+        self.top = top
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def __call__(self, scope, receive, send):
+        modes = _requested_modes(scope) if scope["type"] == "http" else ()
+        if not modes:
+            await self.app(scope, receive, send)
+            return
+
+        async with self.lock:
+            await self._profile(scope, receive, send, modes)
+
+    async def _profile(self, scope, receive, send, modes):
+        profile_id = uuid.uuid4().hex
+        status = [None]
+        snapshot = [None]
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode("ascii")))
+                headers.append((b"access-control-expose-headers", b"X-Profile-Id"))
+                message = {**message, "headers": headers}
+            elif (message["type"] == "http.response.body" and not message.get("more_body", False)
+                  and tracemalloc.is_tracing() and snapshot[0] is None):
+                snapshot[0] = tracemalloc.take_snapshot()
+            await send(message)
+
+        profile = cProfile.Profile() if "cpu" in modes else None
+        trace_memory = "memory" in modes and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - started
+            report = {
+                "profile_id": profile_id,
+                "created_at": time.time(),
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status[0],
+                "modes": list(modes),
+                "wall_s": wall,
+            }
+            if profile is not None:
+                report["cpu"] = cpu_report(profile, self.top)
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                if snapshot[0] is None:
+                    snapshot[0] = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                report["memory"] = memory_report(snapshot[0], peak, self.top)
+            elif "memory" in modes:
+                # Someone else owns tracemalloc (e.g. PYTHONTRACEMALLOC); its peak
+                # and snapshot would not be this request's
+                report["memory"] = {"unavailable": "tracemalloc was already tracing in this process"}
+            self.store.save(report, profile)
+
+
+def _enabled(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+profiling_enabled = _enabled(os.environ.get("FD_PROFILING_ENABLED", "0"))
+profile_top = int(os.environ.get("FD_PROFILE_TOP", "25"))
+profile_store = ProfileStore(
+    directory=os.environ.get(
+        "FD_PROFILE_DIR",
+        os.path.join(tempfile.gettempdir(), "fermi-dirac-profiles"),
+    ),
+    keep=int(os.environ.get("FD_PROFILE_KEEP", "100")),
+) if profiling_enabled else None
@@ -0,0 +1,171 @@
+"""
+Cross-Worker Shared Result Cache
+
+A file-backed cache shared by every uvicorn worker on one host, so a
+response computed by one worker can be served by all the others.
+
+- Writes are atomic: the value goes to a temporary file in the cache
+  directory and is moved into place with os.replace, so readers see
+  either the old entry, the new one, or none.
+- Reads take no lock: an entry is a single file read; a length header
+  rejects anything truncated.
+- Size is bounded: after each write the directory is trimmed to
+  `max_bytes`, least recently used (by mtime, refreshed on hit) first.
+  Concurrent trims can at worst drop an extra entry.
+
+Configuration (environment variables, read at import):
+    FD_SHARED_CACHE_DIR     cache directory (default <tmp>/fermi-dirac-cache)
+    FD_SHARED_CACHE_MB      size bound; 0 disables the cache (default 256)
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from typing import Optional
+
+from storage import write_atomic
+
+# Bump when cached payloads would change for the same request
+CACHE_VERSION = "1"
+
+_MAGIC = b"FDC1"
+_HEADER = struct.Struct("<4sQ")  # magic, payload length
+
+# Temporary files older than this are leftovers from crashed writers
+_STALE_TMP_SECONDS = 60.0
+
+
+class SharedCache:
+    """Size-bounded key/value byte store in a directory shared across processes."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(namespace: str, payload: str) -> str:
+        """Key for a request: namespace (e.g. the endpoint path) plus canonical payload."""
+        digest = hashlib.sha256(f"{CACHE_VERSION}:{namespace}:{payload}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        if len(data) < _HEADER.size:
+            self.misses += 1
+            return None
+        magic, length = _HEADER.unpack_from(data)
+        if magic != _MAGIC or len(data) - _HEADER.size != length:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # refresh recency for eviction
+        except OSError:
+            pass
+        self.hits += 1
+        return data[_HEADER.size:]
+
+    def set(self, key: str, value: bytes) -> bool:
+        """Store a value atomically; returns False if it cannot fit."""
+        if not self.enabled or len(value) + _HEADER.size > self.max_bytes:
+            return False
+
+        try:
+            write_atomic(self._path(key), _HEADER.pack(_MAGIC, len(value)), value)
+        except OSError:
+            return False
+
+        self.writes += 1
+        self._evict()
+        return True
+
+    def _scan(self):
+        entries, now = [], time.time()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(".tmp"):
+                    if now - stat.st_mtime > _STALE_TMP_SECONDS:
+                        self._remove(entry.path)
+                    continue
+                if entry.name.endswith(".bin"):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _evict(self) -> None:
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            total -= size
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        for _, _, path in self._scan():
+            self._remove(path)
+
+    def status(self) -> dict:
+        entries = self._scan() if self.enabled else []
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "used_bytes": sum(size for _, size, _ in entries),
+            "entries": len(entries),
+            # counters below are for this worker process only
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+shared_cache = SharedCache(
+    directory=os.environ.get(
+        "FD_SHARED_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "fermi-dirac-cache"),
+    ),
+    max_bytes=int(float(os.environ.get("FD_SHARED_CACHE_MB", "256")) * 2**20),
+)
@@ -0,0 +1,106 @@
+"""
+Storage Helpers Shared by the Caches and State Directories
+
+- `checked_id`: validate a client-supplied ID before it becomes a path.
+- `write_atomic`: write a file via a temporary sibling and os.replace, so
+  readers see either the old file, the new one, or none.
+- `ByteLRU`: thread-safe in-memory LRU mapping bounded by total bytes.
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+def checked_id(identifier: str) -> str:
+    """
+    Return `identifier` if it is safe to use as a file name stem.
+
+    IDs are generated hex strings; anything else (separators, dots, empty
+    strings) is rejected with KeyError so paths stay inside their directory.
+    """
+    if not identifier.isalnum():
+        raise KeyError(identifier)
+    return identifier
+
+
+def write_atomic(path: str, *chunks: bytes) -> None:
+    """
+    Write `chunks` to `path` atomically.
+
+    The data goes to `<path>.<pid>.<random>.tmp` in the same directory and
+    is moved into place with os.replace. On error the temporary file is
+    removed and the exception re-raised; directory sweeps treat `*.tmp`
+    files as leftovers of crashed writers.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ByteLRU(Generic[V]):
+    """
+    Thread-safe LRU mapping bounded by the total size of its values.
+
+    Inserting a value evicts least recently used ones until it fits; a
+    value larger than the whole bound is not stored. Values report their
+    size through an `nbytes` attribute.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Value under `key`, marked most recently used, or None."""
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V) -> bool:
+        """Store a value, replacing any under the same key; returns False if it can never fit."""
+        nbytes = value.nbytes
+        if nbytes > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old.nbytes
+            while self._items and self.used_bytes + nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.used_bytes -= evicted.nbytes
+                self.evictions += 1
+            self._items[key] = value
+            self.used_bytes += nbytes
+            return True
+
+    def items(self) -> List[Tuple[Hashable, V]]:
+        """Snapshot of (key, value) pairs, least recently used first."""
+        with self._lock:
+            return list(self._items.items())
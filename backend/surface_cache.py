@@ -0,0 +1,219 @@
+"""
+Incremental Surface Evaluation
+
+Heatmap requests usually differ from the previous one by a small shift
+or extension of the energy window or temperature range. Recently computed
+f(E, T) surfaces are kept in a size-bounded LRU cache. A new request at
+the same μ whose grids are *aligned* with a cached surface (same steps,
+offset by a whole number of steps) copies the overlapping cells and
+computes only the new rows and columns.
+
+Temperature steps are compared in the axis' own coordinate: T for linear
+axes and log10 T for log axes. Reused cells were computed at the cached
+grid's energies, which can differ from freshly generated ones by
+floating-point rounding only.
+
+Configuration (environment variables, read at import):
+    FD_SURFACE_CACHE_MB     total bytes of cached surfaces (default 64)
+"""
+
+import itertools
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from storage import ByteLRU
+
+# Relative tolerance on grid steps and absolute tolerance (in steps) on
+# grid offsets for two grids to count as aligned
+_STEP_RTOL = 1e-9
+_OFFSET_ATOL = 1e-6
+
+
+@dataclass
+class SurfaceBlock:
+    """A computed f(T, E) surface and its axes."""
+    mu: float
+    temp_scale: str
+    energy: np.ndarray
+    temperatures: np.ndarray
+    occupation: np.ndarray  # shape (len(temperatures), len(energy))
+
+    @property
+    def nbytes(self) -> int:
+        return self.occupation.nbytes + self.energy.nbytes + self.temperatures.nbytes
+
+
+def _axis(values: np.ndarray, log: bool = False) -> Tuple[float, float]:
+    """(start, step) of a uniformly spaced axis in its own coordinate."""
+    coords = np.log10(values) if log else values
+    return float(coords[0]), float(coords[-1] - coords[0]) / (len(coords) - 1)
+
+
+def _aligned_offset(new: Tuple[float, float], old: Tuple[float, float]) -> Optional[int]:
+    """Index offset k with new[i] == old[i + k], or None if the axes are not aligned."""
+    (new_start, new_step), (old_start, old_step) = new, old
+    if new_step == 0 or abs(new_step - old_step) > _STEP_RTOL * abs(new_step):
+        return None
+    offset = (new_start - old_start) / new_step
+    k = int(round(offset))
+    if abs(offset - k) > _OFFSET_ATOL:
+        return None
+    return k
+
+
+def _overlap(n_new: int, n_old: int, k: int) -> Tuple[int, int]:
+    """Range [lo, hi) of new indices whose old index i + k exists."""
+    return max(0, -k), min(n_new, n_old - k)
+
+
+class SurfaceCache:
+    """Thread-safe LRU cache of surfaces bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.lookups = 0
+        self.matches = 0
+        self.cells_reused = 0
+        self.cells_computed = 0
+        self._blocks: "ByteLRU[SurfaceBlock]" = ByteLRU(max_bytes)
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+
+    def find(
+        self,
+        mu: float,
+        temp_scale: str,
+        energy: np.ndarray,
+        temperatures: np.ndarray,
+    ) -> Optional[Tuple[SurfaceBlock, int, int]]:
+        """
+        Cached surface sharing the most cells with the requested grids.
+
+        Returns (block, energy offset, temperature offset) such that
+        request cell [t, e] equals block cell [t + t_offset, e + e_offset].
+        """
+        log = temp_scale == "log"
+        e_axis = _axis(energy)
+        t_axis = _axis(temperatures, log)
+        best, best_cells = None, 0
+        for key, block in self._blocks.items():
+            if block.mu != mu or block.temp_scale != temp_scale:
+                continue
+            e_offset = _aligned_offset(e_axis, _axis(block.energy))
+            t_offset = _aligned_offset(t_axis, _axis(block.temperatures, log))
+            if e_offset is None or t_offset is None:
+                continue
+            e_lo, e_hi = _overlap(len(energy), len(block.energy), e_offset)
+            t_lo, t_hi = _overlap(len(temperatures), len(block.temperatures), t_offset)
+            cells = max(0, e_hi - e_lo) * max(0, t_hi - t_lo)
+            if cells > best_cells:
+                best, best_cells = (key, block, e_offset, t_offset), cells
+        with self._lock:
+            self.lookups += 1
+            if best is not None:
+                self.matches += 1
+        if best is None:
+            return None
+        key, block, e_offset, t_offset = best
+        self._blocks.get(key)  # mark as recently used
+        return block, e_offset, t_offset
+
+    def put(self, block: SurfaceBlock) -> bool:
+        """Store a surface; returns False if it can never fit."""
+        return self._blocks.put(next(self._keys), block)
+
+    def record(self, reused: int, computed: int) -> None:
+        with self._lock:
+            self.cells_reused += reused
+            self.cells_computed += computed
+
+    def status(self) -> dict:
+        with self._lock:
+            total = self.cells_reused + self.cells_computed
+            return {
+                "max_bytes": self._blocks.max_bytes,
+                "used_bytes": self._blocks.used_bytes,
+                "surfaces": len(self._blocks),
+                "lookups": self.lookups,
+                "matches": self.matches,
+                "cells_reused": self.cells_reused,
+                "cells_computed": self.cells_computed,
+                "reused_fraction": self.cells_reused / total if total else 0.0,
+                "evictions": self._blocks.evictions,
+            }
+
+
+def extend_surface(
+    cache: SurfaceCache,
+    energy: np.ndarray,
+    temperatures: np.ndarray,
+    mu: float,
+    temp_scale: str,
+    compute: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    progress: Callable[[float], None] = lambda fraction: None,
+    blocks: int = 20,
+) -> Tuple[np.ndarray, float]:
+    """
+    Fill a surface from the best aligned cached block plus new computation.
+
+    `compute(energy, temperatures)` evaluates a (T, E) block; it is called
+    only for rows and columns missing from the cache, in row blocks of
+    about len(temperatures) / `blocks` so `progress` can be reported.
+    The result is cached for later requests.
+
+    Returns
+    -------
+    tuple
+        (occupation of shape (len(temperatures), len(energy)), fraction
+        of cells reused)
+    """
+    n_t, n_e = len(temperatures), len(energy)
+    occupation = np.empty((n_t, n_e))
+    t_lo = t_hi = e_lo = e_hi = 0
+
+    match = cache.find(mu, temp_scale, energy, temperatures)
+    if match is not None:
+        block, e_offset, t_offset = match
+        e_lo, e_hi = _overlap(n_e, len(block.energy), e_offset)
+        t_lo, t_hi = _overlap(n_t, len(block.temperatures), t_offset)
+        if e_lo < e_hi and t_lo < t_hi:
+            occupation[t_lo:t_hi, e_lo:e_hi] = block.occupation[
+                t_lo + t_offset:t_hi + t_offset,
+                e_lo + e_offset:e_hi + e_offset,
+            ]
+        else:
+            t_lo = t_hi = e_lo = e_hi = 0
+
+    # Missing regions: new rows over the full width, then new columns of
+    # the reused rows
+    regions: List[Tuple[slice, slice]] = [
+        (slice(0, t_lo), slice(0, n_e)),
+        (slice(t_hi, n_t), slice(0, n_e)),
+        (slice(t_lo, t_hi), slice(0, e_lo)),
+        (slice(t_lo, t_hi), slice(e_hi, n_e)),
+    ]
+    regions = [(t, e) for t, e in regions if t.stop > t.start and e.stop > e.start]
+    reused = (t_hi - t_lo) * (e_hi - e_lo)
+    missing = n_t * n_e - reused
+    rows_per_block = max(1, -(-n_t // blocks))
+
+    done = 0
+    for t_slice, e_slice in regions:
+        for start in range(t_slice.start, t_slice.stop, rows_per_block):
+            stop = min(start + rows_per_block, t_slice.stop)
+            occupation[start:stop, e_slice] = compute(energy[e_slice], temperatures[start:stop])
+            done += (stop - start) * (e_slice.stop - e_slice.start)
+            progress(done / missing)
+    progress(1.0)
+
+    cache.record(reused, missing)
+    cache.put(SurfaceBlock(mu, temp_scale, energy, temperatures, occupation))
+    return occupation, reused / (n_t * n_e)
+
+
+surface_cache = SurfaceCache(
+    max_bytes=int(float(os.environ.get("FD_SURFACE_CACHE_MB", "64")) * 2**20)
+)
@@ -0,0 +1,468 @@
+"""
+Headless Bulk Dataset Generation
+
+Evaluates distribution kernels over a sweep of temperatures, chemical
+potentials and energy ranges straight from the `physics` module and writes
+the results to disk, with no web server or JSON in between.
+
+Every (kernel, energy range) dataset is an array of shape
+(len(temperatures), len(mus), points) filled chunk by chunk by a pool of
+worker processes, each writing its chunk directly into a memory-mapped
+.npy file. Chunks are sized from `--memory-mb`, and only a bounded number
+are in flight, so peak memory stays fixed however large the sweep is.
+.npz and CSV output are assembled by streaming from those .npy files.
+
+Spec (JSON):
+    {
+      "temperatures": [0, 100, 300] or {"start": 0, "stop": 5000, "num": 200, "scale": "log"},
+      "mus": [0.5] or {"start": -1, "stop": 1, "num": 21},
+      "energy_ranges": [{"name": "window", "min": -1, "max": 2, "points": 1000}],
+      "kernels": ["fermi_dirac", "derivative", "maxwell_boltzmann"],
+      "dtype": "float64"
+    }
+
+Output per energy range `<name>`:
+    npy   <output>/<name>/{energy,temperatures,mus,<kernel>}.npy
+    npz   <output>/<name>.npz with the same keys
+    csv   <output>/<name>.csv with columns temperature_K, mu_eV, energy_eV, <kernels>
+
+Run with: python sweep.py spec.json --output data --format npz --workers 8
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from physics import fermi_dirac_components, generate_temperature_schedule
+
+
+KERNELS = ("fermi_dirac", "derivative", "maxwell_boltzmann")
+FORMATS = ("npy", "npz", "csv")
+DTYPES = ("float32", "float64")
+
+# Bytes of float64 working memory per (T, μ, E) cell: x, e, 1 + e and
+# temporaries, plus one result and one cast copy per kernel
+_BASE_CELL_BYTES = 8 * 6
+_KERNEL_CELL_BYTES = 8 * 2
+
+# CSV bytes held per row while formatting a block
+_CSV_ROW_BYTES = 200
+
+
+# ============== Sweep Specification ==============
+
+@dataclass
+class EnergyRange:
+    """One linearly spaced energy grid of the sweep."""
+    name: str
+    e_min: float
+    e_max: float
+    points: int
+
+    @property
+    def step(self) -> float:
+        return (self.e_max - self.e_min) / (self.points - 1) if self.points > 1 else 0.0
+
+    def grid(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Grid points [start, stop) without materializing the whole grid."""
+        stop = self.points if stop is None else stop
+        energy = self.e_min + self.step * np.arange(start, stop, dtype=np.float64)
+        if stop == self.points and stop > start:
+            energy[-1] = self.e_max  # exact endpoint, as np.linspace
+        return energy
+
+    def nearest_index(self, value: float) -> int:
+        """Grid index closest to `value`; the lower one on ties, like np.argmin."""
+        if self.points == 1:
+            return 0
+        low = int(np.clip(np.floor((value - self.e_min) / self.step), 0, self.points - 1))
+        candidates = self.grid(low, min(low + 2, self.points))
+        return low + int(np.argmin(np.abs(candidates - value)))
+
+
+@dataclass
+class SweepSpec:
+    """A validated sweep specification."""
+    temperatures: np.ndarray
+    mus: np.ndarray
+    energy_ranges: List[EnergyRange]
+    kernels: List[str]
+    dtype: str = "float64"
+
+    @property
+    def cells(self) -> int:
+        return sum(len(self.temperatures) * len(self.mus) * r.points for r in self.energy_ranges)
+
+    @property
+    def output_bytes(self) -> int:
+        return self.cells * len(self.kernels) * np.dtype(self.dtype).itemsize
+
+
+def _axis(value, name: str, temperature: bool = False) -> np.ndarray:
+    if isinstance(value, (int, float)):
+        value = [value]
+    if isinstance(value, dict):
+        try:
+            start, stop, num = float(value["start"]), float(value["stop"]), int(value["num"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"'{name}' range needs numeric 'start', 'stop' and 'num'")
+        if num < 1:
+            raise ValueError(f"'{name}' range needs num >= 1")
+        scale = value.get("scale", "linear")
+        if temperature:
+            axis = generate_temperature_schedule(start, stop, num, scale)
+        elif scale == "linear":
+            axis = np.linspace(start, stop, num)
+        else:
+            raise ValueError(f"'{name}' only supports linear ranges")
+    else:
+        axis = np.asarray(value, dtype=np.float64)
+    if axis.ndim != 1 or len(axis) == 0:
+        raise ValueError(f"'{name}' must be a non-empty list or a range")
+    if not np.all(np.isfinite(axis)):
+        raise ValueError(f"'{name}' must be finite")
+    return axis
+
+
+def parse_spec(raw: dict) -> SweepSpec:
+    """Validate a decoded JSON spec; raises ValueError with a readable message."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"spec must be a JSON object, not {type(raw).__name__}")
+    if "temperatures" not in raw:
+        raise ValueError("spec needs 'temperatures'")
+    temperatures = _axis(raw["temperatures"], "temperatures", temperature=True)
+    if np.any(temperatures < 0):
+        raise ValueError("All temperatures must be non-negative")
+    mus = _axis(raw.get("mus", [0.5]), "mus")
+
+    ranges = raw.get("energy_ranges", [{"min": -1.0, "max": 2.0, "points": 500}])
+    if not isinstance(ranges, list) or not ranges:
+        raise ValueError("'energy_ranges' must be a non-empty list")
+    energy_ranges = []
+    for i, r in enumerate(ranges):
+        try:
+            energy_range = EnergyRange(
+                name=str(r.get("name", f"range{i}")),
+                e_min=float(r["min"]),
+                e_max=float(r["max"]),
+                points=int(r["points"]),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise ValueError(f"energy range {i} needs numeric 'min', 'max' and 'points'")
+        if energy_range.e_max <= energy_range.e_min:
+            raise ValueError(f"energy range '{energy_range.name}': max must be greater than min")
+        if energy_range.points < 2:
+            raise ValueError(f"energy range '{energy_range.name}': points must be at least 2")
+        if not energy_range.name or os.sep in energy_range.name or energy_range.name.startswith("."):
+            raise ValueError(f"energy range name '{energy_range.name}' is not a valid file name")
+        energy_ranges.append(energy_range)
+    names = [r.name for r in energy_ranges]
+    if len(set(names)) != len(names):
+        raise ValueError("energy range names must be unique")
+
+    kernels = raw.get("kernels", ["fermi_dirac"])
+    if isinstance(kernels, str):
+        kernels = [kernels]
+    unknown = [k for k in kernels if k not in KERNELS]
+    if unknown or not kernels:
+        raise ValueError(f"kernels must be a non-empty subset of {', '.join(KERNELS)}")
+
+    dtype = raw.get("dtype", "float64")
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}")
+
+    return SweepSpec(temperatures, mus, energy_ranges, list(dict.fromkeys(kernels)), dtype)
+
+
+# ============== Chunked Evaluation ==============
+
+@dataclass
+class Chunk:
+    """One unit of work: a temperature block × one μ × an energy slice."""
+    energy_range: EnergyRange
+    paths: Dict[str, str]
+    temperatures: np.ndarray
+    t_start: int
+    mu_index: int
+    mu: float
+    e_start: int
+    e_stop: int
+
+    @property
+    def cells(self) -> int:
+        return len(self.temperatures) * (self.e_stop - self.e_start)
+
+
+def chunk_layout(n_temperatures: int, points: int, max_cells: int) -> Tuple[int, int]:
+    """(temperature rows, energy points) per chunk for a cell budget."""
+    max_cells = max(max_cells, 1)
+    if points <= max_cells:
+        return max(1, min(n_temperatures, max_cells // points)), points
+    return 1, max_cells
+
+
+def iter_chunks(spec: SweepSpec, paths: Dict[str, Dict[str, str]], max_cells: int) -> Iterator[Chunk]:
+    n_t = len(spec.temperatures)
+    for energy_range in spec.energy_ranges:
+        t_block, e_block = chunk_layout(n_t, energy_range.points, max_cells)
+        for mu_index, mu in enumerate(spec.mus):
+            for t_start in range(0, n_t, t_block):
+                for e_start in range(0, energy_range.points, e_block):
+                    yield Chunk(
+                        energy_range=energy_range,
+                        paths=paths[energy_range.name],
+                        temperatures=spec.temperatures[t_start:t_start + t_block],
+                        t_start=t_start,
+                        mu_index=mu_index,
+                        mu=float(mu),
+                        e_start=e_start,
+                        e_stop=min(e_start + e_block, energy_range.points),
+                    )
+
+
+def evaluate_chunk(chunk: Chunk) -> int:
+    """Compute one chunk and write it into the kernel .npy files; returns its cell count."""
+    energy_range = chunk.energy_range
+    energy = energy_range.grid(chunk.e_start, chunk.e_stop)
+    occupation, mb, derivative = fermi_dirac_components(
+        energy,
+        chunk.temperatures,
+        chunk.mu,
+        include_maxwell_boltzmann="maxwell_boltzmann" in chunk.paths,
+        include_derivative="derivative" in chunk.paths,
+    )
+
+    # The T = 0 delta spike sits at the point of the *full* grid nearest μ,
+    # not of this slice
+    cold = chunk.temperatures <= 0
+    if derivative is not None and np.any(cold):
+        derivative[cold] = 0.0
+        spike = energy_range.nearest_index(chunk.mu)
+        if chunk.e_start <= spike < chunk.e_stop:
+            derivative[cold, spike - chunk.e_start] = -1.0 / energy_range.step
+
+    values = {"fermi_dirac": occupation, "maxwell_boltzmann": mb, "derivative": derivative}
+    t_stop = chunk.t_start + len(chunk.temperatures)
+    for kernel, path in chunk.paths.items():
+        target = np.load(path, mmap_mode="r+")
+        target[chunk.t_start:t_stop, chunk.mu_index, chunk.e_start:chunk.e_stop] = values[kernel]
+        target.flush()
+        del target
+    return chunk.cells
+
+
+# ============== Progress ==============
+
+class Progress:
+    """Single-line progress report on stderr, throttled."""
+
+    def __init__(self, total: int, label: str, enabled: bool = True, interval: float = 0.5):
+        self.total = max(total, 1)
+        self.label = label
+        self.enabled = enabled
+        self.interval = interval
+        self.done = 0
+        self.start = time.monotonic()
+        self._last = 0.0
+
+    def advance(self, amount: int) -> None:
+        self.done += amount
+        now = time.monotonic()
+        if self.enabled and (now - self._last >= self.interval or self.done >= self.total):
+            self._last = now
+            elapsed = now - self.start
+            fraction = self.done / self.total
+            eta = elapsed / fraction - elapsed if fraction > 0 else 0.0
+            sys.stderr.write(
+                f"\r{self.label}: {100 * fraction:5.1f}%  "
+                f"elapsed {elapsed:6.1f}s  eta {eta:6.1f}s"
+            )
+            if self.done >= self.total:
+                sys.stderr.write("\n")
+            sys.stderr.flush()
+
+
+# ============== Writers ==============
+
+def allocate_outputs(spec: SweepSpec, directory: str) -> Dict[str, Dict[str, str]]:
+    """Create the axis files and empty (memory-mappable) kernel arrays of each range."""
+    paths = {}
+    for energy_range in spec.energy_ranges:
+        range_dir = os.path.join(directory, energy_range.name)
+        os.makedirs(range_dir, exist_ok=True)
+        np.save(os.path.join(range_dir, "energy.npy"), energy_range.grid())
+        np.save(os.path.join(range_dir, "temperatures.npy"), spec.temperatures)
+        np.save(os.path.join(range_dir, "mus.npy"), spec.mus)
+        shape = (len(spec.temperatures), len(spec.mus), energy_range.points)
+        paths[energy_range.name] = {}
+        for kernel in spec.kernels:
+            path = os.path.join(range_dir, f"{kernel}.npy")
+            array = np.lib.format.open_memmap(path, mode="w+", dtype=spec.dtype, shape=shape)
+            del array
+            paths[energy_range.name][kernel] = path
+    return paths
+
+
+def write_npz(range_dir: str, target: str, compress: bool = False) -> None:
+    """Zip a range directory of .npy files into an .npz, streaming each member."""
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    tmp_path = f"{target}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=compression, allowZip64=True) as archive:
+        for name in sorted(os.listdir(range_dir)):
+            if name.endswith(".npy"):
+                archive.write(os.path.join(range_dir, name), arcname=name)
+    os.replace(tmp_path, target)
+
+
+def write_csv(spec: SweepSpec, energy_range: EnergyRange, range_dir: str, target: str,
+              max_rows: int, progress: Progress) -> None:
+    """Stream one range to long-format CSV, a bounded block of rows at a time."""
+    energy = np.load(os.path.join(range_dir, "energy.npy"))
+    arrays = [np.load(os.path.join(range_dir, f"{k}.npy"), mmap_mode="r") for k in spec.kernels]
+    n_e = len(energy)
+    e_block = max(1, min(n_e, max_rows))
+    fmt = ",".join(["%.10g"] * (3 + len(spec.kernels)))
+    tmp_path = f"{target}.tmp"
+
+    with open(tmp_path, "w") as f:
+        f.write(",".join(["temperature_K", "mu_eV", "energy_eV"] + list(spec.kernels)) + "\n")
+        for t_index, T in enumerate(spec.temperatures):
+            for mu_index, mu in enumerate(spec.mus):
+                for start in range(0, n_e, e_block):
+                    stop = min(start + e_block, n_e)
+                    block = np.empty((stop - start, 3 + len(arrays)))
+                    block[:, 0] = T
+                    block[:, 1] = mu
+                    block[:, 2] = energy[start:stop]
+                    for column, array in enumerate(arrays, start=3):
+                        block[:, column] = array[t_index, mu_index, start:stop]
+                    np.savetxt(f, block, fmt=fmt)
+                    progress.advance(stop - start)
+    os.replace(tmp_path, target)
+
+
+# ============== Driver ==============
+
+def run_sweep(
+    spec: SweepSpec,
+    output: str,
+    output_format: str = "npy",
+    workers: Optional[int] = None,
+    memory_mb: float = 1024.0,
+    compress: bool = False,
+    show_progress: bool = True,
+) -> List[str]:
+    """
+    Evaluate a sweep and write it to `output`; returns the files written.
+
+    `memory_mb` bounds the working memory of all workers together; the
+    main process keeps at most two chunks per worker in flight.
+    """
+    workers = workers or os.cpu_count() or 1
+    budget = int(memory_mb * 2**20)
+    cell_bytes = _BASE_CELL_BYTES + _KERNEL_CELL_BYTES * len(spec.kernels)
+    max_cells = budget // (workers * cell_bytes)
+    os.makedirs(output, exist_ok=True)
+
+    # .npz and CSV are assembled from .npy files in a scratch directory
+    if output_format == "npy":
+        array_dir, scratch = output, None
+    else:
+        scratch = tempfile.mkdtemp(prefix=".sweep-", dir=output)
+        array_dir = scratch
+
+    try:
+        paths = allocate_outputs(spec, array_dir)
+        progress = Progress(spec.cells, "evaluate", show_progress)
+        chunks = iter_chunks(spec, paths, max_cells)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(evaluate_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        progress.advance(future.result())
+            for future in pending:
+                progress.advance(future.result())
+
+        written = []
+        for energy_range in spec.energy_ranges:
+            range_dir = os.path.join(array_dir, energy_range.name)
+            if output_format == "npy":
+                written.append(range_dir)
+            elif output_format == "npz":
+                target = os.path.join(output, f"{energy_range.name}.npz")
+                write_npz(range_dir, target, compress)
+                written.append(target)
+            else:
+                target = os.path.join(output, f"{energy_range.name}.csv")
+                rows = len(spec.temperatures) * len(spec.mus) * energy_range.points
+                csv_progress = Progress(rows, f"csv {energy_range.name}", show_progress)
+                write_csv(spec, energy_range, range_dir, target, budget // _CSV_ROW_BYTES, csv_progress)
+                written.append(target)
+        return written
+    finally:
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+# ============== Entry Point ==============
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate Fermi-Dirac datasets without the API server")
+    parser.add_argument("spec", help="Sweep specification JSON file ('-' for stdin)")
+    parser.add_argument("--output", "-o", required=True, help="Output directory")
+    parser.add_argument("--format", choices=FORMATS, default="npy", help="Output format")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--memory-mb", type=float, default=1024.0, help="Working-memory bound for all workers")
+    parser.add_argument("--compress", action="store_true", help="Deflate .npz members")
+    parser.add_argument("--quiet", action="store_true", help="No progress output")
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.memory_mb <= 0:
+        parser.error("--memory-mb must be positive")
+
+    try:
+        if args.spec == "-":
+            raw = json.load(sys.stdin)
+        else:
+            with open(args.spec) as f:
+                raw = json.load(f)
+        spec = parse_spec(raw)
+    except (OSError, json.JSONDecodeError, ValueError) as e:
+        parser.error(f"invalid spec: {e}")
+
+    if not args.quiet:
+        sys.stderr.write(
+            f"{spec.cells:,} cells x {len(spec.kernels)} kernel(s), "
+            f"{spec.output_bytes / 2**30:.2f} GiB of {spec.dtype}\n"
+        )
+    written = run_sweep(
+        spec,
+        args.output,
+        output_format=args.format,
+        workers=args.workers,
+        memory_mb=args.memory_mb,
+        compress=args.compress,
+        show_progress=not args.quiet,
+    )
+    for path in written:
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# Backend modules are flat (imported as `physics`, `storage`, ...), as in main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configuration is read at import: keep tests off the shared on-disk cache
+# and the job and volume directories of any server running on this host
+os.environ["FD_SHARED_CACHE_MB"] = "0"
+os.environ.setdefault("FD_JOBS_DIR", tempfile.mkdtemp(prefix="fd-test-jobs-"))
+os.environ.setdefault("FD_VOLUME_DIR", tempfile.mkdtemp(prefix="fd-test-volumes-"))
@@ -0,0 +1,69 @@
+import asyncio
+import gc
+import tracemalloc
+
+import pytest
+
+from admission import MemoryBudget, estimate_surface, estimate_view
+from main import build_surface, build_view
+from models import SurfaceRequest, ViewRequest
+
+
+def _peak_bytes(fn):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("energy_points,temp_points", [(200, 100), (1000, 200), (100, 500)])
+def test_surface_estimate_covers_measured_peak(energy_points, temp_points):
+    # Distinct μ so the surface cache cannot serve any cells
+    request = SurfaceRequest(
+        energy_points=energy_points, temp_points=temp_points,
+        mu=0.1 + 1e-4 * energy_points + 1e-7 * temp_points,
+    )
+    peak = _peak_bytes(lambda: build_surface(request).model_dump_json())
+    estimate = estimate_surface(energy_points, temp_points)
+    assert peak <= estimate <= 2 * peak
+
+
+def test_view_heatmap_estimate_covers_measured_peak():
+    request = ViewRequest(
+        components=["curves", "heatmap"], temperatures=[0, 300, 3000], points=500,
+        mu=0.4321, heatmap={"energy_points": 500, "temp_points": 200},
+    )
+    peak = _peak_bytes(lambda: build_view(request).model_dump_json())
+    estimate = estimate_view(500, 3, 1, 500, 500, 200)
+    assert peak <= estimate <= 2 * peak
+
+
+def test_waiters_are_granted_in_arrival_order():
+    async def scenario():
+        budget = MemoryBudget(budget_bytes=100)
+        await budget.acquire(60)
+        order = []
+
+        async def reserve(name, nbytes, background=False):
+            await budget.acquire(nbytes, background=background)
+            order.append(name)
+
+        large = asyncio.create_task(reserve("job", 80, background=True))
+        await asyncio.sleep(0)
+        # Fits right now, but must not overtake the waiting job
+        small = asyncio.create_task(reserve("request", 30))
+        await asyncio.sleep(0)
+        assert budget.queued == 2 and order == []
+
+        await budget.release(60)
+        await large
+        assert order == ["job"] and budget.queued == 1
+        await budget.release(80)
+        await small
+        assert order == ["job", "request"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,118 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import physics
+from main import app
+from physics import K_BOLTZMANN_EV, fermi_dirac, thermal_broadening
+
+client = TestClient(app)
+
+
+def _reference(spectrum, energy_step, temperature, edge, periods=61):
+    """Real-space convolution over a long explicit extension of the spectrum."""
+    n = len(spectrum)
+    if edge == "reflect":
+        period = np.concatenate([spectrum, spectrum[-2:0:-1]])
+        extended = np.tile(period, periods)
+        offset = (periods // 2) * len(period)
+    else:
+        pad = periods * n
+        extended = np.pad(spectrum, pad, mode="constant" if edge == "zero" else "edge")
+        offset = pad
+    x = (np.arange(len(extended)) - offset) * energy_step
+    kT = K_BOLTZMANN_EV * temperature
+    out = np.empty(n)
+    for i in range(n):
+        u = np.abs(i * energy_step - x) / kT
+        kernel = np.exp(-u) / (kT * (1 + np.exp(-u)) ** 2)
+        out[i] = np.sum(extended * kernel) * energy_step
+    return out
+
+
+def test_step_broadens_into_fermi_function():
+    energy = np.linspace(-1, 1, 2001)
+    step = np.where(energy > 0, 1.0, np.where(energy < 0, 0.0, 0.5))
+    broadened = thermal_broadening(step, energy[1] - energy[0], [0, 300], edge="edge")
+    np.testing.assert_allclose(broadened[0], step, atol=1e-12)
+    np.testing.assert_allclose(broadened[1], 1.0 - fermi_dirac(energy, 300, mu=0.0), atol=1e-3)
+
+
+@pytest.mark.parametrize("edge", ["edge", "zero", "reflect"])
+@pytest.mark.parametrize("temperature", [300.0, 3000.0, 20000.0])
+def test_matches_real_space_convolution(edge, temperature):
+    # n = 200, dE = 10 meV: 3000 K and 20000 K exceed the padding cap
+    energy = np.arange(200) * 0.01
+    spectrum = np.sin(3 * energy) + energy ** 2 + (energy > 1.0)
+    broadened = thermal_broadening(spectrum, 0.01, [temperature], edge=edge)[0]
+    reference = _reference(spectrum, 0.01, temperature, edge)
+    np.testing.assert_allclose(broadened, reference, atol=1e-4 * np.abs(reference).max())
+
+
+def test_direct_path_agrees_with_uncapped_fft(monkeypatch):
+    energy = np.arange(200) * 0.01
+    spectrum = np.cos(5 * energy) + (energy > 0.7)
+    temperatures = [3000.0, 5000.0, 20000.0]
+    capped = thermal_broadening(spectrum, 0.01, temperatures, edge="edge")
+    monkeypatch.setattr(physics, "BROADENING_MAX_PAD_FACTOR", 1000)
+    uncapped = thermal_broadening(spectrum, 0.01, temperatures, edge="edge")
+    np.testing.assert_allclose(capped, uncapped, atol=1e-4)
+
+
+def test_kernel_far_wider_than_capped_padding():
+    # dE = 1 neV with k_B*T = 86 eV: the whole spectrum sits at the kernel
+    # peak, so the result is the mean of the two constant extensions
+    spectrum = np.linspace(0.0, 3.0, 11)
+    edge = thermal_broadening(spectrum, 1e-9, [1e6], edge="edge")
+    np.testing.assert_allclose(edge, 1.5, atol=1e-9)
+    zero = thermal_broadening(spectrum, 1e-9, [1e6], edge="zero")
+    np.testing.assert_allclose(zero, 0.0, atol=1e-9)
+
+
+def test_mixed_temperatures_keep_their_rows():
+    # 1e6 K and 1e-3 K take the direct path, 1e-6 K and 0 K the FFT one
+    spectrum = np.linspace(0.0, 3.0, 11)
+    temperatures = [1e6, 0.0, 1e-3, 1e-6]
+    broadened = thermal_broadening(spectrum, 1e-9, temperatures, edge="edge")
+    for row, temperature in zip(broadened, temperatures):
+        np.testing.assert_allclose(
+            row, thermal_broadening(spectrum, 1e-9, [temperature], edge="edge")[0], atol=1e-12
+        )
+    np.testing.assert_allclose(broadened[1], spectrum, atol=1e-12)
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        thermal_broadening(np.ones(4), 0.0, [300])
+    with pytest.raises(ValueError):
+        thermal_broadening(np.ones(4), 0.01, [300], edge="wrap")
+
+
+def test_binary_endpoint_matches_library():
+    spectrum = np.random.default_rng(3).random(256)
+    response = client.post(
+        "/broadening/binary?energy_step=0.01&temperatures=300&temperatures=1000",
+        content=spectrum.tobytes(),
+    )
+    assert response.status_code == 200
+    broadened = np.load(io.BytesIO(response.content))
+    np.testing.assert_allclose(broadened, thermal_broadening(spectrum, 0.01, [300, 1000]), atol=1e-12)
+
+
+def test_binary_endpoint_rejects_oversized_body_before_reading(monkeypatch):
+    monkeypatch.setattr(main, "MAX_BROADENING_SAMPLES", 16)
+    monkeypatch.setattr(main, "NPY_HEADER_MAX_BYTES", 0)
+    url = "/broadening/binary?energy_step=0.01&temperatures=300"
+    assert client.post(url, content=np.ones(16).tobytes()).status_code == 200
+    assert client.post(url, content=np.ones(17).tobytes()).status_code == 413
+
+
+def test_binary_endpoint_requires_content_length():
+    def chunked():
+        yield np.ones(8).tobytes()
+
+    response = client.post("/broadening/binary?energy_step=0.01&temperatures=300", content=chunked())
+    assert response.status_code == 411
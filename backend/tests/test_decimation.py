@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from decimation import lttb_indices
+from main import app
+from physics import fermi_dirac
+
+client = TestClient(app)
+
+
+def _reference(x, ys, n_out):
+    """Bucket-by-bucket LTTB with bucket means as both anchors."""
+    ys = np.atleast_2d(ys)
+    n = len(x)
+    starts = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    buckets = [np.arange(lo, hi) for lo, hi in zip(starts[:-1], starts[1:])]
+    means = [(x[b].mean(), ys[:, b].mean(axis=1)) for b in buckets]
+    chosen = [0]
+    for i, b in enumerate(buckets):
+        px, py = (x[0], ys[:, 0]) if i == 0 else means[i - 1]
+        nx, ny = (x[-1], ys[:, -1]) if i == len(buckets) - 1 else means[i + 1]
+        areas = [
+            np.abs((px - nx) * (ys[:, j] - py) - (px - x[j]) * (ny - py)).sum()
+            for j in b
+        ]
+        chosen.append(b[int(np.argmax(areas))])
+    return np.array(chosen + [n - 1])
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 50), (1001, 3), (257, 100), (10, 9)])
+def test_matches_reference_implementation(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(-1, 2, n))
+    ys = rng.normal(size=(2, n)).cumsum(axis=1)
+    np.testing.assert_array_equal(lttb_indices(x, ys, n_out), _reference(x, ys, n_out))
+    np.testing.assert_array_equal(lttb_indices(x, ys[0], n_out), _reference(x, ys[0], n_out))
+
+
+def test_keeps_endpoints_and_returns_sorted_unique_indices():
+    x = np.linspace(-1, 2, 5000)
+    keep = lttb_indices(x, fermi_dirac(x, 300, 0.5), 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == 4999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_short_inputs_are_returned_whole():
+    x = np.linspace(0, 1, 20)
+    np.testing.assert_array_equal(lttb_indices(x, x, 20), np.arange(20))
+    np.testing.assert_array_equal(lttb_indices(x, x, 50), np.arange(20))
+    np.testing.assert_array_equal(lttb_indices(x[:2], x[:2], 3), np.arange(2))
+
+
+def test_fermi_step_survives_decimation():
+    x = np.linspace(-1, 2, 10000)
+    f = fermi_dirac(x, 1.0, 0.5)  # step narrower than the bucket width
+    keep = lttb_indices(x, f, 100)
+    # Both sides of the step are kept close to it, far less than a bucket apart
+    last_full = keep[f[keep] > 0.5][-1]
+    first_empty = keep[f[keep] < 0.5][0]
+    bucket_width = 3.0 / 98
+    assert x[first_empty] - x[last_full] < 0.1 * bucket_width
+
+
+def test_max_output_points_decimates_endpoint_responses():
+    body = {"temperature": 300, "mu": 0.5, "points": 5000, "max_output_points": 300}
+    full = client.post("/fermi-dirac", json=dict(body, max_output_points=None)).json()
+    decimated = client.post("/fermi-dirac", json=body).json()
+    assert len(decimated["energy"]) == len(decimated["occupation"]) == 300
+    index = {e: i for i, e in enumerate(full["energy"])}
+    for e, f in zip(decimated["energy"], decimated["occupation"]):
+        assert full["occupation"][index[e]] == f
+
+    derivative = client.get("/derivative", params={
+        "temperature": 300, "mu": 0.5, "points": 5000, "max_output_points": 300,
+    }).json()
+    assert len(derivative["energy"]) == 300
@@ -0,0 +1,34 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+import main
+from main import app
+from physics import fermi_dirac
+
+client = TestClient(app)
+
+
+def test_evaluate_streams_kernel_values():
+    energies = np.linspace(-1, 2, 1001)
+    response = client.post("/evaluate?temperatures=300&mu=0.5", content=energies.tobytes())
+    assert response.status_code == 200
+    assert response.headers["x-shape"] == "1,1,1001"
+    values = np.frombuffer(response.content, dtype="<f8")
+    np.testing.assert_allclose(values, fermi_dirac(energies, 300, 0.5), rtol=1e-12)
+
+
+def test_evaluate_rejects_oversized_body_before_reading(monkeypatch):
+    monkeypatch.setattr(main, "MAX_EVALUATE_POINTS", 10)
+    monkeypatch.setattr(main, "NPY_HEADER_MAX_BYTES", 0)
+    assert client.post("/evaluate", content=np.zeros(10).tobytes()).status_code == 200
+    response = client.post("/evaluate", content=np.zeros(11).tobytes())
+    assert response.status_code == 413
+
+
+def test_evaluate_requires_content_length():
+    def chunked():
+        yield np.zeros(4).tobytes()
+        yield np.zeros(4).tobytes()
+
+    response = client.post("/evaluate", content=chunked())
+    assert response.status_code == 411
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from physics import (
+    K_BOLTZMANN_EV, SATURATION_THRESHOLD, fermi_dirac, fermi_dirac_derivative,
+)
+
+# Largest value the unsorted path may return where the fast path returns 0.0
+SATURATED_TAIL = np.exp(-SATURATION_THRESHOLD)
+
+
+def _unsorted(function, energy, temperature, mu):
+    """Evaluate on a shuffled copy, which takes the full-grid path, and unshuffle."""
+    order = np.random.default_rng(0).permutation(len(energy))
+    values = np.empty_like(energy)
+    values[order] = function(energy[order], temperature, mu)
+    return values
+
+
+def _random_grids(count=40):
+    rng = np.random.default_rng(40)
+    for _ in range(count):
+        n = int(rng.integers(2, 3000))
+        energy = np.sort(rng.uniform(-10, 10, n))
+        if rng.random() < 0.3:
+            energy = np.repeat(energy, 2)  # sorted, with duplicates
+        mu = float(rng.choice([rng.uniform(energy[0], energy[-1]), energy[n // 2], rng.uniform(-12, 12)]))
+        temperature = float(10 ** rng.uniform(-1, 5))
+        yield energy, temperature, mu
+
+
+@pytest.mark.parametrize("energy, temperature, mu", list(_random_grids()))
+def test_sorted_fast_path_matches_unsorted_path(energy, temperature, mu):
+    fast = fermi_dirac(energy, temperature, mu)
+    full = _unsorted(fermi_dirac, energy, temperature, mu)
+    x = (energy - mu) / (K_BOLTZMANN_EV * temperature)
+
+    window = np.abs(x) <= SATURATION_THRESHOLD
+    np.testing.assert_array_equal(fast[window], full[window])
+    assert np.all(fast[x < -SATURATION_THRESHOLD] == 1.0)
+    assert np.all(full[x < -SATURATION_THRESHOLD] == 1.0)
+    # Above the window the fast path is exactly 0.0, the full path below e^-40
+    assert np.all(fast[x > SATURATION_THRESHOLD] == 0.0)
+    assert np.all(full[x > SATURATION_THRESHOLD] <= SATURATED_TAIL)
+
+
+@pytest.mark.parametrize("energy, temperature, mu", list(_random_grids(20)))
+def test_sorted_derivative_matches_unsorted_path(energy, temperature, mu):
+    fast = fermi_dirac_derivative(energy, temperature, mu)
+    full = _unsorted(fermi_dirac_derivative, energy, temperature, mu)
+    k_B_T = K_BOLTZMANN_EV * temperature
+    x = (energy - mu) / k_B_T
+
+    window = np.abs(x) <= SATURATION_THRESHOLD
+    np.testing.assert_array_equal(fast[window], full[window])
+    assert np.all(fast[~window] == 0.0)
+    assert np.all(k_B_T * np.abs(full[~window]) <= SATURATED_TAIL)
+
+
+def test_window_edges_straddling_mu_on_a_generated_grid():
+    # Grid points exactly at mu and at mu ± 40 kT
+    temperature, mu = 300.0, 0.5
+    width = SATURATION_THRESHOLD * K_BOLTZMANN_EV * temperature
+    energy = np.sort(np.concatenate([np.linspace(-1, 2, 1001), [mu, mu - width, mu + width]]))
+    fast = fermi_dirac(energy, temperature, mu)
+    full = _unsorted(fermi_dirac, energy, temperature, mu)
+    np.testing.assert_array_equal(fast[energy <= mu + width], full[energy <= mu + width])
+    assert fast[energy == mu][0] == 0.5
+    assert np.all(fast[energy > mu + width] == 0.0)
+
+
+def test_fast_path_is_not_taken_for_unsorted_or_multidimensional_input():
+    energy = np.array([2.0, 0.0, 1.0])
+    assert fermi_dirac(energy, 3000, 1.0)[0] > 0.0  # x ≈ 3.9, no saturation
+    # 2D input takes the full path: its saturated tail is tiny but not zeroed
+    grid = np.linspace(-1, 2, 12).reshape(3, 4)
+    values = fermi_dirac(grid, 300, 0.5)
+    assert values[-1, -1] > 0.0
+    np.testing.assert_allclose(values, fermi_dirac(grid.ravel(), 300, 0.5).reshape(3, 4), rtol=0, atol=SATURATED_TAIL)
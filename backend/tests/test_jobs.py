@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from pydantic import BaseModel
+from fastapi.testclient import TestClient
+
+from admission import MemoryBudget, memory_budget, reserve_from_thread
+from jobs import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, JobManager, JobStatus
+from main import app
+
+
+class Params(BaseModel):
+    size: int = 1
+
+
+def _wait(manager, job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = manager.get(job_id)
+        if status.status not in (QUEUED, RUNNING):
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _write_status(manager, **fields):
+    status = JobStatus(kind="echo", priority=0, progress=0.0, created_at=time.time(), **fields)
+    with open(manager._path(status.job_id, "json"), "w") as f:
+        json.dump(status.__dict__, f)
+    return status.job_id
+
+
+def test_jobs_of_dead_workers_fail_and_expire(tmp_path):
+    manager = JobManager(str(tmp_path), ttl=60)
+    orphan = _write_status(manager, job_id="a1", status=RUNNING, worker_pid=_dead_pid())
+    legacy = _write_status(manager, job_id="a2", status=QUEUED)
+    live = _write_status(manager, job_id="a3", status=RUNNING, worker_pid=os.getpid())
+
+    for job_id in (orphan, legacy):
+        status = manager.get(job_id)
+        assert status.status == FAILED
+        assert status.expires_at is not None and status.expires_at > time.time()
+    assert manager.get(live).status == RUNNING
+
+
+def test_job_runs_inside_its_reservation(tmp_path):
+    manager = JobManager(str(tmp_path), workers=1)
+    events = []
+
+    @contextmanager
+    def reserve(nbytes, cancelled):
+        events.append(("acquire", nbytes))
+        yield
+        events.append(("release", nbytes))
+
+    def runner(params, progress):
+        events.append(("run", params.size))
+        return b"done"
+
+    manager.reserve = reserve
+    manager.register("echo", Params, runner, estimate=lambda p: 1000 * p.size)
+    status = _wait(manager, manager.submit("echo", {"size": 3}).job_id)
+    assert status.status == SUCCEEDED
+    assert events == [("acquire", 3000), ("run", 3), ("release", 3000)]
+
+
+def test_refused_reservation_fails_the_job(tmp_path):
+    manager = JobManager(str(tmp_path), workers=1)
+
+    def reserve(nbytes, cancelled):
+        raise MemoryError(f"{nbytes} bytes exceed the budget")
+
+    manager.reserve = reserve
+    manager.register("echo", Params, lambda params, progress: b"", estimate=lambda p: 5)
+    status = _wait(manager, manager.submit("echo", {}).job_id)
+    assert status.status == FAILED
+    assert "exceed the budget" in status.error
+
+
+def test_job_waiting_for_budget_can_be_cancelled(tmp_path):
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    budget = MemoryBudget(budget_bytes=100)
+    asyncio.run_coroutine_threadsafe(budget.acquire(100), loop).result()
+
+    manager = JobManager(str(tmp_path), workers=1)
+    manager.reserve = lambda nbytes, cancelled: reserve_from_thread(loop, nbytes, budget, cancelled)
+    ran = []
+    manager.register("echo", Params, lambda params, progress: ran.append(1) or b"", estimate=lambda p: 50)
+    job_id = manager.submit("echo", {}).job_id
+
+    deadline = time.time() + 5
+    while budget.queued == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert budget.queued == 1
+    assert manager.get(job_id).status == QUEUED
+
+    manager.cancel(job_id)
+    status = _wait(manager, job_id)
+    assert status.status == CANCELLED
+    assert budget.queued == 0 and budget.used_bytes == 100
+    assert ran == []
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def test_server_jobs_reserve_from_memory_budget():
+    with TestClient(app) as client:
+        admitted = memory_budget.admitted_total
+        response = client.post("/jobs", json={
+            "kind": "multi-temperature",
+            "params": {"temperatures": [100, 300], "points": 200},
+        })
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        for _ in range(500):
+            status = client.get(f"/jobs/{job_id}").json()["status"]
+            if status not in (QUEUED, RUNNING):
+                break
+            time.sleep(0.02)
+        assert status == SUCCEEDED
+        assert memory_budget.admitted_total == admitted + 1
+        assert memory_budget.used_bytes == 0
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import random
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from loadtest import (
+    DEFAULT_MIX, ENDPOINTS, EndpointStats, _free_port, parse_mix, start_server,
+    stop_server, wait_until_ready,
+)
+from main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("name", sorted(ENDPOINTS))
+def test_generated_requests_are_accepted(name):
+    rng = random.Random(1)
+    for _ in range(10):
+        method, path, kwargs = ENDPOINTS[name](rng)
+        response = client.request(method, path, **kwargs)
+        assert response.status_code == 200, response.text
+
+
+def test_default_mix_covers_view():
+    assert "view" in parse_mix(DEFAULT_MIX)
+    with pytest.raises(ValueError):
+        parse_mix("nope=1")
+
+
+def test_endpoint_reports_carry_no_shared_rss():
+    stats = EndpointStats(latencies=[0.1, 0.2])
+    assert "peak_server_rss_mb" not in stats.report(1.0)
+    stats.peak_rss = 2 ** 20
+    assert stats.report(1.0)["peak_server_rss_mb"] == 1.0
+
+
+def test_cache_hit_rate_counts_only_cacheable_responses():
+    stats = EndpointStats(latencies=[0.1, 0.2, 0.3], cache_hits=1, cache_misses=3)
+    assert stats.report(1.0)["cache_hit_rate"] == 0.25
+    assert "cache_hit_rate" not in EndpointStats(latencies=[0.1]).report(1.0)
+
+
+def test_each_server_starts_with_an_empty_shared_cache():
+    body = {"temperatures": [300], "mu": 0.5, "points": 100}
+
+    def two_requests():
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(1, port, shared_cache_mb=16)
+        try:
+            asyncio.run(wait_until_ready(base_url))
+            with httpx.Client(base_url=base_url) as http:
+                return [http.post("/multi-temperature", json=body).headers["x-cache"] for _ in range(2)]
+        finally:
+            stop_server(server)
+            assert not os.path.exists(server.cache_dir)
+
+    assert two_requests() == ["miss", "hit"]
+    assert two_requests() == ["miss", "hit"]
@@ -0,0 +1,44 @@
+import tracemalloc
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from profiling import ProfileStore, ProfilingMiddleware
+
+
+def _client(tmp_path):
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        return {"sum": float(np.ones(100_000).sum())}
+
+    store = ProfileStore(str(tmp_path))
+    app.add_middleware(ProfilingMiddleware, store=store)
+    return TestClient(app), store
+
+
+def _profile(client, store, mode):
+    response = client.get("/work", params={"profile": mode})
+    assert response.status_code == 200
+    return store.load(response.headers["x-profile-id"])
+
+
+def test_memory_report_covers_the_request(tmp_path):
+    client, store = _client(tmp_path)
+    report = _profile(client, store, "memory")
+    assert report["memory"]["peak_bytes"] >= 800_000
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_report_is_marked_unavailable_when_already_tracing(tmp_path):
+    client, store = _client(tmp_path)
+    tracemalloc.start()
+    try:
+        report = _profile(client, store, "all")
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert "unavailable" in report["memory"]
+    assert report["cpu"]
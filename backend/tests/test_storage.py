@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import pytest
+
+from storage import ByteLRU, checked_id, write_atomic
+
+
+@pytest.mark.parametrize("identifier", ["", "../etc", "a/b", "abc.json", "a b"])
+def test_checked_id_rejects_path_like_ids(identifier):
+    with pytest.raises(KeyError):
+        checked_id(identifier)
+
+
+def test_checked_id_accepts_hex():
+    assert checked_id("0123abcdef") == "0123abcdef"
+
+
+def test_write_atomic_replaces_and_leaves_no_tmp(tmp_path):
+    path = str(tmp_path / "entry.bin")
+    write_atomic(path, b"old")
+    write_atomic(path, b"ne", b"w")
+    with open(path, "rb") as f:
+        assert f.read() == b"new"
+    assert os.listdir(tmp_path) == ["entry.bin"]
+
+
+def test_write_atomic_cleans_up_on_error(tmp_path):
+    with pytest.raises(TypeError):
+        write_atomic(str(tmp_path / "entry.bin"), b"ok", "not bytes")
+    assert os.listdir(tmp_path) == []
+
+
+def test_byte_lru_evicts_least_recently_used():
+    lru = ByteLRU(max_bytes=3 * 80)
+    for key in "abc":
+        assert lru.put(key, np.zeros(10))
+    lru.get("a")
+    assert lru.put("d", np.zeros(10))
+    assert [key for key, _ in lru.items()] == ["c", "a", "d"]
+    assert lru.evictions == 1
+    assert lru.used_bytes == 240
+    assert (lru.hits, lru.misses) == (1, 0)
+    assert lru.get("b") is None and lru.misses == 1
+
+
+def test_byte_lru_replaces_same_key_and_rejects_oversized():
+    lru = ByteLRU(max_bytes=100)
+    lru.put("a", np.zeros(5))
+    lru.put("a", np.zeros(10))
+    assert len(lru) == 1 and lru.used_bytes == 80
+    assert not lru.put("big", np.zeros(20))
+    assert len(lru) == 1
@@ -0,0 +1,160 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+import sweep
+from physics import fermi_dirac_components
+from sweep import KERNELS, chunk_layout, iter_chunks, parse_spec, run_sweep
+
+SPEC = {
+    "temperatures": [0, 50, 300, 1000],
+    "mus": {"start": 0.0, "stop": 0.5, "num": 3},
+    "energy_ranges": [
+        {"name": "window", "min": -1.0, "max": 2.0, "points": 37},
+        {"name": "wide", "min": -5.0, "max": 5.0, "points": 11},
+    ],
+    "kernels": list(KERNELS),
+}
+
+
+def _reference(spec, energy_range):
+    energy = energy_range.grid()
+    values = {k: np.empty((len(spec.temperatures), len(spec.mus), len(energy))) for k in spec.kernels}
+    for j, mu in enumerate(spec.mus):
+        f, mb, df = fermi_dirac_components(energy, spec.temperatures, mu, True, True)
+        values["fermi_dirac"][:, j] = f
+        values["maxwell_boltzmann"][:, j] = mb
+        values["derivative"][:, j] = df
+    return energy, values
+
+
+def _memory_mb(spec, max_cells, workers=1):
+    cell_bytes = sweep._BASE_CELL_BYTES + sweep._KERNEL_CELL_BYTES * len(spec.kernels)
+    return max_cells * workers * cell_bytes / 2**20
+
+
+def test_parse_spec_expands_ranges_and_defaults():
+    spec = parse_spec(SPEC)
+    np.testing.assert_allclose(spec.mus, [0.0, 0.25, 0.5])
+    assert [r.name for r in spec.energy_ranges] == ["window", "wide"]
+    assert spec.cells == 4 * 3 * (37 + 11)
+
+    defaults = parse_spec({"temperatures": {"start": 1, "stop": 1000, "num": 4, "scale": "log"}})
+    np.testing.assert_allclose(defaults.temperatures, [1, 10, 100, 1000])
+    assert defaults.kernels == ["fermi_dirac"] and defaults.dtype == "float64"
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({}, "needs 'temperatures'"),
+    ({"temperatures": [-1]}, "non-negative"),
+    ({"temperatures": [1], "kernels": ["bose"]}, "kernels"),
+    ({"temperatures": [1], "dtype": "int8"}, "dtype"),
+    ({"temperatures": [1], "energy_ranges": [{"min": 1, "max": 0, "points": 5}]}, "greater than min"),
+    ({"temperatures": [1], "energy_ranges": [{"name": "../x", "min": 0, "max": 1, "points": 5}]}, "file name"),
+    ({"temperatures": [1], "energy_ranges": [{"name": "a", "min": 0, "max": 1, "points": 5}] * 2}, "unique"),
+])
+def test_parse_spec_rejects_invalid_specs(raw, message):
+    with pytest.raises(ValueError, match=message):
+        parse_spec(raw)
+
+
+@pytest.mark.parametrize("max_cells", [1, 5, 36, 37, 80, 1000])
+def test_chunks_cover_every_cell_once(max_cells):
+    spec = parse_spec(SPEC)
+    paths = {r.name: {} for r in spec.energy_ranges}
+    counts = {r.name: np.zeros((4, 3, r.points), dtype=int) for r in spec.energy_ranges}
+    for chunk in iter_chunks(spec, paths, max_cells):
+        assert chunk.cells <= max(max_cells, chunk.e_stop - chunk.e_start)
+        t_stop = chunk.t_start + len(chunk.temperatures)
+        counts[chunk.energy_range.name][chunk.t_start:t_stop, chunk.mu_index, chunk.e_start:chunk.e_stop] += 1
+    for count in counts.values():
+        assert np.all(count == 1)
+
+
+def test_chunk_layout_splits_rows_before_energies():
+    assert chunk_layout(10, 100, 450) == (4, 100)
+    assert chunk_layout(10, 100, 40) == (1, 40)
+    assert chunk_layout(10, 100, 0) == (1, 1)
+
+
+def test_nearest_index_breaks_ties_like_argmin():
+    energy_range = parse_spec(SPEC).energy_ranges[1]  # -5..5 in steps of 1
+    grid = energy_range.grid()
+    for value in (0.5, -4.5, 4.5, 0.49, 0.51, -7.0, 9.0):
+        assert energy_range.nearest_index(value) == int(np.argmin(np.abs(grid - value)))
+
+
+@pytest.mark.parametrize("max_cells", [5, 37, 10_000])
+def test_chunked_sweep_matches_whole_grid_evaluation(tmp_path, max_cells):
+    spec = parse_spec(SPEC)
+    # With 5 cells per chunk the T = 0 delta spike lands in one energy slice
+    # of many; it must still sit at the full grid's point nearest μ
+    written = run_sweep(spec, str(tmp_path), workers=2,
+                        memory_mb=_memory_mb(spec, max_cells, workers=2), show_progress=False)
+    assert len(written) == 2
+    for energy_range in spec.energy_ranges:
+        energy, expected = _reference(spec, energy_range)
+        range_dir = tmp_path / energy_range.name
+        np.testing.assert_array_equal(np.load(range_dir / "energy.npy"), energy)
+        for kernel in spec.kernels:
+            np.testing.assert_allclose(np.load(range_dir / f"{kernel}.npy"), expected[kernel], rtol=1e-12)
+
+        spikes = np.load(range_dir / "derivative.npy")[0]
+        for j, mu in enumerate(spec.mus):
+            assert np.count_nonzero(spikes[j]) == 1
+            assert spikes[j, energy_range.nearest_index(mu)] == -1.0 / energy_range.step
+
+
+def test_cli_writes_npz(tmp_path):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(dict(SPEC, dtype="float32")))
+    out = tmp_path / "out"
+    assert sweep.main([str(spec_path), "-o", str(out), "--format", "npz", "--workers", "1", "--quiet"]) == 0
+
+    spec = parse_spec(SPEC)
+    assert sorted(p.name for p in out.iterdir()) == ["wide.npz", "window.npz"]
+    for energy_range in spec.energy_ranges:
+        energy, expected = _reference(spec, energy_range)
+        with np.load(out / f"{energy_range.name}.npz") as archive:
+            assert sorted(archive.files) == sorted(["energy", "temperatures", "mus"] + list(KERNELS))
+            np.testing.assert_allclose(archive["mus"], spec.mus)
+            for kernel in KERNELS:
+                assert archive[kernel].dtype == np.float32
+                np.testing.assert_allclose(archive[kernel], expected[kernel].astype(np.float32), rtol=1e-6)
+
+
+def test_cli_writes_long_format_csv(tmp_path, capsys):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(dict(SPEC, kernels=["fermi_dirac", "derivative"])))
+    out = tmp_path / "out"
+    # Tiny memory bound: CSV rows are formatted a few at a time
+    assert sweep.main([str(spec_path), "-o", str(out), "--format", "csv",
+                       "--workers", "1", "--memory-mb", "0.001", "--quiet"]) == 0
+    assert str(out / "window.csv") in capsys.readouterr().out
+
+    spec = parse_spec(SPEC)
+    energy_range = spec.energy_ranges[0]
+    energy, expected = _reference(spec, energy_range)
+    with open(out / "window.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["temperature_K", "mu_eV", "energy_eV", "fermi_dirac", "derivative"]
+    values = np.array(rows[1:], dtype=float)
+    assert len(values) == 4 * 3 * energy_range.points
+    # Long format: temperature, then μ, then energy vary slowest to fastest
+    table = values.reshape(4, 3, energy_range.points, 5)
+    np.testing.assert_allclose(table[:, 0, 0, 0], spec.temperatures)
+    np.testing.assert_allclose(table[0, :, 0, 1], spec.mus)
+    np.testing.assert_allclose(table[0, 0, :, 2], energy, rtol=1e-9)
+    np.testing.assert_allclose(table[..., 3], expected["fermi_dirac"], rtol=1e-9, atol=1e-300)
+    np.testing.assert_allclose(table[..., 4], expected["derivative"], rtol=1e-9, atol=1e-300)
+    assert not any(p.name.startswith(".sweep-") for p in out.iterdir())
+
+
+def test_cli_reports_invalid_spec(tmp_path, capsys):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps({"temperatures": [-5]}))
+    with pytest.raises(SystemExit):
+        sweep.main([str(spec_path), "-o", str(tmp_path / "out")])
+    assert "invalid spec" in capsys.readouterr().err
@@ -0,0 +1,61 @@
+import base64
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from main import app
+from physics import fermi_dirac
+
+client = TestClient(app)
+
+REQUEST = {
+    "temp_start": 0, "temp_end": 1000, "frames": 5, "temp_scale": "linear",
+    "mu": 0.5, "energy_min": -1.0, "energy_max": 2.0, "points": 101,
+}
+
+
+def _events(body: str):
+    """Parse an SSE body into (event, id, data) tuples."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+def _stream(**overrides):
+    with client.stream("POST", "/sweep/stream", json=dict(REQUEST, **overrides)) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return _events(response.read().decode("utf-8"))
+
+
+def test_stream_sends_meta_frames_and_done_in_order():
+    events = _stream()
+    assert [e[0] for e in events] == ["meta"] + ["frame"] * 5 + ["done"]
+    meta = events[0][2]
+    assert meta["encoding"] == "json" and meta["mu"] == 0.5
+    assert meta["temperatures"] == [0.0, 250.0, 500.0, 750.0, 1000.0]
+    energy = np.array(meta["energy"])
+    for index, (_, event_id, frame) in enumerate(events[1:-1]):
+        assert event_id == str(index) and frame["index"] == index
+        assert frame["temperature"] == meta["temperatures"][index]
+        np.testing.assert_allclose(frame["occupation"], fermi_dirac(energy, frame["temperature"], 0.5), atol=5e-7)
+    assert events[-1][2] == {"frames": 5}
+
+
+def test_base64_frames_are_little_endian_float32():
+    events = _stream(encoding="base64")
+    meta = events[0][2]
+    assert meta["encoding"] == "base64"
+    energy = np.array(meta["energy"])
+    for _, _, frame in events[1:-1]:
+        occupation = np.frombuffer(base64.b64decode(frame["occupation"]), dtype="<f4")
+        assert occupation.shape == energy.shape
+        np.testing.assert_allclose(occupation, fermi_dirac(energy, frame["temperature"], 0.5), atol=1e-7)
+
+
+def test_invalid_encoding_is_rejected():
+    response = client.post("/sweep/stream", json=dict(REQUEST, encoding="hex"))
+    assert response.status_code == 422
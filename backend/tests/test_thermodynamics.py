@@ -0,0 +1,59 @@
+import numpy as np
+
+from physics import K_BOLTZMANN_EV, compute_thermodynamics, density_of_states
+
+
+def test_quadrature_matches_sommerfeld_for_free_electrons():
+    energy = np.linspace(0, 10, 20001)
+    dos = density_of_states(energy, "free_electron_3d")
+    temperatures = np.array([0.0, 100.0, 300.0, 1000.0])
+    quad = compute_thermodynamics(energy, dos, temperatures, mu=5.0, method="quadrature")
+    somm = compute_thermodynamics(energy, dos, temperatures, mu=5.0, method="sommerfeld")
+    np.testing.assert_allclose(quad.electron_density, somm.electron_density, rtol=1e-4)
+    np.testing.assert_allclose(quad.internal_energy, somm.internal_energy, rtol=1e-4)
+    np.testing.assert_allclose(quad.specific_heat, somm.specific_heat, rtol=1e-2)
+    assert quad.method == ["quadrature"] * 4
+    assert somm.method == ["sommerfeld"] * 4
+
+
+def test_zero_temperature_density_is_filled_states():
+    energy = np.linspace(0, 10, 20001)
+    dos = density_of_states(energy, "free_electron_3d", prefactor=2.0)
+    result = compute_thermodynamics(energy, dos, np.array([0.0]), mu=4.0, method="quadrature")
+    np.testing.assert_allclose(result.electron_density, 2.0 * 2 / 3 * 4.0 ** 1.5, rtol=1e-4)
+
+
+def test_tabulated_constant_dos_matches_closed_form():
+    # Constant g = A above E = 0: n(T) = A k_B T ln(1 + exp(μ / k_B T)) exactly
+    energy = np.linspace(0, 40, 40001)
+    dos = density_of_states(energy, "tabulated", table_energy=[0.0, 40.0], table_dos=[3.0, 3.0])
+    temperatures = np.array([300.0, 3000.0, 20000.0])
+    mu = 5.0
+    result = compute_thermodynamics(energy, dos, temperatures, mu, method="quadrature")
+    kT = K_BOLTZMANN_EV * temperatures
+    expected = 3.0 * kT * np.logaddexp(0.0, mu / kT)
+    np.testing.assert_allclose(result.electron_density, expected, rtol=1e-5)
+    # Leading Sommerfeld term is exact-ish deep in the degenerate limit
+    np.testing.assert_allclose(
+        result.specific_heat[0], np.pi ** 2 / 3 * K_BOLTZMANN_EV ** 2 * 300.0 * 3.0, rtol=1e-3
+    )
+
+
+def test_tabulated_dos_agrees_with_model_it_samples():
+    energy = np.linspace(0, 10, 20001)
+    table_energy = np.linspace(0, 10, 501)
+    table_dos = np.sqrt(table_energy)
+    tabulated = density_of_states(energy, "tabulated", table_energy=table_energy, table_dos=table_dos)
+    analytic = density_of_states(energy, "free_electron_3d")
+    temperatures = np.array([300.0, 3000.0])
+    a = compute_thermodynamics(energy, tabulated, temperatures, mu=5.0, method="quadrature")
+    b = compute_thermodynamics(energy, analytic, temperatures, mu=5.0, method="quadrature")
+    np.testing.assert_allclose(a.electron_density, b.electron_density, rtol=1e-4)
+    np.testing.assert_allclose(a.specific_heat, b.specific_heat, rtol=1e-3)
+
+
+def test_auto_uses_sommerfeld_only_when_degenerate():
+    energy = np.linspace(0, 10, 20001)
+    dos = density_of_states(energy, "free_electron_3d")
+    result = compute_thermodynamics(energy, dos, np.array([100.0, 1e5]), mu=5.0)
+    assert result.method == ["sommerfeld", "quadrature"]
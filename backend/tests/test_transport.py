@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from physics import K_BOLTZMANN_EV, compute_transport, transport_function, trapezoid_weights
+
+LORENZ_SOMMERFELD = np.pi ** 2 / 3 * K_BOLTZMANN_EV ** 2  # (k_B/e)² in eV units, e = 1
+
+
+def _reference_moments(sigma, lo, hi, temperature, mu, n=400001):
+    """L_0..L_2 by brute-force trapezoid over [lo, hi]."""
+    energy = np.linspace(lo, hi, n)
+    kT = K_BOLTZMANN_EV * temperature
+    x = (energy - mu) / kT
+    kernel = np.exp(-np.abs(x)) / (kT * (1 + np.exp(-np.abs(x))) ** 2)
+    weighted = trapezoid_weights(energy) * sigma(energy) * kernel
+    return [np.sum((energy - mu) ** n * weighted) for n in range(3)]
+
+
+def test_constant_sigma_gives_sommerfeld_lorenz_number():
+    temperatures = np.array([10.0, 300.0, 1e4, 1e6])
+    result = compute_transport(lambda e: np.full_like(e, 2.0), temperatures, mu=0.3)
+    np.testing.assert_allclose(result.conductivity, 2.0, rtol=1e-9)
+    np.testing.assert_allclose(result.seebeck, 0.0, atol=1e-12)
+    np.testing.assert_allclose(result.lorenz_number, LORENZ_SOMMERFELD, rtol=1e-6)
+
+
+def test_zero_temperature_is_delta_limit():
+    result = compute_transport(lambda e: 1.0 + e, np.array([0.0]), mu=0.5)
+    np.testing.assert_allclose(result.moments[:, 0], [1.5, 0.0, 0.0])
+
+
+def test_power_law_seebeck_matches_mott():
+    mu, T, r = 0.5, 100.0, 1.5
+    result = compute_transport(
+        lambda e: transport_function(e, "power_law", exponent=r),
+        np.array([T]), mu, support=(0.0, np.inf),
+    )
+    mott = -LORENZ_SOMMERFELD * T * r / mu
+    np.testing.assert_allclose(result.seebeck, mott, rtol=1e-3)
+
+
+@pytest.mark.parametrize("temperature", [300.0, 1e4, 1e6])
+def test_tabulated_sigma_narrower_than_grid_step(temperature):
+    # At 1e6 K the window is ±3.4 keV: one grid step is ~3.4 eV, wider
+    # than the whole table
+    table_energy = np.array([0.0, 0.4, 1.0])
+    table_sigma = np.array([1.0, 3.0, 2.0])
+
+    def sigma(e):
+        return transport_function(e, "tabulated", table_energy=table_energy, table_sigma=table_sigma)
+
+    mu = 5.0 if temperature > 1e4 else 0.5
+    result = compute_transport(
+        sigma, np.array([temperature]), mu,
+        support=(table_energy[0], table_energy[-1]), breakpoints=table_energy,
+    )
+    reference = _reference_moments(sigma, 0.0, 1.0, temperature, mu)
+    assert result.moments[0, 0] > 0
+    np.testing.assert_allclose(result.moments[:, 0], reference, rtol=1e-5, atol=1e-14)
+
+
+def test_support_outside_window_gives_zero_moments():
+    result = compute_transport(
+        lambda e: np.ones_like(e), np.array([300.0]), mu=0.0, support=(5.0, 6.0)
+    )
+    np.testing.assert_array_equal(result.moments, 0.0)
+    assert np.isnan(result.seebeck[0])
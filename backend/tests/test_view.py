@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import app
+from surface_cache import SurfaceCache
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def empty_surface_cache(monkeypatch):
+    """Give every test its own empty surface cache, so reuse counts start at zero."""
+    cache = SurfaceCache(max_bytes=main.surface_cache.status()["max_bytes"])
+    monkeypatch.setattr(main, "surface_cache", cache)
+    return cache
+
+
+def _view(**overrides):
+    body = {
+        "components": ["curves", "heatmap"],
+        "temperatures": [300],
+        "mu": 0.0,
+        "energy_min": -0.5,
+        "energy_max": 0.5,
+        "points": 101,
+        "heatmap": {"energy_points": 50, "temp_min": 10, "temp_max": 1000, "temp_points": 20},
+    }
+    body.update(overrides)
+    return client.post("/view", json=body)
+
+
+def test_view_returns_curves_and_heatmap():
+    response = _view()
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["curves"]) == 1
+    assert len(data["heatmap"]["occupation"]) == 20
+    assert len(data["heatmap"]["occupation"][0]) == 50
+
+
+@pytest.mark.parametrize("heatmap", [
+    {"temp_min": 1000, "temp_max": 1000},
+    {"temp_min": 2000, "temp_max": 1000},
+])
+def test_heatmap_temperature_range_must_be_increasing(heatmap):
+    assert _view(heatmap=heatmap).status_code == 422
+
+
+def test_energy_range_must_be_increasing():
+    assert _view(energy_min=0.5, energy_max=0.5).status_code == 422
+
+
+def _frontend_heatmap(energy_min, energy_max, step=0.02):
+    # Mirrors heatmapEnergyPoints in frontend/src/App.tsx
+    return {
+        "energy_points": round((energy_max - energy_min) / step) + 1,
+        "temp_min": 1, "temp_max": 5000, "temp_points": 100, "temp_scale": "log",
+    }
+
+
+def test_frontend_window_edits_reuse_cached_surface(empty_surface_cache):
+    windows = [(-1.0, 2.0), (-1.0, 2.5), (-0.5, 2.5)]
+    fractions = []
+    for energy_min, energy_max in windows:
+        response = _view(
+            mu=0.37, energy_min=energy_min, energy_max=energy_max,
+            heatmap=_frontend_heatmap(energy_min, energy_max),
+        )
+        assert response.status_code == 200
+        fractions.append(response.json()["heatmap"]["reused_fraction"])
+    assert fractions[0] == 0.0
+    # 151 of 176 columns, then 151 of 151
+    assert fractions[1] == pytest.approx(151 / 176)
+    assert fractions[2] == pytest.approx(1.0)
+    assert empty_surface_cache.status()["lookups"] == 3
@@ -0,0 +1,79 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import app
+from physics import fermi_dirac
+from volumes import Volume, VolumeCache
+
+client = TestClient(app)
+
+REQUEST = {
+    "mu_min": 0.0, "mu_max": 1.0, "mu_points": 5,
+    "energy_min": -1.0, "energy_max": 2.0, "energy_points": 40,
+    "temp_min": 100, "temp_max": 1000, "temp_points": 6,
+    "storage": "float32",
+}
+
+
+def _volume(key="abc123", shape=(2, 3, 4)):
+    data = np.arange(np.prod(shape), dtype=np.uint16).reshape(shape)
+    return Volume(key, np.linspace(0, 1, shape[2]), np.arange(shape[0]) * 100.0, np.arange(shape[1]) * 0.5, data)
+
+
+def test_volume_post_slice_and_box_round_trip():
+    created = client.post("/volume", json=REQUEST).json()
+    assert created["shape"] == [6, 5, 40]
+    volume_id = created["volume_id"]
+    assert client.post("/volume", json=REQUEST).json()["cached"]
+
+    energy = np.array(created["energy"])
+    sliced = client.get(f"/volume/{volume_id}/slice", params={"axis": "mu", "index": 2}).json()
+    assert sliced["axes"] == ["temperature", "energy"]
+    expected = [fermi_dirac(energy, T, created["mus"][2]) for T in created["temperatures"]]
+    np.testing.assert_allclose(sliced["occupation"], expected, atol=1e-6)
+
+    box = client.get(f"/volume/{volume_id}/box", params={
+        "t_start": 1, "t_stop": 3, "mu_stop": 2, "e_start": 10, "e_stop": 20, "format": "npy",
+    })
+    block = np.load(io.BytesIO(box.content))
+    assert block.shape == (2, 2, 10)
+    np.testing.assert_allclose(block[0, 1], fermi_dirac(energy[10:20], created["temperatures"][1], created["mus"][1]), atol=1e-6)
+
+
+def test_other_worker_serves_slices_from_the_shared_directory(monkeypatch):
+    volume_id = client.post("/volume", json=dict(REQUEST, mu_points=3)).json()["volume_id"]
+    # A fresh cache on the same directory stands in for another uvicorn worker
+    other = VolumeCache(main.volume_cache.max_bytes, main.volume_cache.directory)
+    monkeypatch.setattr(main, "volume_cache", other)
+    response = client.get(f"/volume/{volume_id}/slice", params={"axis": "temperature", "index": 0})
+    assert response.status_code == 200
+    assert other.status()["loads"] == 1
+
+
+def test_shared_directory_is_trimmed_least_recently_used_first(tmp_path):
+    nbytes = _volume().nbytes + 128  # block plus its .npy header
+    writer = VolumeCache(2 * nbytes, str(tmp_path))
+    for key in ("a1", "a2", "a3"):
+        assert writer.put(_volume(key))
+    reader = VolumeCache(2 * nbytes, str(tmp_path))
+    assert reader.get("a1") is None
+    loaded = reader.get("a3")
+    np.testing.assert_array_equal(loaded.data, _volume().data)
+    assert isinstance(loaded.data, np.memmap)
+    assert reader.status()["shared_volumes"] == 2
+
+
+@pytest.mark.parametrize("key", ["../x", "a.b", ""])
+def test_unsafe_ids_are_not_looked_up(tmp_path, key):
+    assert VolumeCache(2**20, str(tmp_path)).get(key) is None
+
+
+def test_without_directory_volumes_stay_in_memory():
+    cache = VolumeCache(2**20)
+    assert cache.put(_volume())
+    assert cache.get("abc123").data is not None
+    assert "shared_volumes" not in cache.status()
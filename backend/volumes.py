@@ -0,0 +1,220 @@
+"""
+Cached f(E, T, μ) Volume Datasets
+
+A volume is computed once by `physics.fermi_dirac_volume` and kept in a
+size-bounded cache under an ID derived from its parameters. Slices and
+sub-boxes are then cut from the cached block without recomputation.
+
+Blocks are stored in a directory shared by every uvicorn worker on the
+host and served from read-only memory maps, so a volume created through
+one worker can be sliced through any other, and all workers share one
+copy in the page cache.
+
+Configuration (environment variables, read at import):
+    FD_VOLUME_CACHE_MB      total bytes of cached blocks (default 512)
+    FD_VOLUME_DIR           shared block directory (default
+                            <tmp>/fermi-dirac-volumes); empty keeps blocks
+                            in process memory, so slices then need
+                            sticky sessions with more than one worker
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from storage import ByteLRU, checked_id, write_atomic
+
+# Axis order of every stored block
+VOLUME_AXES = ("temperature", "mu", "energy")
+
+
+@dataclass
+class Volume:
+    """A computed f(T, μ, E) block and its coordinate axes."""
+    volume_id: str
+    energy: np.ndarray
+    temperatures: np.ndarray
+    mus: np.ndarray
+    data: np.ndarray  # shape (len(temperatures), len(mus), len(energy)), possibly a memmap
+
+    @property
+    def storage(self) -> str:
+        return str(self.data.dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def axis_values(self, axis: str) -> np.ndarray:
+        return {
+            "temperature": self.temperatures,
+            "mu": self.mus,
+            "energy": self.energy,
+        }[axis]
+
+
+def volume_id(params: dict) -> str:
+    """Deterministic ID for a set of volume parameters."""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+# Temporary files older than this are leftovers from crashed writers
+_STALE_TMP_SECONDS = 60.0
+
+
+class VolumeCache:
+    """
+    LRU cache of volumes bounded by total block bytes.
+
+    With a `directory`, each block is written there as `<id>.npy` (the
+    data) and `<id>.json` (its axes, written last so that its presence
+    marks a complete entry), and replaced in memory by a read-only memory
+    map of the file. A volume missing from this process is mapped from
+    the directory, so any worker can serve it. The directory is trimmed
+    to `max_bytes`, least recently used (by mtime, refreshed on access)
+    first; workers keep serving maps of removed files until they drop
+    them from their own LRU.
+
+    Inserting a volume evicts least recently used ones until the new
+    block fits; a block larger than the whole cache is not stored.
+    """
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        self._volumes: "ByteLRU[Volume]" = ByteLRU(max_bytes)
+        self.directory = directory
+        self.loads = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._volumes.max_bytes
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{checked_id(key)}.{suffix}")
+
+    def get(self, key: str) -> Optional[Volume]:
+        volume = self._volumes.get(key)
+        if self.directory is None:
+            return volume
+        try:
+            if volume is None:
+                volume = self._load(key)
+                if volume is None:
+                    return None
+                self._volumes.put(key, volume)
+                self.loads += 1
+            os.utime(self._path(key, "json"))  # refresh recency for trimming
+        except (KeyError, OSError):
+            pass
+        return volume
+
+    def put(self, volume: Volume) -> bool:
+        """Store a volume; returns False if it can never fit."""
+        if volume.nbytes > self.max_bytes:
+            return False
+        if self.directory is not None:
+            try:
+                volume = self._store(volume)
+            except OSError:
+                pass  # keep the in-memory block, visible to this worker only
+        return self._volumes.put(volume.volume_id, volume)
+
+    def _store(self, volume: Volume) -> Volume:
+        data = np.ascontiguousarray(volume.data)
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, {
+            "descr": np.lib.format.dtype_to_descr(data.dtype),
+            "fortran_order": False,
+            "shape": data.shape,
+        })
+        write_atomic(self._path(volume.volume_id, "npy"), header.getvalue(), memoryview(data.reshape(-1)))
+        axes = {
+            "energy": volume.energy.tolist(),
+            "temperatures": volume.temperatures.tolist(),
+            "mus": volume.mus.tolist(),
+        }
+        write_atomic(self._path(volume.volume_id, "json"), json.dumps(axes).encode("utf-8"))
+        self._trim()
+        return Volume(
+            volume.volume_id, volume.energy, volume.temperatures, volume.mus,
+            np.load(self._path(volume.volume_id, "npy"), mmap_mode="r"),
+        )
+
+    def _load(self, key: str) -> Optional[Volume]:
+        try:
+            with open(self._path(key, "json"), "rb") as f:
+                axes = json.loads(f.read())
+            data = np.load(self._path(key, "npy"), mmap_mode="r")
+        except (KeyError, OSError, ValueError):
+            return None
+        return Volume(
+            key,
+            np.asarray(axes["energy"]),
+            np.asarray(axes["temperatures"]),
+            np.asarray(axes["mus"]),
+            data,
+        )
+
+    def _scan(self):
+        """(mtime, block bytes, id) of complete entries; sweeps stale temporaries."""
+        entries, now = [], time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".tmp"):
+                    if now - os.path.getmtime(path) > _STALE_TMP_SECONDS:
+                        os.remove(path)
+                elif name.endswith(".json"):
+                    key = name[:-len(".json")]
+                    entries.append((os.path.getmtime(path), os.path.getsize(self._path(key, "npy")), key))
+            except (KeyError, OSError):
+                continue
+        return entries
+
+    def _trim(self) -> None:
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for suffix in ("json", "npy"):
+                try:
+                    os.remove(self._path(key, suffix))
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def status(self) -> dict:
+        status = {
+            "max_bytes": self._volumes.max_bytes,
+            "used_bytes": self._volumes.used_bytes,
+            "volumes": len(self._volumes),
+            "hits": self._volumes.hits,
+            "misses": self._volumes.misses,
+            "evictions": self._volumes.evictions,
+            "directory": self.directory,
+        }
+        if self.directory is not None:
+            entries = self._scan()
+            status["shared_volumes"] = len(entries)
+            status["shared_bytes"] = sum(size for _, size, _ in entries)
+            status["loads"] = self.loads
+        return status
+
+
+volume_cache = VolumeCache(
+    max_bytes=int(float(os.environ.get("FD_VOLUME_CACHE_MB", "512")) * 2**20),
+    directory=os.environ.get(
+        "FD_VOLUME_DIR",
+        os.path.join(tempfile.gettempdir(), "fermi-dirac-volumes"),
+    ) or None,
+)
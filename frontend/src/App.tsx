@@ -12,14 +12,14 @@
  * - Data export capabilities
  */
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { Activity, Layers, AlertCircle, RefreshCw } from 'lucide-react';
 import FermiDiracChart, { TEMP_COLORS } from './components/FermiDiracChart';
 import ControlPanel from './components/ControlPanel';
 import Heatmap from './components/Heatmap';
 import EducationalPanel from './components/EducationalPanel';
-import { computeMultiTemperature, computeSurface, exportCSV, checkHealth } from './services/api';
-import type { SimulationSettings, CurveData, MultiTemperatureResponse, SurfaceResponse } from './types/api';
+import { computeView, exportCSV, checkHealth } from './services/api';
+import type { SimulationSettings, CurveData, SurfaceResponse, ViewComponent, ViewResponse } from './types/api';
 
 // Default simulation settings
 const DEFAULT_SETTINGS: SimulationSettings = {
@@ -33,6 +33,21 @@ const DEFAULT_SETTINGS: SimulationSettings = {
   activeMode: 'conceptual',
 };
 
+// Heatmap energy spacing (eV). The E_min/E_max inputs step by 0.1 eV, so
+// window edges fall on this lattice and a shifted or extended window stays
+// aligned with surfaces the server has cached, which it then extends
+// instead of recomputing. Off-lattice typed values still work, uncached.
+const HEATMAP_ENERGY_STEP = 0.02;
+
+function heatmapEnergyPoints(energyMin: number, energyMax: number): number {
+  // Coarser or finer lattices keep very wide or narrow windows within 10..1000 points
+  let step = HEATMAP_ENERGY_STEP;
+  const points = () => Math.round((energyMax - energyMin) / step) + 1;
+  while (points() > 1000) step *= 2;
+  while (points() < 10) step /= 2;
+  return points();
+}
+
 // Debounce helper
 function useDebounce<T>(value: T, delay: number): T {
   const [debouncedValue, setDebouncedValue] = useState<T>(value);
@@ -63,13 +78,18 @@ const App: React.FC = () => {
   // Debounced settings for API calls
   const debouncedSettings = useDebounce(settings, 150);
 
+  // μ and energy window of the loaded heatmap; null until one is loaded
+  const surfaceKeyRef = useRef<string | null>(null);
+
   // Check API connection on mount
   useEffect(() => {
     checkHealth().then(setApiConnected);
   }, []);
 
-  // Fetch curve data when settings change
-  const fetchCurveData = useCallback(async () => {
+  // Fetch curves and heatmap together so switching views needs no request.
+  // The heatmap only depends on μ and the energy window, so it is requested
+  // only when those change; other edits keep the loaded surface.
+  const fetchViewData = useCallback(async () => {
     if (!apiConnected) return;
     
     setIsLoading(true);
@@ -81,25 +101,40 @@ const App: React.FC = () => {
         ? [...new Set([0, ...settings.temperatures])]
         : settings.temperatures.filter(t => t > 0);
 
-      const response: MultiTemperatureResponse = await computeMultiTemperature({
+      const surfaceKey = `${settings.mu}|${settings.energyMin}|${settings.energyMax}`;
+      const needsHeatmap = surfaceKeyRef.current !== surfaceKey;
+
+      const components: ViewComponent[] = ['curves'];
+      if (settings.showMaxwellBoltzmann) components.push('maxwell_boltzmann');
+      if (needsHeatmap) components.push('heatmap');
+
+      const response: ViewResponse = await computeView({
+        components,
         temperatures: temps.sort((a, b) => a - b),
         mu: settings.mu,
         energy_min: settings.energyMin,
         energy_max: settings.energyMax,
         points: settings.points,
-        include_maxwell_boltzmann: settings.showMaxwellBoltzmann,
+        heatmap: {
+          energy_points: heatmapEnergyPoints(settings.energyMin, settings.energyMax),
+          temp_min: 1,
+          temp_max: 5000,
+          temp_points: 100,
+          temp_scale: 'log',
+        },
       });
 
       // Transform response to chart data format
-      const curves: CurveData[] = response.curves.map((curve, idx) => ({
+      const energy = response.energy ?? [];
+      const curves: CurveData[] = (response.curves ?? []).map((curve, idx) => ({
         temperature: curve.temperature,
-        data: response.energy.map((e, i) => ({
+        data: energy.map((e, i) => ({
           energy: e,
-          occupation: curve.occupation[i],
+          occupation: curve.occupation![i],
         })),
         color: TEMP_COLORS[idx % TEMP_COLORS.length],
         maxwellBoltzmann: curve.maxwell_boltzmann
-          ? response.energy.map((e, i) => ({
+          ? energy.map((e, i) => ({
               energy: e,
               occupation: curve.maxwell_boltzmann![i],
             }))
@@ -107,6 +142,10 @@ const App: React.FC = () => {
       }));
 
       setCurveData(curves);
+      if (needsHeatmap && response.heatmap) {
+        setSurfaceData(response.heatmap);
+        surfaceKeyRef.current = surfaceKey;
+      }
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch data');
     } finally {
@@ -114,41 +153,10 @@ const App: React.FC = () => {
     }
   }, [settings, apiConnected]);
 
-  // Fetch surface data for heatmap
-  const fetchSurfaceData = useCallback(async () => {
-    if (!apiConnected) return;
-    
-    setIsLoading(true);
-    setError(null);
-
-    try {
-      const response = await computeSurface({
-        mu: settings.mu,
-        energy_min: settings.energyMin,
-        energy_max: settings.energyMax,
-        energy_points: 200,
-        temp_min: 1,
-        temp_max: 5000,
-        temp_points: 100,
-        temp_scale: 'log',
-      });
-
-      setSurfaceData(response);
-    } catch (err) {
-      setError(err instanceof Error ? err.message : 'Failed to fetch surface data');
-    } finally {
-      setIsLoading(false);
-    }
-  }, [settings.mu, settings.energyMin, settings.energyMax, apiConnected]);
-
   // Effect to fetch data when debounced settings change
   useEffect(() => {
-    if (viewMode === 'curves') {
-      fetchCurveData();
-    } else {
-      fetchSurfaceData();
-    }
-  }, [debouncedSettings, viewMode, fetchCurveData, fetchSurfaceData]);
+    fetchViewData();
+  }, [debouncedSettings, fetchViewData]);
 
   // Handle settings changes
   const handleSettingsChange = useCallback((newSettings: Partial<SimulationSettings>) => {
@@ -12,6 +12,8 @@ import type {
   MultiTemperatureResponse,
   SurfaceRequest,
   SurfaceResponse,
+  ViewRequest,
+  ViewResponse,
   PhysicsInfo
 } from '../types/api';
 
@@ -96,6 +98,18 @@ export async function computeSurface(
   });
 }
 
+/**
+ * Compute overlay curves, derivative and heatmap in one request
+ */
+export async function computeView(
+  params: ViewRequest
+): Promise<ViewResponse> {
+  return fetchAPI<ViewResponse>('/view', {
+    method: 'POST',
+    body: JSON.stringify(params),
+  });
+}
+
 /**
  * Get physics information and constants
  */
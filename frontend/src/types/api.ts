@@ -31,6 +31,27 @@ export interface SurfaceRequest {
   temp_scale: 'linear' | 'log';
 }
 
+export type ViewComponent = 'curves' | 'maxwell_boltzmann' | 'derivative' | 'heatmap';
+
+export interface HeatmapSpec {
+  energy_points: number;
+  temp_min: number;
+  temp_max: number;
+  temp_points: number;
+  temp_scale: 'linear' | 'log';
+}
+
+export interface ViewRequest {
+  components: ViewComponent[];
+  temperatures: number[];
+  mu: number;
+  energy_min: number;
+  energy_max: number;
+  points: number;
+  max_output_points?: number;
+  heatmap?: HeatmapSpec;
+}
+
 // Response types
 export interface FermiDiracResponse {
   energy: number[];
@@ -59,6 +80,21 @@ export interface SurfaceResponse {
   mu: number;
 }
 
+export interface ViewCurve {
+  temperature: number;
+  occupation?: number[] | null;
+  maxwell_boltzmann?: number[] | null;
+  derivative?: number[] | null;
+}
+
+export interface ViewResponse {
+  components: ViewComponent[];
+  energy?: number[] | null;
+  curves?: ViewCurve[] | null;
+  heatmap?: SurfaceResponse | null;
+  mu: number;
+}
+
 export interface PhysicsInfo {
   k_B_eV: number;
   k_B_SI: number;